@@ -1,35 +1,48 @@
 """
 Main logic module for the restaurant booking system.
 Handles API calls, response formatting, and tool execution.
+All backend access goes over HTTP, so this module does not import the API
+service; the OpenAI and requests clients are created on first use to keep
+the Streamlit UI's import cheap.
 """
 
 #Basic Imports
 import json
+import os
 import re
-import requests
+import threading
+import time
+from functools import lru_cache
 from typing import Union
 
-#Third-party Imports
-from openai import OpenAI
-
-#Internal Imports
-from data.service_api import *
-
 # Setup logging
 import logging
 logger = logging.getLogger('goodfoods')
 
 #Global Constant
 BASE_URL = "http://localhost:8000"
+BOOKING_TIMEOUT_SECONDS = 30
+BOOKING_ATTEMPTS = 2
+OVERLOAD_STATUS_CODES = (429, 503)
+MAX_RETRY_AFTER_SECONDS = 5
+CLIENT_ID_HEADER = "X-Client-Id"
+CLIENT_SECRET_HEADER = "X-Client-Secret"
 logger.info(f"BASE URL for API calls set as: {BASE_URL}")
 
 
+#Global Variables
+_thread_local = threading.local()
+
+
 #All Functions Available (all the functions in the conversation engine)
+# get_openai_client(api_key) - cached OpenAI client, imported on first use
+# get_http_session() - per-thread requests session to the API, created on first use
 # collect_user_console_message()
 # generate_chat_completion(api_key, conv_history, tools, model_type, tool_calling_enabled)
 # normalize_chat_response(api_response_obj)
-# execute_tool_calls(list_of_tool_calls)
-# dispatch_backend_tool(function_name, function_args)
+# execute_tool_calls(list_of_tool_calls, client_id)
+# dispatch_backend_tool(function_name, function_args, call_id)
+# dispatch_backend_tool_batch(function_name, args_by_call_id)
 # has_function_simulation(response_text)
 
 
@@ -48,6 +61,38 @@ def collect_user_console_message() -> dict[str, str]:
     return user_message_formatted
 
 
+@lru_cache(maxsize=8)
+def get_openai_client(api_key):
+    """
+    Returns an OpenAI client for the key, importing the SDK on the first call.
+
+    Args:
+        api_key: API authentication key
+
+    Returns:
+        OpenAI: Client reused by every completion with this key
+    """
+
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+def get_http_session():
+    """
+    Returns this thread's requests session to the API, importing requests on the first call.
+    The session keeps connections to the API alive between tool calls.
+
+    Returns:
+        requests.Session: Session owned by the calling thread
+    """
+
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        import requests
+        session = _thread_local.session = requests.Session()
+    return session
+
+
 def generate_chat_completion(api_key, conversation_history: list, tools: list, model_type='gpt-4o', tool_calling_enabled: bool=False):
     """
     Make API call to AI model with conversation history.
@@ -63,7 +108,7 @@ def generate_chat_completion(api_key, conversation_history: list, tools: list, m
         object: Raw API response object
     """
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
 
     if tool_calling_enabled is True:
         ai_api_response_obj = client.chat.completions.create(
@@ -111,24 +156,44 @@ def normalize_chat_response(api_response_obj: object) -> Union[list, dict]:
         return {"role": "assistant", "content": ""}
      
 
-def execute_tool_calls(list_of_tool_calls: list) -> list:
+def execute_tool_calls(list_of_tool_calls: list, client_id: str = None) -> list:
     """
     Process and execute list of tool calls from AI response.
 
     Args:
         list_of_tool_calls: List of tool call objects from AI response
+        client_id (str, optional): Chat session ID, sent as X-Client-Id so the API rate-limits each user separately
 
     Returns:
         list: List of formatted tool responses
         Format: [{"role": "tool", "tool_call_id": str, "name": str, "content": str}, ...]
     """
 
+    if client_id:
+        # The session belongs to this thread, which serves one chat session at a time
+        get_http_session().headers[CLIENT_ID_HEADER] = client_id
+        # Needed when the API is on another host; from localhost the API believes the ID anyway
+        if os.getenv("GOODFOODS_CLIENT_ID_SECRET"):
+            get_http_session().headers[CLIENT_SECRET_HEADER] = os.getenv("GOODFOODS_CLIENT_ID_SECRET")
+
+    parsed_args = {tool_call.id: json.loads(tool_call.function.arguments) for tool_call in list_of_tool_calls}
+
+    # Searches issued in the same turn are coalesced into one batch request
+    search_args = {
+        tool_call.id: parsed_args[tool_call.id]
+        for tool_call in list_of_tool_calls if tool_call.function.name == 'lookup_dining_options'
+    }
+    batched_outputs = dispatch_backend_tool_batch('lookup_dining_options', search_args) if len(search_args) > 1 else {}
+
     list_of_tool_call_responses = []
     for tool_call in list_of_tool_calls:
         
         function_name = tool_call.function.name
-        function_args = json.loads(tool_call.function.arguments)
-        function_response = dispatch_backend_tool(function_name, function_args)
+        function_args = parsed_args[tool_call.id]
+        if tool_call.id in batched_outputs:
+            function_response = batched_outputs[tool_call.id]
+        else:
+            function_response = dispatch_backend_tool(function_name, function_args, call_id=tool_call.id)
         
         if isinstance(function_response, (list, dict)):
             function_response = json.dumps(function_response)
@@ -147,13 +212,14 @@ def execute_tool_calls(list_of_tool_calls: list) -> list:
     return list_of_tool_call_responses
 
 
-def dispatch_backend_tool(function_name: str, function_args: dict) -> Union[dict, str]:
+def dispatch_backend_tool(function_name: str, function_args: dict, call_id: str = None) -> Union[dict, str]:
     """
     Execute specific tool functions via API endpoints.
 
     Args:
         function_name (str): Name of the tool function to execute
         function_args (dict): Arguments for the tool function
+        call_id (str, optional): Tool call ID, sent as the booking's Idempotency-Key
         BASE_URL (str): Base URL for API endpoints
 
     Returns:
@@ -164,8 +230,9 @@ def dispatch_backend_tool(function_name: str, function_args: dict) -> Union[dict
         logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
         logger.info(f"Sending API request to {BASE_URL}/restaurants/search with args: {function_args}")
         try:
-            response = requests.post(f"{BASE_URL}/restaurants/search", json=function_args)
-            function_output = response.json()
+            response = get_http_session().post(f"{BASE_URL}/restaurants/search", json=function_args)
+            # Already compact JSON; passed through as the tool message instead of being decoded and re-encoded
+            function_output = response.text
         except Exception as e:
             logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
             function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
@@ -174,13 +241,102 @@ def dispatch_backend_tool(function_name: str, function_args: dict) -> Union[dict
         logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
         logger.info(f"Sending API request to {BASE_URL}/reservations with args: {function_args}")
         capacity_debug = function_args.pop("capacity_debug", False)
+        # The same tool call ID makes a resent booking return the first result instead of booking twice,
+        # so a timed-out or dropped request is safe to retry
+        headers = {"Idempotency-Key": call_id} if call_id else {}
         try:
-            response = requests.post(f"{BASE_URL}/reservations", json=function_args)
+            import requests
+            for attempt in range(1, BOOKING_ATTEMPTS + 1):
+                try:
+                    response = get_http_session().post(f"{BASE_URL}/reservations", json=function_args, headers=headers,
+                                             timeout=BOOKING_TIMEOUT_SECONDS)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if not headers or attempt == BOOKING_ATTEMPTS:
+                        raise
+                    logger.warning(f"Retrying {function_name} with Idempotency-Key {call_id} after: {str(e)}")
+                    continue
+                if response.status_code not in OVERLOAD_STATUS_CODES or attempt == BOOKING_ATTEMPTS:
+                    break
+                # Refused by admission control before anything ran, so resending is safe
+                try:
+                    retry_after = min(float(response.headers.get("Retry-After", 1)), MAX_RETRY_AFTER_SECONDS)
+                except ValueError:
+                    retry_after = 1
+                logger.warning(f"Retrying {function_name} in {retry_after}s, API answered {response.status_code}")
+                time.sleep(retry_after)
             function_output = response.json()
         except Exception as e:
             logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
             function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
         
+    elif function_name == 'lookup_table_booking':
+        logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
+        logger.info(f"Sending API request to {BASE_URL}/reservations with args: {function_args}")
+        try:
+            response = get_http_session().get(f"{BASE_URL}/reservations", params=function_args)
+            function_output = response.json()
+        except Exception as e:
+            logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
+            function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
+
+    elif function_name == 'modify_table_booking':
+        logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
+        order_id = function_args.pop("order_id", "")
+        # orderer_contact identifies the booking; a changed number is sent as the new orderer_contact
+        params = {"orderer_contact": function_args.pop("orderer_contact", "")}
+        if "new_orderer_contact" in function_args:
+            function_args["orderer_contact"] = function_args.pop("new_orderer_contact")
+        logger.info(f"Sending API request to {BASE_URL}/reservations/{order_id} with args: {function_args}")
+        try:
+            response = get_http_session().patch(f"{BASE_URL}/reservations/{order_id}", params=params, json=function_args)
+            function_output = response.json()
+        except Exception as e:
+            logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
+            function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
+
+    elif function_name == 'cancel_table_booking':
+        logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
+        order_id = function_args.pop("order_id", "")
+        logger.info(f"Sending API request to {BASE_URL}/reservations/{order_id} (DELETE) with args: {function_args}")
+        try:
+            response = get_http_session().delete(f"{BASE_URL}/reservations/{order_id}", params=function_args)
+            function_output = response.json()
+        except Exception as e:
+            logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
+            function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
+
+    elif function_name == 'join_table_waitlist':
+        logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
+        logger.info(f"Sending API request to {BASE_URL}/waitlist with args: {function_args}")
+        try:
+            response = get_http_session().post(f"{BASE_URL}/waitlist", json=function_args)
+            function_output = response.json()
+        except Exception as e:
+            logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
+            function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
+
+    elif function_name in ('check_waitlist_status', 'leave_table_waitlist'):
+        logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
+        waitlist_id = function_args.pop("waitlist_id", "")
+        method = "get" if function_name == 'check_waitlist_status' else "delete"
+        logger.info(f"Sending API request to {BASE_URL}/waitlist/{waitlist_id} ({method.upper()}) with args: {function_args}")
+        try:
+            response = getattr(get_http_session(), method)(f"{BASE_URL}/waitlist/{waitlist_id}", params=function_args)
+            function_output = response.json()
+        except Exception as e:
+            logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
+            function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
+
+    elif function_name == 'check_table_availability':
+        logger.info(f"Running Tool Call: {function_name} with arguments {function_args}")
+        logger.info(f"Sending API request to {BASE_URL}/availability with args: {function_args}")
+        try:
+            response = get_http_session().post(f"{BASE_URL}/availability", json={**function_args, "include_grid": False})
+            function_output = response.json()
+        except Exception as e:
+            logger.error(f"API call failed for {function_name}: {str(e)}", exc_info=True)
+            function_output = {"error": f"Failed to execute {function_name}: {str(e)}"}
+
     else:
         function_output = f"No tool found with name {function_name}"
 
@@ -191,6 +347,36 @@ def dispatch_backend_tool(function_name: str, function_args: dict) -> Union[dict
     return function_output
 
 
+def dispatch_backend_tool_batch(function_name: str, args_by_call_id: dict) -> dict:
+    """
+    Execute several calls of the same tool in one API request where the backend supports it.
+    If the batch request fails, each call is sent on its own instead.
+
+    Args:
+        function_name (str): Name of the tool function to execute
+        args_by_call_id (dict): Arguments for each call, keyed by tool call ID
+
+    Returns:
+        dict: Function output per tool call ID
+    """
+
+    if function_name != 'lookup_dining_options':
+        return {call_id: dispatch_backend_tool(function_name, args, call_id=call_id) for call_id, args in args_by_call_id.items()}
+
+    logger.info(f"Running batched Tool Call: {function_name} for {len(args_by_call_id)} calls")
+    logger.info(f"Sending API request to {BASE_URL}/restaurants/search/batch with args: {args_by_call_id}")
+    try:
+        response = get_http_session().post(f"{BASE_URL}/restaurants/search/batch", json={"queries": args_by_call_id})
+        if response.ok:
+            return response.json()["results"]
+        logger.warning(f"Batched {function_name} answered {response.status_code}, running the calls one by one")
+    except Exception as e:
+        logger.error(f"API call failed for batched {function_name}: {str(e)}", exc_info=True)
+
+    # E.g. an older backend without the batch endpoint, a rejected batch or a malformed reply
+    return {call_id: dispatch_backend_tool(function_name, args, call_id=call_id) for call_id, args in args_by_call_id.items()}
+
+
 def has_function_simulation(response_text: str) -> bool:
     """
     Checks if the LLM response contains function simulation patterns.
@@ -208,7 +394,9 @@ def has_function_simulation(response_text: str) -> bool:
         r"function\([^)]*\)",
         r"tool\([^)]*\)",
         r"confirm_table_booking\([^)]*\)",
-        r"lookup_dining_options\([^)]*\)"
+        r"lookup_dining_options\([^)]*\)",
+        r"(lookup|modify|cancel)_table_booking\([^)]*\)",
+        r"(join_table_waitlist|check_waitlist_status|leave_table_waitlist)\([^)]*\)"
     ]
 
     for pattern in patterns:
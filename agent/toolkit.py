@@ -1,6 +1,7 @@
 """
 Restaurant booking system tool definitions and configurations.
-Contains function specifications for restaurant search and order management.
+Contains function specifications for restaurant search and order management
+(booking, lookup, modification and cancellation).
 """
 
 #Basic type imports
@@ -27,13 +28,18 @@ restaurant_tools: List[Dict[str, Union[str, Dict[str, Union[str, Dict[str, Union
                 - All searches return complete restaurant details including restaurant_id
 
                 Valid Parameters:
-                - name: Restaurant name as mentioned by user
+                - name: Restaurant name as mentioned by user (partial or misspelled names are matched by similarity)
                 - location: Areas or landmarks user mentions (e.g., 'Koramangala', 'MG Road')
+                - near: Area or landmark the user wants to be close to; returns outlets around it ranked by distance_km
+                - radius_km / nearest: How far around 'near' to look (default 5 km), or only the k closest outlets
                 - cuisine: Common cuisine types (Indian, Italian, Mediterranean, Asian, Continental, American)
                 - operating_hours: Time in HH:MM format
+                - open_at: Find restaurants open at a moment, e.g. {"time": "23:30", "day": "Sunday"} for "who is open at 11:30 PM on Sunday?"
                 - operating_days: Days of operation
                 - restaurant_max_seating_capacity: Total capacity (30-120) - useful when discussing venue size or large groups
                 - max_booking_party_size: Group size limits (6-20) - relevant for booking discussions
+                - limit / offset: Page through the best matches (response includes total_matches and next_offset)
+                - fields: Only return the restaurant details you need
 
                 Usage Guidelines:
                 1. Search Approach:
@@ -63,7 +69,7 @@ restaurant_tools: List[Dict[str, Union[str, Dict[str, Union[str, Dict[str, Union
                     },
                     "location": {
                         "type": "string",
-                        "description": "Keywords or location details of the restarurant which can include street address or nearby landmark mentioned by the user."
+                        "description": "Keywords or location details of the restarurant which can include street address or nearby landmark mentioned by the user. Misspellings are tolerated; such results carry a similarity score."
                     },
                     "cuisine": {
                         "type": "string",
@@ -83,6 +89,21 @@ restaurant_tools: List[Dict[str, Union[str, Dict[str, Union[str, Dict[str, Union
                         },
                         "description": "Operating hours of the restaurant."
                     },
+                    "open_at": {
+                        "type": "object",
+                        "properties": {
+                            "time": {
+                                "type": "string",
+                                "description": "Time in HH:MM (24-hour) format."
+                            },
+                            "day": {
+                                "type": "string",
+                                "description": "Day of the week (e.g. 'Sunday') or date in YYYY-MM-DD format. Optional."
+                            }
+                        },
+                        "required": ["time"],
+                        "description": "Restaurants open at this time (on this day), including ones that close after midnight."
+                    },
                     "phone": {
                         "type": "string",
                         "description": "Contact phone number."
@@ -100,6 +121,34 @@ restaurant_tools: List[Dict[str, Union[str, Dict[str, Union[str, Dict[str, Union
                     "operating_days": {
                         "type": "string",
                         "description": "Days of the week when the restaurant is open."
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of best-matching restaurants to return. Use a small number (e.g. 5) unless the user wants to browse."
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of best matches to skip, to fetch the next page of results (use next_offset from the previous response)."
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": ["name", "location", "cuisine", "operating_hours", "phone", "restaurant_max_seating_capacity", "max_booking_party_size", "operating_days"]
+                        },
+                        "description": "Restaurant details to include in each result. restaurant_id and match details are always included."
+                    },
+                    "near": {
+                        "type": "string",
+                        "description": "Area or landmark the user wants to dine near (e.g. 'Koramangala'). Finds outlets within radius_km of it, closest first, even if their address does not mention it."
+                    },
+                    "radius_km": {
+                        "type": "number",
+                        "description": "Search radius around 'near' in kilometres (default 5)."
+                    },
+                    "nearest": {
+                        "type": "integer",
+                        "description": "Only return this many outlets closest to 'near'."
                     }
                 }
             }
@@ -129,7 +178,7 @@ restaurant_tools: List[Dict[str, Union[str, Dict[str, Union[str, Dict[str, Union
 
                         Response Types:
                         - Successful Booking: Share confirmation details
-                        - Capacity Issues: Help find alternatives (different time/restaurant)
+                        - Capacity Issues: Help find alternatives (different time/restaurant), or offer to join the waitlist (join_table_waitlist)
                         - Missing Details: Continue conversation to collect information
                         - Invalid Information: Clarify and correct through conversation
 
@@ -180,6 +229,312 @@ restaurant_tools: List[Dict[str, Union[str, Dict[str, Union[str, Dict[str, Union
                 "description": "A complete JSON object containing all required order information."
             }
         }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_table_availability",
+            "description": (
+                        '''
+                        "Tool to find when restaurants have free tables. Returns, for each restaurant, the dates and time slots that still have room for the party.
+
+                        When to Use:
+                        - User asks when there is room ("when can we get a table?", "any slots this weekend?")
+                        - A booking failed for capacity and you want to suggest other times
+                        - Comparing availability across several restaurants in one go
+
+                        Parameters:
+                        - restaurant_ids: From your restaurant search results (omit to check every restaurant)
+                        - start_date: First date in YYYY-MM-DD format (convert relative dates yourself)
+                        - days: How many days to look ahead (default 7)
+                        - party_size: Number of guests, so only slots with enough seats are returned
+                        - slot_minutes: Slot granularity in minutes (default 30)"
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": [],
+                "properties": {
+                    "restaurant_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Restaurant IDs to check."
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "First date to check in YYYY-MM-DD format."
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to check, starting at start_date."
+                    },
+                    "party_size": {
+                        "type": "integer",
+                        "description": "Number of people who need seats."
+                    },
+                    "slot_minutes": {
+                        "type": "integer",
+                        "description": "Time slot size in minutes."
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "lookup_table_booking",
+            "description": (
+                        '''
+                        "Tool to find existing reservations. Returns the stored bookings with their order_id, restaurant, date, time, party size and status ('confirmed' or 'cancelled').
+
+                        When to Use:
+                        - User asks whether their booking went through, or what they booked
+                        - Before changing or cancelling a booking, to get its order_id and current details
+
+                        Parameters:
+                        - order_id: Confirmation number from the booking (e.g. 'ord123'); only together with orderer_contact
+                        - orderer_contact: Phone number the booking was made with (required); alone it returns all of that customer's bookings
+                        Always ask for the phone number they booked with; an order_id alone is refused."
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": ["orderer_contact"],
+                "properties": {
+                    "order_id": {
+                        "type": "string",
+                        "description": "Order ID of the booking."
+                    },
+                    "orderer_contact": {
+                        "type": "string",
+                        "description": "Contact number used for the booking."
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "modify_table_booking",
+            "description": (
+                        '''
+                        "Tool to change an existing reservation instead of making a new one. The seats of the old booking are released and the new time re-reserved in one step; if the new time is full the booking stays as it was.
+
+                        When to Use:
+                        - User wants to move their booking to another time or date ("change it to 8pm")
+                        - User wants to change the number of guests, the outlet, or the name / contact on the booking
+
+                        Parameters:
+                        - order_id: From the confirmation or from lookup_table_booking (required)
+                        - orderer_contact: Phone number the booking was made with (required)
+                        - Only the details that change: reservation_date (YYYY-MM-DD), reservation_time (HH:MM, 24-hour), party_size, restaurant_id, orderer_name, new_orderer_contact
+
+                        Important:
+                        - Confirm the change with the user before calling
+                        - Never call confirm_table_booking to change a booking, that books a second table
+                        - On a capacity error suggest other times (check_table_availability)"
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": ["order_id", "orderer_contact"],
+                "properties": {
+                    "order_id": {
+                        "type": "string",
+                        "description": "Order ID of the booking to change."
+                    },
+                    "orderer_contact": {
+                        "type": "string",
+                        "description": "Contact number the booking was made with."
+                    },
+                    "restaurant_id": {
+                        "type": "string",
+                        "description": "New restaurant, if the user wants another outlet."
+                    },
+                    "orderer_name": {
+                        "type": "string",
+                        "description": "New name for the booking."
+                    },
+                    "new_orderer_contact": {
+                        "type": "string",
+                        "description": "New contact number for the booking."
+                    },
+                    "party_size": {
+                        "type": "integer",
+                        "description": "New number of people."
+                    },
+                    "reservation_date": {
+                        "type": "string",
+                        "description": "New date in YYYY-MM-DD format."
+                    },
+                    "reservation_time": {
+                        "type": "string",
+                        "description": "New time in HH:MM format."
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "cancel_table_booking",
+            "description": (
+                        '''
+                        "Tool to cancel an existing reservation and free its seats.
+
+                        When to Use:
+                        - User explicitly asks to cancel their booking
+
+                        Parameters:
+                        - order_id: From the confirmation or from lookup_table_booking
+                        - orderer_contact: Phone number the booking was made with (required), to make sure the right booking is cancelled
+
+                        Important:
+                        - Read the booking details back to the user and get a clear confirmation before cancelling"
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": ["order_id", "orderer_contact"],
+                "properties": {
+                    "order_id": {
+                        "type": "string",
+                        "description": "Order ID of the booking to cancel."
+                    },
+                    "orderer_contact": {
+                        "type": "string",
+                        "description": "Contact number used for the booking."
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "join_table_waitlist",
+            "description": (
+                        '''
+                        "Tool to put a party on the waitlist of a fully booked time slot. When seats free up (for example a cancellation) waiting parties are booked automatically, earliest request first; smaller parties may be seated ahead of a larger one that does not fit yet.
+
+                        When to Use:
+                        - confirm_table_booking failed for capacity and the user would rather wait for that exact slot than pick another time
+
+                        Parameters:
+                        - The same complete booking details as confirm_table_booking
+
+                        Important:
+                        - Tell the user this is not a confirmed booking yet, and share the waitlist_id and their position
+                        - The booking is confirmed automatically; they can check with check_waitlist_status"
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": [
+                    "restaurant_id",
+                    "orderer_name",
+                    "orderer_contact",
+                    "party_size",
+                    "reservation_date",
+                    "reservation_time"
+                ],
+                "properties": {
+                    "restaurant_id": {
+                        "type": "string",
+                        "description": "Unique identifier of the restaurant."
+                    },
+                    "orderer_name": {
+                        "type": "string",
+                        "description": "Name of the person making the reservation."
+                    },
+                    "orderer_contact": {
+                        "type": "string",
+                        "description": "Contact information for the orderer."
+                    },
+                    "party_size": {
+                        "type": "integer",
+                        "description": "Number of people for the reservation."
+                    },
+                    "reservation_date": {
+                        "type": "string",
+                        "description": "Reservation date in YYYY-MM-DD format."
+                    },
+                    "reservation_time": {
+                        "type": "string",
+                        "description": "Reservation time in HH:MM format."
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_waitlist_status",
+            "description": (
+                        '''
+                        "Tool to check a waitlist entry. Returns its status: 'waiting' with the party's position, 'promoted' with the order_id of the confirmed booking, 'expired' if the slot passed, or 'left'.
+
+                        When to Use:
+                        - User asks whether they got a table from the waitlist
+
+                        Parameters:
+                        - waitlist_id: From join_table_waitlist (e.g. 'wl004')
+                        - orderer_contact: Phone number used to join the waitlist"
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": ["waitlist_id", "orderer_contact"],
+                "properties": {
+                    "waitlist_id": {
+                        "type": "string",
+                        "description": "Waitlist ID of the entry."
+                    },
+                    "orderer_contact": {
+                        "type": "string",
+                        "description": "Contact number used to join the waitlist."
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "leave_table_waitlist",
+            "description": (
+                        '''
+                        "Tool to take a party off the waitlist.
+
+                        When to Use:
+                        - User no longer wants to wait for the slot, e.g. after booking another time
+
+                        Parameters:
+                        - waitlist_id: From join_table_waitlist
+                        - orderer_contact: Phone number used to join the waitlist
+
+                        Important:
+                        - If the entry was already promoted, the booking exists; use cancel_table_booking with its order_id if the user wants to cancel it"
+                        '''
+            ),
+            "parameters": {
+                "type": "object",
+                "required": ["waitlist_id", "orderer_contact"],
+                "properties": {
+                    "waitlist_id": {
+                        "type": "string",
+                        "description": "Waitlist ID of the entry."
+                    },
+                    "orderer_contact": {
+                        "type": "string",
+                        "description": "Contact number used to join the waitlist."
+                    }
+                }
+            }
+        }
     }
 ]
-
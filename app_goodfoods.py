@@ -1,6 +1,7 @@
 # Basic Imports
 from dotenv import load_dotenv
 import os
+import uuid
 
 # Third Party Imports
 import streamlit as st
@@ -90,6 +91,9 @@ if "messages" not in st.session_state:
     chat_seed.append({"role": "system", "content": system_prompt})
     chat_seed.append({"role": "assistant", "content": welcome_message})
     st.session_state.messages = chat_seed
+if "client_id" not in st.session_state:
+    # Identifies this chat session to the API's per-client rate limits
+    st.session_state.client_id = uuid.uuid4().hex
 
 # Conversation reset function
 def reset_conversation():
@@ -214,7 +218,7 @@ if prompt := st.chat_input("Ask about reservations or available restaurants...")
             except Exception as e:
                 logger.error(f"Failed to append assistant tool_calls message: {str(e)}", exc_info=True)
 
-            tool_messages = execute_tool_calls(formatted_response)
+            tool_messages = execute_tool_calls(formatted_response, client_id=st.session_state.client_id)
             st.session_state.messages.extend(tool_messages)
 
             # Update trace with tool results
@@ -0,0 +1,368 @@
+"""
+GoodFoods Backend Benchmark
+
+Measures search, capacity checks, availability grids and booking writes on
+a large synthetic catalog, both by calling data.service_api directly and
+through the FastAPI app with a test client. Reports latency percentiles,
+throughput and memory, and saves every run as JSON so runs can be compared.
+
+Runs against a temporary data directory (generated, or copied from
+--data-dir), so the real catalog and bookings are never touched.
+
+Usage:
+   python -m benchmarks.backend_benchmark
+   python -m benchmarks.backend_benchmark --outlets 10000 --bookings 1000000 --backend sqlite
+   python -m benchmarks.backend_benchmark --data-dir /tmp/goodfoods-10k --compare benchmarks/results/previous.json
+"""
+
+#Basic imports
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Callable, Iterable, Optional
+
+# Setting up Basic Logging
+import logging
+
+#Internal imports
+from benchmarks.generate_catalog import generate_catalog
+
+#Global Variables
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+SEED_FILES = ("restaurant_list.json", "bookings_list.json")
+BOOKING_DAYS = 30
+
+#All Functions Available
+# rss_mb() / peak_rss_mb() - process memory in MB
+# summarize(latencies, elapsed) -> count, throughput and latency percentiles
+# time_calls(fn, items) -> summarize() over fn(item) for every item
+# make_search_queries / make_capacity_checks / make_orders / make_availability_queries
+# run_benchmarks(args) -> results dict
+# compare_results(current, previous) - prints p50/p99/throughput changes
+
+
+def rss_mb() -> Optional[float]:
+    """
+    Current resident memory of this process in MB (Linux only, None elsewhere).
+    """
+
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process in MB, None where the resource module is unavailable.
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarizes per-call latencies in seconds.
+
+    Parameters:
+        latencies (List[float]): Duration of each call in seconds
+        elapsed (float): Wall time of the whole run in seconds
+
+    Returns:
+        Dict[str, float]: count, throughput_per_s and mean/p50/p90/p99/max latency in ms
+    """
+
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "throughput_per_s": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def time_calls(fn: Callable[[Any], Any], items: Iterable[Any], check: Callable[[Any], bool] = None) -> Dict[str, Any]:
+    """
+    Calls fn once per item and times every call.
+
+    Parameters:
+        fn (Callable): Function under test
+        items (Iterable): Arguments, one call each
+        check (Callable, optional): Counts results for which check(result) is True as ok
+
+    Returns:
+        Dict[str, Any]: summarize() output, plus ok_ratio when check is given
+    """
+
+    latencies, oks = [], 0
+    started = time.perf_counter()
+    for item in items:
+        call_started = time.perf_counter()
+        result = fn(item)
+        latencies.append(time.perf_counter() - call_started)
+        if check is not None and check(result):
+            oks += 1
+    summary = summarize(latencies, time.perf_counter() - started)
+    if check is not None and latencies:
+        summary["ok_ratio"] = round(oks / len(latencies), 3)
+    return summary
+
+
+def make_search_queries(restaurants: List[Dict[str, Any]], count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """
+    Builds a mix of the searches the agent sends: cuisine, area, name typos,
+    open-at, nearby and combined queries, with paging limits.
+    """
+
+    def area(r):
+        return r["location"]["address"].split(",")[-2].strip()
+
+    def typo(text):
+        position = rng.randrange(1, len(text) - 1) if len(text) > 2 else 0
+        return text[:position] + text[position + 1:]
+
+    builders = [
+        lambda r: {"cuisine": rng.choice(r["cuisine"])},
+        lambda r: {"location": area(r)},
+        lambda r: {"location": typo(area(r))},
+        lambda r: {"name": typo(r["name"].split()[1])},
+        lambda r: {"cuisine": rng.choice(r["cuisine"]), "location": area(r), "limit": 5},
+        lambda r: {"open_at": {"time": rng.choice(["13:00", "20:30", "23:15"]), "day": rng.choice(r["operating_days"])}},
+        lambda r: {"near": area(r), "limit": 10},
+        lambda r: {"near": area(r), "nearest": 5, "cuisine": rng.choice(r["cuisine"])},
+        lambda r: {"max_booking_party_size": rng.choice([6, 10, 15]), "operating_days": "sunday", "limit": 10},
+    ]
+    return [rng.choice(builders)(rng.choice(restaurants)) for _ in range(count)]
+
+
+def _random_slot(restaurants: List[Dict[str, Any]], rng: random.Random, first_date: date):
+    restaurant = rng.choice(restaurants)
+    reservation_date = (first_date + timedelta(days=rng.randrange(BOOKING_DAYS))).isoformat()
+    reservation_time = f"{rng.randint(12, 21):02d}:{rng.choice(['00', '15', '30', '45'])}"
+    return restaurant, reservation_date, reservation_time
+
+
+def make_capacity_checks(restaurants: List[Dict[str, Any]], count: int, rng: random.Random, first_date: date) -> List[tuple]:
+    """
+    Builds (restaurant_id, party_size, date, time) capacity checks on booked dates.
+    """
+
+    checks = []
+    for _ in range(count):
+        restaurant, reservation_date, reservation_time = _random_slot(restaurants, rng, first_date)
+        checks.append((restaurant["restaurant_id"], rng.randint(1, 8), reservation_date, reservation_time))
+    return checks
+
+
+def make_orders(restaurants: List[Dict[str, Any]], count: int, rng: random.Random, first_date: date) -> List[Dict[str, Any]]:
+    """
+    Builds valid reservation requests for random restaurants and slots.
+    """
+
+    orders = []
+    for i in range(count):
+        restaurant, reservation_date, reservation_time = _random_slot(restaurants, rng, first_date)
+        orders.append({
+            "restaurant_id": restaurant["restaurant_id"],
+            "orderer_name": "Bench Runner",
+            "orderer_contact": f"8{i % 1000000000:09d}",
+            "party_size": rng.randint(1, min(6, restaurant["max_booking_party_size"])),
+            "reservation_date": reservation_date,
+            "reservation_time": reservation_time,
+        })
+    return orders
+
+
+def make_availability_queries(restaurants: List[Dict[str, Any]], count: int, rng: random.Random, first_date: date) -> List[Dict[str, Any]]:
+    """
+    Builds week-long availability grid requests for 20 random restaurants each.
+    """
+
+    return [{
+        "restaurant_ids": [r["restaurant_id"] for r in rng.sample(restaurants, min(20, len(restaurants)))],
+        "start_date": (first_date + timedelta(days=rng.randrange(BOOKING_DAYS))).isoformat(),
+        "days": 7,
+        "slot_minutes": 30,
+        "party_size": 4,
+        "include_grid": False,
+    } for _ in range(count)]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Prepares the data directory, loads the API on it and runs every benchmark.
+
+    Parameters:
+        args (argparse.Namespace): Parsed command line options
+
+    Returns:
+        Dict[str, Any]: Run metadata, dataset, memory and per-benchmark results
+    """
+
+    data_dir = tempfile.mkdtemp(prefix="goodfoods-bench-")
+    first_date = date.today()
+    if args.data_dir:
+        for file_name in SEED_FILES:
+            shutil.copy(os.path.join(args.data_dir, file_name), data_dir)
+        dataset = {"source": os.path.abspath(args.data_dir)}
+    else:
+        dataset = generate_catalog(data_dir, args.outlets, args.bookings, args.seed, first_date, BOOKING_DAYS)
+        dataset["source"] = "generated"
+
+    os.environ["GOODFOODS_DATA_DIR"] = data_dir
+    os.environ["GOODFOODS_STORAGE"] = args.backend
+    os.environ["GOODFOODS_CATALOG_WATCH_SECONDS"] = "0"
+    # One client sends every request back to back; measure the backend, not the per-client rate limits
+    os.environ["GOODFOODS_SEARCH_RATE"] = "0"
+    os.environ["GOODFOODS_WRITE_RATE"] = "0"
+    os.environ["GOODFOODS_SEARCH_CACHE_SIZE"] = os.environ.get("GOODFOODS_SEARCH_CACHE_SIZE", "1024") if args.search_cache else "0"
+
+    memory = {"rss_before_load_mb": rss_mb()}
+    load_started = time.perf_counter()
+    from data import service_api
+    load_seconds = round(time.perf_counter() - load_started, 3)
+    memory["rss_after_load_mb"] = rss_mb()
+    logging.getLogger('goodfoods.api').setLevel(logging.WARNING)
+
+    from fastapi.testclient import TestClient
+    client = TestClient(service_api.app)
+
+    rng = random.Random(args.seed)
+    restaurants = service_api.catalog.restaurants
+    n = args.requests
+    searches = make_search_queries(restaurants, n, rng)
+    checks = make_capacity_checks(restaurants, n, rng, first_date)
+    orders = make_orders(restaurants, 2 * n, rng, first_date)
+    grids = make_availability_queries(restaurants, max(n // 10, 1), rng, first_date)
+    print(f"Loaded {len(restaurants)} restaurants and {service_api.storage.order_count()} bookings in {load_seconds}s; "
+          f"running {n} requests per benchmark")
+
+    results = {
+        "in_process": {
+            "search": time_calls(service_api.search_restaurant_information, [dict(q) for q in searches]),
+            "check_capacity": time_calls(lambda c: service_api.check_capacity(*c, debug=False), checks),
+            "availability": time_calls(lambda q: service_api.get_availability(**q), grids),
+            "make_new_order": time_calls(service_api.make_new_order, orders[:n], check=lambda r: r["status"] == "success"),
+        },
+        "http": {
+            "search": time_calls(lambda q: client.post("/restaurants/search", json=q), searches,
+                                 check=lambda r: r.status_code == 200),
+            "availability": time_calls(lambda q: client.post("/availability", json=q), grids,
+                                       check=lambda r: r.status_code == 200),
+            "reservations": time_calls(lambda o: client.post("/reservations", json=o), orders[n:],
+                                       check=lambda r: r.status_code == 200),
+        },
+    }
+    memory["rss_after_run_mb"] = rss_mb()
+    memory["peak_rss_mb"] = peak_rss_mb()
+
+    service_api.storage.close()
+    shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        "run": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "search_cache": args.search_cache,
+            "requests": n,
+            "seed": args.seed,
+        },
+        "dataset": dataset,
+        "load_seconds": load_seconds,
+        "memory": memory,
+        "results": results,
+    }
+
+
+def compare_results(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """
+    Prints p50, p99 and throughput of this run next to a previous run.
+    """
+
+    print(f"\nCompared with {previous['run'].get('git_commit')} at {previous['run'].get('timestamp')}:")
+    for mode, benchmarks in current["results"].items():
+        for name, summary in benchmarks.items():
+            before = previous.get("results", {}).get(mode, {}).get(name)
+            if not before or not summary.get("count"):
+                continue
+            changes = []
+            for metric in ("p50_ms", "p99_ms", "throughput_per_s"):
+                if before.get(metric):
+                    changes.append(f"{metric} {before[metric]} -> {summary[metric]} ({(summary[metric] / before[metric] - 1) * 100:+.0f}%)")
+            print(f"  {mode}.{name}: " + ", ".join(changes))
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    print(f"\n{'benchmark':<28}{'count':>7}{'ops/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'ok':>7}")
+    for mode, benchmarks in report["results"].items():
+        for name, s in benchmarks.items():
+            print(f"{mode + '.' + name:<28}{s['count']:>7}{s['throughput_per_s']:>10}{s['p50_ms']:>10}"
+                  f"{s['p90_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}{s.get('ok_ratio', ''):>7}")
+    print(f"\nload {report['load_seconds']}s, memory {report['memory']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GoodFoods backend benchmark suite")
+    parser.add_argument("--outlets", type=int, default=1000, help="Outlets to generate (ignored with --data-dir)")
+    parser.add_argument("--bookings", type=int, default=100000, help="Bookings to generate (ignored with --data-dir)")
+    parser.add_argument("--data-dir", help="Benchmark a copy of an existing data directory instead of generating one")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--requests", type=int, default=2000, help="Calls per benchmark")
+    parser.add_argument("--search-cache", action="store_true", help="Keep the search response cache on for HTTP searches")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="Result file (default benchmarks/results/backend-<backend>-<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = run_benchmarks(args)
+    print_results(report)
+
+    out_path = args.out or os.path.join(
+        RESULTS_DIR, f"backend-{args.backend}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {out_path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(report, json.load(f))
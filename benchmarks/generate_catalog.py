@@ -0,0 +1,213 @@
+"""
+GoodFoods Synthetic Catalog Generator
+
+Writes a large restaurant_list.json and bookings_list.json in the same
+schema as the files in data/. Every outlet copies the cuisine mix, opening
+hours, operating days, capacities and dining duration of a random real
+outlet and is placed around a real area with jittered coordinates, so
+searches, capacity checks and availability grids see realistic data.
+Bookings fall inside opening hours on operating days, 15 minutes apart.
+
+Usage:
+   python -m benchmarks.generate_catalog --outlets 10000 --bookings 1000000 --out /tmp/goodfoods-10k
+   GOODFOODS_DATA_DIR=/tmp/goodfoods-10k python start.py
+"""
+
+#Basic imports
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import List, Dict, Any
+
+#Global Variables
+REPO_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+FIRST_NAMES = ["Asha", "Ravi", "Meera", "Arjun", "Kavya", "Rohan", "Diya", "Kiran", "Nikhil", "Pooja",
+               "Ananya", "Vikram", "Sneha", "Rahul", "Isha", "Aditya", "Lakshmi", "Suresh", "Farah", "Joseph"]
+LAST_NAMES = ["Rao", "Sharma", "Iyer", "Reddy", "Nair", "Gowda", "Khan", "Das", "Menon", "Patel", "Shetty", "D'Souza"]
+BRANCH_SUFFIXES = ["", "Central", "East", "West", "North", "South", "Express", "Plaza", "Junction", "Square"]
+COORDINATE_JITTER_DEGREES = 0.02
+
+#All Functions Available
+# generate_restaurants(outlets, rng, seed_restaurants) -> restaurant list
+# generate_bookings(restaurants, bookings, rng, start_date, days) -> iterator of orders
+# write_json_array(path, rows) - streams a JSON array one row per line
+# generate_catalog(out_dir, outlets, bookings, seed, start_date, days) -> summary
+
+
+def _area(restaurant: Dict[str, Any]) -> str:
+    """
+    Picks the neighbourhood part of a real address ('..., Indiranagar, Bangalore' -> 'Indiranagar').
+    """
+
+    parts = [part.strip() for part in restaurant["location"]["address"].split(",")]
+    return parts[-2] if len(parts) >= 3 else parts[0].split(" ", 1)[-1]
+
+
+def generate_restaurants(outlets: int, rng: random.Random, seed_restaurants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Builds outlets by resampling and jittering the real catalog.
+
+    Parameters:
+        outlets (int): Number of outlets to generate
+        rng (random.Random): Random source
+        seed_restaurants (List[Dict[str, Any]]): Real catalog to sample attributes from
+
+    Returns:
+        List[Dict[str, Any]]: Restaurants in the restaurant_list.json schema
+    """
+
+    restaurants = []
+    id_width = max(3, len(str(outlets)))
+    for number in range(1, outlets + 1):
+        template = rng.choice(seed_restaurants)
+        area = _area(template)
+        suffix = rng.choice(BRANCH_SUFFIXES)
+        location = dict(template["location"])
+        location["address"] = f"{rng.randint(1, 999)} {template['location']['address'].split(' ', 1)[1]}"
+        if "latitude" in location:
+            location["latitude"] = round(location["latitude"] + rng.uniform(-1, 1) * COORDINATE_JITTER_DEGREES, 6)
+            location["longitude"] = round(location["longitude"] + rng.uniform(-1, 1) * COORDINATE_JITTER_DEGREES, 6)
+
+        restaurant = {
+            "restaurant_id": f"r{number:0{id_width}d}",
+            "name": f"GoodFoods {area} {suffix} {number}".replace("  ", " "),
+            "location": location,
+            "cuisine": list(rng.choice(seed_restaurants)["cuisine"]),
+            "operating_hours": dict(template["operating_hours"]),
+            "phone": f"080-{rng.randint(10000000, 99999999)}",
+            "restaurant_max_seating_capacity": rng.choice(seed_restaurants)["restaurant_max_seating_capacity"],
+            "max_booking_party_size": template["max_booking_party_size"],
+            "operating_days": list(template["operating_days"]),
+        }
+        if "dining_duration_minutes" in template:
+            restaurant["dining_duration_minutes"] = template["dining_duration_minutes"]
+        restaurants.append(restaurant)
+    return restaurants
+
+
+def generate_bookings(restaurants: List[Dict[str, Any]], bookings: int, rng: random.Random, start_date: date, days: int):
+    """
+    Yields confirmed orders spread over restaurants and dates.
+
+    Parameters:
+        restaurants (List[Dict[str, Any]]): Generated catalog
+        bookings (int): Number of orders to generate
+        rng (random.Random): Random source
+        start_date (date): First reservation date
+        days (int): Number of dates to spread bookings over
+
+    Returns:
+        Iterator[Dict[str, Any]]: Orders in the bookings_list.json schema
+    """
+
+    from data.schedule import WEEKDAYS, opening_minutes, format_hhmm
+
+    # Quarter-hour arrival times that leave at least an hour before closing, per restaurant
+    arrival_times = []
+    for restaurant in restaurants:
+        open_minute, close_minute = opening_minutes(restaurant["operating_hours"])
+        last_minute = min(close_minute - 60, 24 * 60 - 15)
+        first_minute = ((open_minute + 14) // 15) * 15
+        arrival_times.append([format_hhmm(m) for m in range(first_minute, last_minute + 1, 15)] or ["19:00"])
+
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    for number in range(1, bookings + 1):
+        row = rng.randrange(len(restaurants))
+        restaurant = restaurants[row]
+        reservation_date = rng.choice(dates)
+        for _ in range(7):
+            if WEEKDAYS[reservation_date.weekday()] in restaurant["operating_days"]:
+                break
+            reservation_date += timedelta(days=1)
+        yield {
+            "order_id": f"ord{number:03d}",
+            "orderer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "orderer_contact": f"{rng.randint(6, 9)}{rng.randint(0, 999999999):09d}",
+            "restaurant_id": restaurant["restaurant_id"],
+            "party_size": rng.randint(1, restaurant["max_booking_party_size"]),
+            "reservation_date": reservation_date.isoformat(),
+            "reservation_day": WEEKDAYS[reservation_date.weekday()],
+            "reservation_time": rng.choice(arrival_times[row]),
+            "status": "confirmed",
+        }
+
+
+def write_json_array(path: str, rows) -> int:
+    """
+    Streams rows to a JSON array file with one row per line, so millions of
+    bookings never have to be held as one string.
+
+    Parameters:
+        path (str): Output file
+        rows (Iterable[Dict[str, Any]]): Rows to write
+
+    Returns:
+        int: Number of rows written
+    """
+
+    count = 0
+    with open(path, "w") as f:
+        f.write("[")
+        for row in rows:
+            f.write(",\n  " if count else "\n  ")
+            f.write(json.dumps(row, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def generate_catalog(out_dir: str, outlets: int, bookings: int, seed: int = 7,
+                     start_date: date = None, days: int = 60) -> Dict[str, Any]:
+    """
+    Writes restaurant_list.json and bookings_list.json into out_dir.
+
+    Parameters:
+        out_dir (str): Target directory, created if missing
+        outlets (int): Number of restaurants
+        bookings (int): Number of bookings
+        seed (int, optional): Random seed. Defaults to 7.
+        start_date (date, optional): First booking date. Defaults to today.
+        days (int, optional): Number of booking dates. Defaults to 60.
+
+    Returns:
+        Dict[str, Any]: Summary with counts, file sizes and generation time
+    """
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    with open(os.path.join(REPO_DATA_DIR, "restaurant_list.json")) as f:
+        seed_restaurants = json.load(f)
+
+    os.makedirs(out_dir, exist_ok=True)
+    restaurants = generate_restaurants(outlets, rng, seed_restaurants)
+    restaurant_path = os.path.join(out_dir, "restaurant_list.json")
+    booking_path = os.path.join(out_dir, "bookings_list.json")
+    write_json_array(restaurant_path, restaurants)
+    written = write_json_array(booking_path, generate_bookings(restaurants, bookings, rng, start_date or date.today(), days))
+
+    return {
+        "out_dir": out_dir,
+        "outlets": len(restaurants),
+        "bookings": written,
+        "restaurant_file_mb": round(os.path.getsize(restaurant_path) / 1e6, 2),
+        "booking_file_mb": round(os.path.getsize(booking_path) / 1e6, 2),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic GoodFoods catalog and bookings")
+    parser.add_argument("--outlets", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=60, help="Spread bookings over this many days from today")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", required=True, help="Directory to write restaurant_list.json and bookings_list.json to")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.out) == REPO_DATA_DIR:
+        sys.exit("Refusing to overwrite the real catalog in data/")
+    print(json.dumps(generate_catalog(args.out, args.outlets, args.bookings, args.seed, days=args.days), indent=2))
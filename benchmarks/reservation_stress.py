@@ -0,0 +1,175 @@
+"""
+GoodFoods Reservation Stress Test
+
+Fires thousands of concurrent bookings at a handful of restaurant slots and
+checks that no restaurant is overbooked at any minute (bookings hold their
+seats for the restaurant's dining duration), no order ID is handed out twice and the
+stored bookings survive a reload. Runs against a temporary copy of the data
+directory, so the real bookings are never touched. With --processes the
+burst is split over several processes sharing one SQLite store, the way
+`start.py --workers N` runs the API.
+
+Usage:
+   python -m benchmarks.reservation_stress
+   python -m benchmarks.reservation_stress --backend sqlite --bookings 5000 --threads 128
+   python -m benchmarks.reservation_stress --backend sqlite --processes 4
+
+Exits with status 1 if any invariant is violated.
+"""
+
+#Basic imports
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Setting up Basic Logging
+import logging
+
+#Global Variables
+REPO_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SEED_FILES = ("restaurant_list.json", "bookings_list.json")
+FIRST_NAMES = ["Asha", "Ravi", "Meera", "Arjun", "Kavya", "Rohan", "Diya", "Kiran", "Nikhil", "Pooja"]
+
+
+def book_in_worker_process(data_dir: str, backend: str, requests: list, threads: int, start_at: float) -> tuple:
+    """
+    Places bookings from a separate process with its own copy of the API module, like one uvicorn worker.
+    Waits until start_at (time.time()) so every process fires at once, and returns (results, seconds spent booking).
+    """
+
+    os.environ["GOODFOODS_DATA_DIR"] = data_dir
+    os.environ["GOODFOODS_STORAGE"] = backend
+    os.environ["GOODFOODS_WORKERS"] = "2"
+
+    from data import service_api
+    logging.getLogger('goodfoods.api').setLevel(logging.WARNING)
+    time.sleep(max(start_at - time.time(), 0))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(service_api.make_new_order, requests))
+    elapsed = time.perf_counter() - started
+    service_api.storage.close()
+    return results, elapsed
+
+
+def run_stress(backend: str, bookings: int, threads: int, slots: int, seed: int, processes: int = 1) -> bool:
+    """
+    Runs the concurrent booking burst and verifies the invariants.
+
+    Parameters:
+        backend (str): Storage backend to exercise ('json' or 'sqlite')
+        bookings (int): Number of booking attempts to fire
+        threads (int): Number of concurrent worker threads per process
+        slots (int): Number of distinct (restaurant, date, time) slots to contend on; times 30 minutes apart overlap
+        seed (int): Random seed for party sizes and slot choice
+        processes (int, optional): Worker processes sharing the store (sqlite only). Defaults to 1.
+
+    Returns:
+        bool: True if every invariant holds
+    """
+
+    data_dir = tempfile.mkdtemp(prefix="goodfoods-stress-")
+    for file_name in SEED_FILES:
+        shutil.copy(os.path.join(REPO_DATA_DIR, file_name), data_dir)
+    os.environ["GOODFOODS_DATA_DIR"] = data_dir
+    os.environ["GOODFOODS_STORAGE"] = backend
+
+    from data import service_api
+    from data.storage_backend import create_storage_backend
+    from data.capacity_ledger import CapacityLedger
+
+    logging.getLogger('goodfoods.api').setLevel(logging.WARNING)
+
+    rng = random.Random(seed)
+    restaurants = service_api.catalog.restaurants
+    slot_keys = [
+        (r["restaurant_id"], "2030-01-15", reservation_time)
+        for reservation_time in ("19:00", "19:30", "20:00") for r in restaurants
+    ][:slots]
+    requests = []
+    for i in range(bookings):
+        restaurant_id, reservation_date, reservation_time = rng.choice(slot_keys)
+        requests.append({
+            "restaurant_id": restaurant_id,
+            "orderer_name": f"{rng.choice(FIRST_NAMES)} Stress",
+            "orderer_contact": f"7{i:09d}",
+            "party_size": rng.randint(1, 6),
+            "reservation_date": reservation_date,
+            "reservation_time": reservation_time,
+        })
+
+    if processes > 1:
+        # Spawned, not forked, so no worker inherits this process's open database connection.
+        # Workers import the API first and start booking together, so startup is not timed.
+        chunks = [requests[i::processes] for i in range(processes)]
+        start_at = time.time() + 5 + processes
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(book_in_worker_process, data_dir, backend, chunk, threads, start_at) for chunk in chunks]
+            outcomes = [future.result() for future in futures]
+        results = [result for chunk_results, _ in outcomes for result in chunk_results]
+        elapsed = max(seconds for _, seconds in outcomes)
+    else:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(service_api.make_new_order, requests))
+        elapsed = time.perf_counter() - started
+
+    confirmed = [result["order"] for result in results if result["status"] == "success"]
+    rejected = len(results) - len(confirmed)
+    print(f"{backend} x{processes} process(es): {len(results)} attempts in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.0f}/s), {len(confirmed)} confirmed, {rejected} rejected")
+
+    ok = True
+    service_api.storage.close()
+    reloaded = create_storage_backend(backend, data_dir)
+    stored_orders = reloaded.list_orders()
+
+    for source, orders in (("confirmed", confirmed), ("stored", stored_orders)):
+        duplicates = [order_id for order_id, count in Counter(o["order_id"] for o in orders).items() if count > 1]
+        if duplicates:
+            print(f"FAIL: duplicate {source} order IDs: {duplicates[:10]}")
+            ok = False
+
+    stored_ids = {o["order_id"] for o in stored_orders}
+    missing = [o["order_id"] for o in confirmed if o["order_id"] not in stored_ids]
+    if missing:
+        print(f"FAIL: {len(missing)} confirmed orders missing after reload")
+        ok = False
+
+    # Rebuild per-minute occupancy from everything stored and check it against capacity
+    capacity = {r["restaurant_id"]: r["restaurant_max_seating_capacity"] for r in restaurants}
+    occupancy = CapacityLedger(stored_orders, reloaded.duration_for)
+    for restaurant_id, reservation_date in sorted({(slot[0], slot[1]) for slot in slot_keys}):
+        minutes = occupancy.occupancy(restaurant_id, reservation_date)
+        peak = int(minutes.max()) if minutes is not None else 0
+        if peak > capacity[restaurant_id]:
+            print(f"FAIL: {restaurant_id} on {reservation_date} seats {peak} at once (capacity {capacity[restaurant_id]})")
+            ok = False
+
+    reloaded.close()
+    shutil.rmtree(data_dir, ignore_errors=True)
+    print("PASS" if ok else "FAILED")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent reservation stress test")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--bookings", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--slots", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes sharing the store (sqlite only)")
+    args = parser.parse_args()
+
+    if args.processes > 1 and args.backend != "sqlite":
+        parser.error("--processes needs --backend sqlite")
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(0 if run_stress(args.backend, args.bookings, args.threads, args.slots, args.seed, args.processes) else 1)
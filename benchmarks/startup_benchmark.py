@@ -0,0 +1,224 @@
+"""
+GoodFoods Startup Benchmark
+
+Measures what the Streamlit UI pays to import the agent modules. It has two
+numbers per module:
+- cold: a fresh interpreter running `python -X importtime -c "import <module>"`,
+  once per run, reporting the module's cumulative import time and the
+  process wall time.
+- rerun: re-executing the import statement in a warm process, which is what
+  every Streamlit rerun of app_goodfoods.py costs.
+It also reports whether the import pulled in the API backend (data.service_api),
+and lists the heaviest imports.
+
+Usage:
+   python -m benchmarks.startup_benchmark
+   python -m benchmarks.startup_benchmark --runs 10 --compare benchmarks/results/previous-startup.json
+"""
+
+#Basic imports
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Tuple
+
+#Global Variables
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+UI_MODULES = ("agent.conversation_engine", "agent.toolkit", "agent.prompt_library")
+BACKEND_MODULE = "data.service_api"
+RERUN_REPEATS = 1000
+
+#All Functions Available
+# parse_importtime(stderr) -> [(module, self_us, cumulative_us, depth)]
+# import_subtree(rows, module) -> the importtime rows of everything a top-level import pulled in
+# cold_import(module) -> wall seconds, importtime rows and whether the backend was loaded
+# rerun_import(module) -> seconds per warm re-import
+# run_benchmarks(args) -> results dict
+# compare_results(current, previous) - prints cold and rerun changes
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parses `-X importtime` output.
+
+    Parameters:
+        stderr (str): Interpreter stderr
+
+    Returns:
+        List[Tuple[str, int, int, int]]: (module, self microseconds, cumulative microseconds, nesting depth) per import
+    """
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def import_subtree(rows: List[Tuple[str, int, int, int]], module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Returns the rows imported on behalf of a top-level import, itself included.
+    importtime lists children before their parent, so these are the rows
+    between the previous top-level entry and the module's own.
+    """
+
+    pending = []
+    for row in rows:
+        pending.append(row)
+        if row[3] == 0:
+            if row[0] == module:
+                return pending
+            pending = []
+    return []
+
+
+def cold_import(module: str) -> Dict[str, Any]:
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Parameters:
+        module (str): Dotted module name
+
+    Returns:
+        Dict[str, Any]: wall_seconds, import_seconds (the module's cumulative import time), loads_backend and its import rows
+    """
+
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True)
+    wall_seconds = time.perf_counter() - started
+    rows = import_subtree(parse_importtime(completed.stderr), module)
+    return {
+        "wall_seconds": wall_seconds,
+        "import_seconds": rows[-1][2] / 1e6 if rows else 0.0,
+        "loads_backend": any(name == BACKEND_MODULE for name, _, _, _ in rows),
+        "rows": rows,
+    }
+
+
+def rerun_import(module: str, repeats: int = RERUN_REPEATS) -> float:
+    """
+    Times a warm re-import the way a Streamlit rerun re-executes the app's import lines.
+
+    Parameters:
+        module (str): Dotted module name
+        repeats (int, optional): Re-imports to average over
+
+    Returns:
+        float: Seconds per re-import
+    """
+
+    script = (
+        "import importlib, time\n"
+        f"importlib.import_module({module!r})\n"
+        "started = time.perf_counter()\n"
+        f"for _ in range({repeats}):\n"
+        f"    exec('import {module}')\n"
+        f"print((time.perf_counter() - started) / {repeats})\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", script], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> Any:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs the cold and rerun import benchmarks for every module.
+
+    Parameters:
+        args (argparse.Namespace): Parsed command line options
+
+    Returns:
+        Dict[str, Any]: Run metadata and per-module results
+    """
+
+    results = {}
+    for module in args.modules:
+        runs = [cold_import(module) for _ in range(args.runs)]
+        heaviest = sorted(
+            ((name, cum) for name, _, cum, depth in runs[-1]["rows"] if depth == 1),
+            key=lambda item: item[1], reverse=True
+        )[:args.top]
+        results[module] = {
+            "cold_import_ms": round(statistics.median(r["import_seconds"] for r in runs) * 1000, 1),
+            "cold_process_ms": round(statistics.median(r["wall_seconds"] for r in runs) * 1000, 1),
+            "rerun_us": round(rerun_import(module) * 1e6, 2),
+            "loads_backend": runs[-1]["loads_backend"],
+            "heaviest_imports_ms": {name: round(cum / 1000, 1) for name, cum in heaviest},
+        }
+
+    return {
+        "run": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "runs": args.runs,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """
+    Prints cold import, process and rerun times of this run next to a previous run.
+    """
+
+    print(f"\nCompared with {previous['run'].get('git_commit')} at {previous['run'].get('timestamp')}:")
+    for module, summary in current["results"].items():
+        before = previous.get("results", {}).get(module)
+        if not before:
+            continue
+        changes = []
+        for metric in ("cold_import_ms", "cold_process_ms", "rerun_us"):
+            if before.get(metric):
+                changes.append(f"{metric} {before[metric]} -> {summary[metric]} ({(summary[metric] / before[metric] - 1) * 100:+.0f}%)")
+        print(f"  {module}: " + ", ".join(changes))
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    print(f"\n{'module':<28}{'import ms':>11}{'process ms':>12}{'rerun us':>10}{'backend':>9}")
+    for module, s in report["results"].items():
+        print(f"{module:<28}{s['cold_import_ms']:>11}{s['cold_process_ms']:>12}{s['rerun_us']:>10}{str(s['loads_backend']):>9}")
+        for name, ms in s["heaviest_imports_ms"].items():
+            print(f"    {name:<40}{ms:>10} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GoodFoods UI startup (import time) benchmark")
+    parser.add_argument("--modules", nargs="+", default=list(UI_MODULES), help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per module")
+    parser.add_argument("--out", help="Result file (default benchmarks/results/startup-<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+    print_results(report)
+
+    out_path = args.out or os.path.join(RESULTS_DIR, f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {out_path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(report, json.load(f))
@@ -0,0 +1,244 @@
+"""
+Admission control and per-client rate limiting for the API.
+Every request is classified by priority (searches and other reads, or
+reservation writes). Each priority has its own per-client token buckets and
+its own concurrency gate with a bounded wait queue, so a burst of bookings
+cannot hold the slots searches run in, and the other way around. A request
+over its client's rate is answered 429, one that finds the queue full or
+waits too long for a slot 503, both with a Retry-After header, instead of
+piling up behind the requests already running. Limits apply per worker
+process.
+"""
+
+#Basic imports
+import asyncio
+import hmac
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Tuple, Callable, Optional, Deque, Collection
+
+#Global Variables
+DEFAULT_MAX_CLIENTS = 10000
+CLIENT_ID_HEADER = "x-client-id"
+CLIENT_SECRET_HEADER = "x-client-secret"
+
+#All Functions Available
+# TokenBucketLimiter(rate, burst, max_clients, clock) - per-client token buckets
+# TokenBucketLimiter.acquire(client) -> 0 if allowed, else seconds until the client has a token again
+# AdmissionGate(limit, max_queue, queue_timeout) - bounded concurrency with a bounded, time-limited wait queue
+# AdmissionGate.acquire() / AdmissionGate.release() / AdmissionGate.stats()
+# client_identity(scope, trusted_proxies, shared_secret) - X-Client-Id header from a trusted sender, else the peer address
+# AdmissionControlMiddleware(app, classify, gates, limiters, on_reject, identify) - ASGI middleware answering 429 / 503
+
+
+class TokenBucketLimiter:
+    """
+    Allows each client `rate` requests per second on average and bursts of
+    up to `burst`. Buckets of the least recently seen clients are dropped
+    beyond max_clients; such a client starts again with a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = DEFAULT_MAX_CLIENTS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_clients = max_clients
+        self._clock = clock
+        # client -> (tokens, last refill time)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> float:
+        """
+        Takes one token from the client's bucket.
+
+        Parameters:
+            client (str): Client identity
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until the client has a token again
+        """
+
+        now = self._clock()
+        with self._lock:
+            tokens, refilled_at = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - refilled_at) * self.rate)
+            wait_seconds = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait_seconds = (1 - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait_seconds
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionGate:
+    """
+    Lets at most `limit` requests run at once. Further requests wait in FIFO
+    order, at most `max_queue` of them and for at most `queue_timeout`
+    seconds; beyond that they are refused right away. Used from the event
+    loop only, so it needs no locking.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Waits for a slot.
+
+        Returns:
+            Optional[str]: None once admitted (call release() when done), else the reason: 'queue_full' or 'queue_timeout'
+        """
+
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except BaseException:
+            # The request was cancelled while waiting; hand on a slot it was just given
+            self._abandon(waiter)
+            raise
+        if waiter.done():
+            return None
+        self._abandon(waiter)
+        return "queue_timeout"
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        """
+        Frees a slot, handing it straight to the longest-waiting request.
+        """
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"active": self.active, "queued": len(self._waiters), "limit": self.limit, "max_queue": self.max_queue}
+
+
+def client_identity(scope: dict, trusted_proxies: Collection[str] = (), shared_secret: Optional[str] = None) -> str:
+    """
+    Identifies the caller for rate limiting. The X-Client-Id header (e.g. one ID
+    per chat session from the UI) counts only when the request comes from one of
+    trusted_proxies or carries shared_secret in X-Client-Secret; a client free to
+    pick its own ID could take a fresh token bucket for every request. Anything
+    else is identified by its peer address.
+
+    Parameters:
+        scope (dict): ASGI scope of the request
+        trusted_proxies (Collection[str]): Peer addresses whose X-Client-Id is believed
+        shared_secret (Optional[str]): Secret that makes X-Client-Id believed from any address
+
+    Returns:
+        str: 'id:<client id>', 'ip:<peer address>' or 'unknown'
+    """
+
+    headers = {name: value for name, value in scope.get("headers", ())}
+    client = scope.get("client")
+    peer = client[0] if client else None
+    client_id = headers.get(CLIENT_ID_HEADER.encode("latin-1"))
+    if client_id:
+        secret = headers.get(CLIENT_SECRET_HEADER.encode("latin-1"))
+        if (peer in trusted_proxies or
+                (shared_secret and secret is not None and hmac.compare_digest(secret, shared_secret.encode("latin-1")))):
+            return "id:" + client_id.decode("latin-1")
+    return "ip:" + peer if peer else "unknown"
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying the rate limiter and then the concurrency gate
+    of each request's priority. classify(method, path) returns the priority,
+    or None for requests that are never limited (e.g. /metrics).
+    on_reject(priority, reason) is called for every refused request and
+    identify(scope) names the client whose token bucket a request uses.
+    """
+
+    def __init__(self, app, classify: Callable[[str, str], Optional[str]], gates: Dict[str, AdmissionGate],
+                 limiters: Dict[str, TokenBucketLimiter], on_reject: Callable[[str, str], None] = None,
+                 identify: Callable[[dict], str] = client_identity):
+        self.app = app
+        self.classify = classify
+        self.gates = gates
+        self.limiters = limiters
+        self.on_reject = on_reject
+        self.identify = identify
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.classify(scope["method"], scope["path"])
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters.get(priority)
+        if limiter is not None:
+            wait_seconds = limiter.acquire(self.identify(scope))
+            if wait_seconds > 0:
+                await self._reject(send, priority, "rate_limited", 429, wait_seconds,
+                                   "Too many requests from this client, please slow down")
+                return
+
+        gate = self.gates.get(priority)
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await gate.acquire()
+        if reason is not None:
+            await self._reject(send, priority, reason, 503, gate.queue_timeout,
+                               "The service is busy, please retry shortly")
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    async def _reject(self, send, priority: str, reason: str, status: int, retry_after: float, message: str) -> None:
+        if self.on_reject is not None:
+            self.on_reject(priority, reason)
+        retry_after = max(1, math.ceil(retry_after))
+        body = json.dumps({"detail": {"status": "error", "message": message, "reason": reason,
+                                      "retry_after": retry_after}}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("latin-1")),
+                        (b"retry-after", str(retry_after).encode("latin-1"))],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,92 @@
+"""
+Vectorized availability grid.
+Computes the remaining seats of many restaurants over a range of dates and
+time slots in one pass with NumPy arrays, instead of one capacity check per
+(restaurant, date, slot).
+"""
+
+#Basic imports
+from datetime import date, timedelta
+from typing import List, Dict, Any
+
+#Third party imports
+import numpy as np
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Internal imports
+from data.schedule import MINUTES_PER_DAY, format_hhmm, weekday_mask, opening_minutes, dining_duration
+
+#All Functions Available
+# build_availability_grid(restaurants, start_date, days, slot_minutes, occupancy)
+
+
+def build_availability_grid(restaurants: List[Dict[str, Any]], start_date: date, days: int, slot_minutes: int,
+                            occupancy: Any) -> Dict[str, Any]:
+    """
+    Computes remaining capacity for every restaurant, date and time slot.
+
+    Slots outside operating days or hours have 0 seats left. A slot's
+    remaining seats are what is free for a whole dining window starting at
+    the slot, i.e. capacity minus the peak occupancy over that window; a slot
+    opened by the previous day's after-midnight session is open as well.
+
+    Parameters:
+        restaurants (List[Dict[str, Any]]): Restaurants to include, in output order
+        start_date (date): First date of the grid
+        days (int): Number of dates in the grid
+        slot_minutes (int): Slot granularity in minutes, must divide 1440
+        occupancy (CapacityLedger): Per-minute occupancy covering the grid dates and the day after each
+
+    Returns:
+        Dict[str, Any]: dates, slot_times, restaurant_ids and remaining, an int array
+        of shape (restaurants, days, slots)
+    """
+
+    dates = [start_date + timedelta(days=offset) for offset in range(days + 1)]
+    date_keys = [d.isoformat() for d in dates]
+    slot_start = np.arange(0, MINUTES_PER_DAY, slot_minutes)
+
+    capacity = np.array([r.get("restaurant_max_seating_capacity", 0) for r in restaurants], dtype=np.int64)
+    hours = np.array([opening_minutes(r.get("operating_hours", {})) for r in restaurants], dtype=np.int64).reshape(-1, 2)
+    day_masks = np.array([weekday_mask(r.get("operating_days", [])) for r in restaurants], dtype=np.int64)
+    weekdays = np.array([d.weekday() for d in dates[:days]], dtype=np.int64)
+
+    # (R, D): is the restaurant open on this date / was it open the day before
+    open_today = (day_masks[:, None] >> weekdays[None, :]) & 1
+    open_yesterday = (day_masks[:, None] >> ((weekdays[None, :] - 1) % 7)) & 1
+    # (R, S): slot inside today's session / inside the spill-over of yesterday's session
+    in_session = (slot_start[None, :] >= hours[:, :1]) & (slot_start[None, :] < hours[:, 1:])
+    in_spillover = slot_start[None, :] + MINUTES_PER_DAY < hours[:, 1:]
+    is_open = ((open_today[:, :, None] == 1) & in_session[:, None, :]) | \
+              ((open_yesterday[:, :, None] == 1) & in_spillover[:, None, :])
+
+    # Peak seats in use over the dining window that starts at each slot, only for restaurant-days with bookings
+    booked_grid = np.zeros(is_open.shape, dtype=np.int64)
+    busy_days = 0
+    empty_day = np.zeros(MINUTES_PER_DAY, dtype=np.int32)
+    for row, restaurant in enumerate(restaurants):
+        duration = min(dining_duration(restaurant), MINUTES_PER_DAY)
+        minutes = [occupancy.occupancy(restaurant["restaurant_id"], key) for key in date_keys]
+        for col in range(days):
+            if minutes[col] is None and minutes[col + 1] is None:
+                continue
+            two_days = np.concatenate([
+                minutes[col] if minutes[col] is not None else empty_day,
+                minutes[col + 1] if minutes[col + 1] is not None else empty_day
+            ])
+            windows = np.lib.stride_tricks.sliding_window_view(two_days, duration)
+            booked_grid[row, col] = windows[slot_start].max(axis=1)
+            busy_days += 1
+
+    remaining = np.where(is_open, np.maximum(capacity[:, None, None] - booked_grid, 0), 0)
+    logger.info(f"Built availability grid of shape {remaining.shape} with {busy_days} booked restaurant-days")
+
+    return {
+        "dates": date_keys[:days],
+        "slot_times": [format_hhmm(int(m)) for m in slot_start],
+        "restaurant_ids": [r["restaurant_id"] for r in restaurants],
+        "remaining": remaining,
+    }
@@ -0,0 +1,110 @@
+"""
+Hash indexes over the in-memory booking list.
+Bookings are looked up by order_id and by the orderer's contact number in
+constant time, instead of scanning every stored order. The indexes hold list
+positions, so replacing a modified or cancelled order keeps its place in the
+snapshot and journal order.
+"""
+
+#Basic imports
+import re
+from typing import List, Dict, Any, Optional
+
+#Global Variables
+NON_DIGITS = re.compile(r"\D")
+CONTACT_DIGITS = 10
+
+#All Functions Available
+# contact_key(contact) -> normalized contact number used as index key
+# BookingIndex(orders) - order_id and contact indexes over a list of orders
+# BookingIndex.add(order) / BookingIndex.replace(order)
+# BookingIndex.get(order_id) / BookingIndex.for_contact(contact)
+
+
+def contact_key(contact: Any) -> str:
+    """
+    Normalizes a contact number so '98765 43210', '+91-9876543210' and '9876543210' match.
+
+    Parameters:
+        contact (Any): Contact number as entered
+
+    Returns:
+        str: Its digits, keeping the last 10 when a country code is included
+    """
+
+    digits = NON_DIGITS.sub("", str(contact or ""))
+    return digits[-CONTACT_DIGITS:]
+
+
+class BookingIndex:
+    """
+    Indexes a list of orders that is only appended to or updated in place.
+
+    The caller owns the list and serializes writes; add() must be called
+    after appending an order and replace() to update one.
+    """
+
+    def __init__(self, orders: List[Dict[str, Any]]):
+        self.orders = orders
+        self._positions: Dict[str, int] = {}
+        self._positions_by_contact: Dict[str, List[int]] = {}
+        for position in range(len(orders)):
+            self._index(position)
+
+    def _index(self, position: int) -> None:
+        order = self.orders[position]
+        self._positions[order.get("order_id")] = position
+        key = contact_key(order.get("orderer_contact"))
+        if key:
+            self._positions_by_contact.setdefault(key, []).append(position)
+
+    def add(self, order: Dict[str, Any]) -> None:
+        """
+        Indexes an order just appended to the list.
+        """
+
+        self._index(len(self.orders) - 1)
+
+    def replace(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replaces the stored order with the same order_id, moving it between contacts if needed.
+
+        Parameters:
+            order (Dict[str, Any]): New version of an indexed order
+
+        Returns:
+            Dict[str, Any]: The previous version
+
+        Raises:
+            KeyError: If no order with that order_id is indexed
+        """
+
+        position = self._positions[order["order_id"]]
+        previous = self.orders[position]
+        old_key, new_key = contact_key(previous.get("orderer_contact")), contact_key(order.get("orderer_contact"))
+        if old_key != new_key:
+            if old_key:
+                self._positions_by_contact[old_key].remove(position)
+                if not self._positions_by_contact[old_key]:
+                    del self._positions_by_contact[old_key]
+            if new_key:
+                positions = self._positions_by_contact.setdefault(new_key, [])
+                positions.append(position)
+                positions.sort()
+        self.orders[position] = order
+        return previous
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the order with this order_id, or None.
+        """
+
+        position = self._positions.get(order_id)
+        return self.orders[position] if position is not None else None
+
+    def for_contact(self, contact: Any) -> List[Dict[str, Any]]:
+        """
+        Returns the orders placed with this contact number, oldest first.
+        """
+
+        return [self.orders[position] for position in self._positions_by_contact.get(contact_key(contact), [])]
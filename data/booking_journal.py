@@ -0,0 +1,240 @@
+"""
+Append-only journal for confirmed bookings.
+Each new order ("create") and each modified or cancelled order ("update", the
+full new version) is written as one JSON line next to the bookings_list.json
+snapshot, so the cost of a write depends on the order size instead of the
+booking history. The journal is periodically compacted back into the
+snapshot and replayed on startup. The waitlist is persisted the same way,
+with entries keyed by waitlist_id.
+"""
+
+#Basic imports
+import json
+import os
+import threading
+import time
+from typing import List, Dict, Any
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Internal imports
+from data.metrics import STAGE_SECONDS
+
+#Global Variables
+DEFAULT_FSYNC_BATCH_SIZE = 8
+DEFAULT_FSYNC_INTERVAL_SECONDS = 1.0
+DEFAULT_COMPACT_EVERY = 1000
+
+#All Functions Available
+# BookingJournal(snapshot_path, journal_path, fsync_batch_size, fsync_interval_seconds, compact_every, key_field, record_field, snapshot_required)
+# BookingJournal.load() -> orders from snapshot plus replayed journal
+# BookingJournal.append(record)
+# BookingJournal.compaction_due
+# BookingJournal.compact(orders)
+# BookingJournal.sync()
+# BookingJournal.close()
+
+
+class BookingJournal:
+    """
+    JSON Lines journal layered over a JSON snapshot of all bookings.
+
+    Records are flushed to the OS on every append and fsynced in batches of
+    fsync_batch_size records or after fsync_interval_seconds, whichever comes
+    first. Once the journal holds compact_every records, or half as many records
+    as the snapshot when that is larger, the caller compacts the full order list
+    into a new snapshot and the journal is truncated. Scaling the threshold with
+    the snapshot keeps the rewrite cost per booking constant as history grows.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: str,
+                 fsync_batch_size: int = DEFAULT_FSYNC_BATCH_SIZE,
+                 fsync_interval_seconds: float = DEFAULT_FSYNC_INTERVAL_SECONDS,
+                 compact_every: int = DEFAULT_COMPACT_EVERY, key_field: str = "order_id", record_field: str = "order",
+                 snapshot_required: bool = True):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.compact_every = compact_every
+        self.key_field = key_field
+        self.record_field = record_field
+        self.snapshot_required = snapshot_required
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._journal_records = 0
+        self._snapshot_records = 0
+        self._unsynced_records = 0
+        self._last_sync = time.monotonic()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Loads the snapshot and replays the journal on top of it.
+
+        Records are matched on key_field (order_id for bookings) and carry the
+        stored item under record_field. A torn final line left by a crash
+        mid-append is skipped. Orders already
+        present in the snapshot are not added twice, so a crash between writing
+        a snapshot and truncating the journal is harmless. An update replaces
+        the order with the same order_id in place; replaying it again is harmless
+        for the same reason.
+
+        Returns:
+            List[Dict[str, Any]]: All confirmed orders in write order
+        """
+
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                orders: List[Dict[str, Any]] = json.load(f)
+            logger.info(f"Successfully loaded {os.path.basename(self.snapshot_path)}")
+        except FileNotFoundError:
+            if self.snapshot_required:
+                logger.error(f"Error: {os.path.basename(self.snapshot_path)} not found")
+            orders = []
+        self._snapshot_records = len(orders)
+
+        positions = {order.get(self.key_field): position for position, order in enumerate(orders)}
+        replayed = 0
+        try:
+            with open(self.journal_path, 'r') as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable journal line {line_number} in {self.journal_path}")
+                        continue
+                    self._journal_records += 1
+                    if record.get("op") not in ("create", "update"):
+                        logger.warning(f"Skipping journal record with unknown op: {record.get('op')}")
+                        continue
+                    order = record[self.record_field]
+                    position = positions.get(order.get(self.key_field))
+                    if position is not None:
+                        if record["op"] == "update":
+                            orders[position] = order
+                            replayed += 1
+                        continue
+                    positions[order.get(self.key_field)] = len(orders)
+                    orders.append(order)
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+
+        logger.info(f"Replayed {replayed} records from {os.path.basename(self.journal_path)}")
+        return orders
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Appends one record to the journal. If the write fails, the journal is
+        left as it was and the error is raised to the caller.
+
+        Parameters:
+            record (Dict[str, Any]): Journal record, {"op": "create" or "update", "order": {...}}
+        """
+
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a')
+            size = self._file.tell()
+            try:
+                self._file.write(line)
+                self._file.flush()
+            except Exception:
+                self._discard_partial_write(size)
+                raise
+            self._journal_records += 1
+            self._unsynced_records += 1
+            if (self._unsynced_records >= self.fsync_batch_size or
+                    time.monotonic() - self._last_sync >= self.fsync_interval_seconds):
+                self._sync_locked()
+
+    @property
+    def compaction_due(self) -> bool:
+        """
+        True once the journal holds max(compact_every, snapshot size / 2) records or more.
+        """
+
+        return self._journal_records >= max(self.compact_every, self._snapshot_records // 2)
+
+    def compact(self, orders: List[Dict[str, Any]]) -> None:
+        """
+        Writes all orders into a fresh snapshot and truncates the journal.
+
+        The snapshot is written to a temporary file, fsynced and atomically
+        renamed over the old one before the journal is cleared. The order list
+        is copied while the journal lock is held, so every order whose record
+        is about to be truncated is already part of the snapshot.
+
+        Parameters:
+            orders (List[Dict[str, Any]]): Complete list of confirmed orders
+        """
+
+        with self._lock, STAGE_SECONDS.time(stage="journal_compaction"):
+            self._sync_locked()
+            snapshot = list(orders)
+            temp_path = self.snapshot_path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.journal_path, 'w')
+            os.fsync(self._file.fileno())
+            self._journal_records = 0
+            self._snapshot_records = len(snapshot)
+            logger.info(f"Compacted {len(snapshot)} orders into {os.path.basename(self.snapshot_path)}")
+
+    def sync(self) -> None:
+        """
+        Forces any unsynced journal records to disk.
+        """
+
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        """
+        Syncs and closes the journal file.
+        """
+
+        with self._lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _discard_partial_write(self, size: int) -> None:
+        """
+        Cuts the journal back to size after a failed append, so a partly written
+        line cannot run into the next record. Caller must hold the journal lock.
+        """
+
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+        try:
+            os.truncate(self.journal_path, size)
+        except OSError as e:
+            logger.error(f"Could not cut a partly written record from {self.journal_path}: {e}")
+
+    def _sync_locked(self) -> None:
+        """
+        Fsyncs the journal file. Caller must hold the journal lock.
+        """
+
+        if self._file is not None and self._unsynced_records:
+            with STAGE_SECONDS.time(stage="journal_fsync"):
+                os.fsync(self._file.fileno())
+        self._unsynced_records = 0
+        self._last_sync = time.monotonic()
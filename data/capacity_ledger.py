@@ -0,0 +1,153 @@
+"""
+In-memory occupancy ledger for restaurant seats.
+Each booking holds its seats for the restaurant's dining duration, so a 19:00
+and a 19:15 booking compete for the same seats. Bookings are kept as
+(start_minute, end_minute, seats) intervals per (restaurant_id,
+reservation_date), updated on every confirmed, modified or cancelled order.
+Cancelled orders hold no seats. A capacity check turns
+one or two days of intervals into per-minute seat counts with a prefix sum
+and reads one dining window, never walking the rest of the booking history.
+"""
+
+#Basic imports
+from typing import Dict, Any, Tuple, Iterable, Callable, Optional, List
+
+#Third party imports
+import numpy as np
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Internal imports
+from data.schedule import MINUTES_PER_DAY, DEFAULT_DINING_DURATION_MINUTES, parse_hhmm, split_by_day
+
+#Global Variables
+CANCELLED_STATUS = "cancelled"
+
+#All Functions Available
+# CapacityLedger(orders, duration_for) - booking intervals for each (restaurant_id, reservation_date)
+# holds_seats(order) -> False for cancelled orders
+# CapacityLedger.add(order) / CapacityLedger.remove(order)
+# CapacityLedger.peak_seats(restaurant_id, reservation_date, reservation_time, duration, excluding)
+# CapacityLedger.occupancy(restaurant_id, reservation_date) -> per-minute seat counts or None
+
+
+def _default_duration(restaurant_id: str) -> int:
+    return DEFAULT_DINING_DURATION_MINUTES
+
+
+def holds_seats(order: Dict[str, Any]) -> bool:
+    """
+    True unless the order was cancelled.
+    """
+
+    return order.get("status") != CANCELLED_STATUS
+
+
+class CapacityLedger:
+    """
+    Booking intervals keyed by (restaurant_id, reservation_date).
+
+    An order at reservation_time holds party_size seats during
+    [reservation_time, reservation_time + duration); a stay that crosses
+    midnight continues as an interval on the next date. duration_for maps a
+    restaurant_id to its dining duration in minutes. Intervals cost a few
+    dozen bytes per booking, where a per-minute array per restaurant-day
+    would cost kilobytes for every day with a single booking.
+    """
+
+    def __init__(self, orders: Iterable[Dict[str, Any]] = (), duration_for: Callable[[str], int] = _default_duration):
+        self.duration_for = duration_for
+        self._intervals: Dict[Tuple[str, str], List[Tuple[int, int, int]]] = {}
+        for order in orders:
+            self.add(order)
+        logger.info(f"Built capacity ledger over {len(self._intervals)} restaurant-days")
+
+    def _pieces(self, order: Dict[str, Any]) -> List[Tuple[Tuple[str, str], Tuple[int, int, int]]]:
+        """
+        Returns the ((restaurant_id, date), (start, end, seats)) intervals an order holds, none for cancelled orders.
+        """
+
+        if not holds_seats(order):
+            return []
+        try:
+            start_minute = parse_hhmm(order["reservation_time"])
+        except ValueError:
+            logger.warning(f"Order {order.get('order_id')} has unreadable reservation_time {order['reservation_time']!r}, not counted")
+            return []
+
+        duration = self.duration_for(order["restaurant_id"])
+        return [
+            ((order["restaurant_id"], reservation_date), (start, end, order["party_size"]))
+            for reservation_date, start, end in split_by_day(order["reservation_date"], start_minute, duration)
+            if end > start
+        ]
+
+    def add(self, order: Dict[str, Any]) -> None:
+        """
+        Records the seats taken by a confirmed order for its whole dining window.
+
+        Parameters:
+            order (Dict[str, Any]): Order containing restaurant_id, reservation_date, reservation_time and party_size
+        """
+
+        for key, interval in self._pieces(order):
+            self._intervals.setdefault(key, []).append(interval)
+
+    def remove(self, order: Dict[str, Any]) -> None:
+        """
+        Releases the seats of an order previously passed to add(), e.g. before it is moved or cancelled.
+
+        Parameters:
+            order (Dict[str, Any]): The order exactly as it was added
+        """
+
+        for key, interval in self._pieces(order):
+            intervals = self._intervals.get(key)
+            if intervals and interval in intervals:
+                intervals.remove(interval)
+                if not intervals:
+                    del self._intervals[key]
+
+    def peak_seats(self, restaurant_id: str, reservation_date: str, reservation_time: str, duration: int,
+                   excluding: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Returns the most seats in use at any minute of a dining window.
+
+        Parameters:
+            restaurant_id (str): Unique identifier of the restaurant
+            reservation_date (str): Date of reservation in YYYY-MM-DD format
+            reservation_time (str): Time of reservation in HH:MM format
+            duration (int): Length of the dining window in minutes
+            excluding (Optional[Dict[str, Any]]): A stored order whose own seats are not counted, e.g. the one being modified
+
+        Returns:
+            int: Peak seats in use during [reservation_time, reservation_time + duration), 0 if nothing overlaps
+        """
+
+        excluded = self._pieces(excluding) if excluding else []
+        peak = 0
+        for piece_date, start, end in split_by_day(reservation_date, parse_hhmm(reservation_time), duration):
+            minutes = self.occupancy(restaurant_id, piece_date)
+            if minutes is not None and end > start:
+                for (excluded_rid, excluded_date), (excluded_start, excluded_end, seats) in excluded:
+                    if (excluded_rid, excluded_date) == (restaurant_id, piece_date):
+                        minutes[excluded_start:excluded_end] -= seats
+                peak = max(peak, int(minutes[start:end].max()))
+        return peak
+
+    def occupancy(self, restaurant_id: str, reservation_date: str) -> Optional[np.ndarray]:
+        """
+        Returns the seats in use at each minute of a date, or None when nothing is booked.
+        Built from the day's intervals as a prefix sum over start (+seats) and end (-seats) minutes.
+        """
+
+        intervals = self._intervals.get((restaurant_id, reservation_date))
+        if not intervals:
+            return None
+        starts, ends, seats = np.array(list(intervals), dtype=np.int32).T
+        changes = np.zeros(MINUTES_PER_DAY + 1, dtype=np.int32)
+        np.add.at(changes, starts, seats)
+        np.add.at(changes, ends, -seats)
+        return np.cumsum(changes[:MINUTES_PER_DAY], dtype=np.int32)
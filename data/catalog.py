@@ -0,0 +1,133 @@
+"""
+Restaurant catalog snapshots and the file watcher that refreshes them.
+A Catalog bundles the restaurant list with every index built from it. It is
+never modified after construction: a reload builds a complete new Catalog
+off to the side and replaces the old one with a single assignment, so a
+request always reads one consistent snapshot and never waits for a rebuild.
+"""
+
+#Basic imports
+import os
+import threading
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Internal imports
+from data.catalog_columns import CatalogColumns
+from data.search_index import RestaurantSearchIndex
+from data.geo_index import GeoIndex, restaurant_coordinates
+from data.response_encoding import encode_restaurant_records
+
+#All Functions Available
+# validate_catalog(restaurants) - raises ValueError for a catalog that must not be served
+# Catalog(restaurants, version) - immutable catalog snapshot with its indexes
+# CatalogWatcher(path, on_change, interval_seconds) - polls a file's mtime and calls on_change when it changes
+
+
+def validate_catalog(restaurants: Any) -> None:
+    """
+    Checks that a freshly read catalog is safe to serve.
+
+    Parameters:
+        restaurants (Any): Parsed contents of restaurant_list.json
+
+    Raises:
+        ValueError: If the catalog is empty, not a list, or has restaurants without
+            restaurant_id / restaurant_max_seating_capacity or with duplicate IDs
+    """
+
+    if not isinstance(restaurants, list) or not restaurants:
+        raise ValueError("Catalog must be a non-empty list of restaurants")
+    seen = set()
+    for position, restaurant in enumerate(restaurants):
+        if not isinstance(restaurant, dict) or not restaurant.get("restaurant_id"):
+            raise ValueError(f"Restaurant at position {position} has no restaurant_id")
+        if not isinstance(restaurant.get("restaurant_max_seating_capacity"), int):
+            raise ValueError(f"Restaurant {restaurant['restaurant_id']} has no integer restaurant_max_seating_capacity")
+        if restaurant["restaurant_id"] in seen:
+            raise ValueError(f"Duplicate restaurant_id {restaurant['restaurant_id']}")
+        seen.add(restaurant["restaurant_id"])
+
+
+class Catalog:
+    """
+    One immutable version of the restaurant catalog.
+
+    Attributes:
+        restaurants: Restaurant list in catalog order
+        lookup: restaurant_id -> restaurant
+        columns: NumPy columns of the filter fields (capacities, hours, weekday bitmasks, interned cuisines)
+        search_index: Field, fuzzy and opening-hours index
+        geo_index: Spatial index over outlet coordinates
+        encoded_restaurants: JSON bytes of each restaurant, spliced into search responses
+        version: Increases with every reload; tags cached search responses
+    """
+
+    def __init__(self, restaurants: List[Dict[str, Any]], version: int = 0):
+        self.restaurants = restaurants
+        self.lookup: Dict[str, Dict[str, Any]] = {r["restaurant_id"]: r for r in restaurants}
+        self.columns = CatalogColumns(restaurants)
+        self.search_index = RestaurantSearchIndex(restaurants, self.columns)
+        self.geo_index = GeoIndex([restaurant_coordinates(r) for r in restaurants])
+        self.encoded_restaurants = encode_restaurant_records(restaurants)
+        self.version = version
+        logger.info(f"Built catalog version {version} with {len(restaurants)} restaurants")
+
+
+class CatalogWatcher:
+    """
+    Background thread that polls a file's modification time and size and
+    calls on_change() after they change. Errors raised by on_change are
+    logged and the watcher keeps running.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], Any], interval_seconds: float = 5.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = self._read_signature()
+
+    def _read_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self) -> None:
+        """
+        Starts polling in a daemon thread.
+        """
+
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.path} for catalog changes every {self.interval_seconds}s")
+
+    def stop(self) -> None:
+        """
+        Stops polling and waits for the thread to exit.
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            signature = self._read_signature()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            logger.info(f"{self.path} changed, reloading catalog")
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"Catalog reload failed: {e}")
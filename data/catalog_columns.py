@@ -0,0 +1,144 @@
+"""
+Struct-of-arrays view of the restaurant catalog's filter fields.
+Capacities, opening minutes and weekday bitmasks are NumPy columns with one
+entry per catalog row, and cuisines, operating days and opening-hour strings
+are interned to integer codes, so a filter over the whole catalog is a few
+array operations producing a boolean row mask instead of a walk over nested
+restaurant dicts.
+"""
+
+#Basic imports
+from typing import List, Dict, Any, Iterable, Hashable
+
+#Third party imports
+import numpy as np
+
+#Internal imports
+from data.schedule import opening_minutes, weekday_mask
+
+#All Functions Available
+# TagColumn(values_per_row) - interned string lists per row (cuisines, operating days)
+# TagColumn.codes_for(values) / codes_containing(needle) -> interned codes
+# TagColumn.rows_with_any(codes) -> row mask
+# ValueColumn(values) - one interned value per row (opening / closing time strings)
+# ValueColumn.rows_equal(value) -> row mask
+# CatalogColumns(restaurants) - every filter column of a catalog
+
+
+class TagColumn:
+    """
+    A list of strings per row, stored as interned codes.
+
+    names[code] is the original string. Rows are grouped by code once, so the
+    rows holding a given code are one contiguous slice of rows_by_code.
+    """
+
+    def __init__(self, values_per_row: Iterable[Iterable[str]]):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        rows, codes = [], []
+        row_count = 0
+        for row, values in enumerate(values_per_row):
+            row_count = row + 1
+            for value in values:
+                code = self.ids.get(value)
+                if code is None:
+                    code = self.ids[value] = len(self.names)
+                    self.names.append(value)
+                rows.append(row)
+                codes.append(code)
+
+        self.row_count = row_count
+        self.lower_names = [name.lower() for name in self.names]
+        codes = np.array(codes, dtype=np.int32)
+        order = np.argsort(codes, kind="stable")
+        self.rows_by_code = np.array(rows, dtype=np.int32)[order]
+        self.code_bounds = np.searchsorted(codes[order], np.arange(len(self.names) + 1))
+
+    def codes_for(self, values: Iterable[str]) -> List[int]:
+        """
+        Returns the codes of the given exact strings, skipping unknown ones.
+        """
+
+        return [self.ids[value] for value in values if isinstance(value, str) and value in self.ids]
+
+    def codes_containing(self, needle: str) -> List[int]:
+        """
+        Returns the codes whose lowercased string contains the lowercased needle.
+        """
+
+        return [code for code, name in enumerate(self.lower_names) if needle in name]
+
+    def rows_with_any(self, codes: Iterable[int]) -> np.ndarray:
+        """
+        Marks the rows holding at least one of the codes.
+
+        Parameters:
+            codes (Iterable[int]): Interned codes
+
+        Returns:
+            np.ndarray: Boolean mask over the catalog rows
+        """
+
+        mask = np.zeros(self.row_count, dtype=bool)
+        for code in codes:
+            mask[self.rows_by_code[self.code_bounds[code]:self.code_bounds[code + 1]]] = True
+        return mask
+
+
+class ValueColumn:
+    """
+    One hashable value per row, stored as interned codes.
+    """
+
+    def __init__(self, values: Iterable[Hashable]):
+        self.ids: Dict[Hashable, int] = {}
+        self.codes = np.array([self.ids.setdefault(value, len(self.ids)) for value in values], dtype=np.int32)
+
+    def rows_equal(self, value: Any) -> np.ndarray:
+        """
+        Marks the rows whose value equals the given one (none for unhashable values).
+        """
+
+        try:
+            code = self.ids.get(value)
+        except TypeError:
+            code = None
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+
+class CatalogColumns:
+    """
+    Filter fields of a restaurant list as columns indexed by catalog row.
+
+    Attributes:
+        seating_capacity, max_party_size: int32 capacities (0 when missing)
+        open_minute, close_minute: Opening interval in minutes, close past 1440 when closing after midnight
+        day_mask: int32 operating-day bitmask (bit 0 = Monday)
+        cuisines, operating_days: TagColumn of the restaurant's cuisine and operating_days lists
+        opening_time, closing_time: ValueColumn of the operating_hours open / close strings
+    """
+
+    def __init__(self, restaurants: List[Dict[str, Any]]):
+        self.row_count = len(restaurants)
+        self.seating_capacity = np.array([r.get("restaurant_max_seating_capacity", 0) for r in restaurants], dtype=np.int32)
+        self.max_party_size = np.array([r.get("max_booking_party_size", 0) for r in restaurants], dtype=np.int32)
+
+        minutes = [opening_minutes(r.get("operating_hours", {})) for r in restaurants]
+        self.open_minute = np.array([open_minute for open_minute, _ in minutes], dtype=np.int32)
+        self.close_minute = np.array([close_minute for _, close_minute in minutes], dtype=np.int32)
+        self.day_mask = np.array([weekday_mask(r.get("operating_days", [])) for r in restaurants], dtype=np.int32)
+
+        self.cuisines = TagColumn(r.get("cuisine", []) for r in restaurants)
+        self.operating_days = TagColumn(r.get("operating_days", []) for r in restaurants)
+        self.opening_time = ValueColumn(r.get("operating_hours", {}).get("open") for r in restaurants)
+        self.closing_time = ValueColumn(r.get("operating_hours", {}).get("close") for r in restaurants)
+
+    def capacity(self, key: str) -> np.ndarray:
+        """
+        Returns the column for restaurant_max_seating_capacity or max_booking_party_size.
+        """
+
+        return self.seating_capacity if key == "restaurant_max_seating_capacity" else self.max_party_size
@@ -0,0 +1,113 @@
+"""
+Trigram similarity index for misspelled or partial search terms.
+Every word of a field's text is split into padded character trigrams
+('indiranagar' -> '  i', ' in', 'ind', ...), and a query word is compared
+only with the words sharing at least one trigram with it, so a typo such as
+'Indranagar' still finds 'Indiranagar' without scanning the catalog.
+"""
+
+#Basic imports
+import re
+from typing import List, Dict, Set
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Global Variables
+MIN_WORD_LENGTH = 3
+SIMILARITY_THRESHOLD = 0.45
+COMMON_WORD_SHARE = 0.5
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+#All Functions Available
+# trigrams(word) -> padded character trigrams of a word
+# TrigramIndex(texts_per_row) - word trigram index over one text field
+# TrigramIndex.similar(query, threshold) -> similarity per row, best first
+
+
+def trigrams(word: str) -> Set[str]:
+    """
+    Splits a word into character trigrams, padded so that word starts and ends weigh more.
+    """
+
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in WORD_PATTERN.findall(text.lower()) if len(word) >= MIN_WORD_LENGTH]
+
+
+class TrigramIndex:
+    """
+    Word-level trigram index over one text field.
+
+    A row's similarity to a query is the mean, over the query words, of the
+    best trigram (Jaccard) similarity between that word and any word of the
+    row. Words found in most rows (e.g. 'goodfoods', 'bangalore') are ignored
+    when the query has other words, so they do not make every row look similar.
+    """
+
+    def __init__(self, texts_per_row: List[List[str]]):
+        self._rows_by_word: Dict[str, Set[int]] = {}
+        for row, texts in enumerate(texts_per_row):
+            for text in texts:
+                for word in _words(text):
+                    self._rows_by_word.setdefault(word, set()).add(row)
+
+        self._grams_by_word: Dict[str, Set[str]] = {word: trigrams(word) for word in self._rows_by_word}
+        self._words_by_gram: Dict[str, Set[str]] = {}
+        for word, grams in self._grams_by_word.items():
+            for gram in grams:
+                self._words_by_gram.setdefault(gram, set()).add(word)
+
+        row_count = max(len(texts_per_row), 1)
+        self._common_words = {word for word, rows in self._rows_by_word.items() if len(rows) / row_count > COMMON_WORD_SHARE}
+        logger.info(f"Built trigram index over {len(self._rows_by_word)} words")
+
+    def _word_similarity(self, query_word: str) -> Dict[int, float]:
+        """
+        Returns the best similarity of query_word to any word of each row.
+        """
+
+        query_grams = trigrams(query_word)
+        shared: Dict[str, int] = {}
+        for gram in query_grams:
+            for word in self._words_by_gram.get(gram, ()):
+                shared[word] = shared.get(word, 0) + 1
+
+        best: Dict[int, float] = {}
+        for word, common in shared.items():
+            similarity = common / (len(query_grams) + len(self._grams_by_word[word]) - common)
+            for row in self._rows_by_word[word]:
+                if similarity > best.get(row, 0.0):
+                    best[row] = similarity
+        return best
+
+    def similar(self, query: str, threshold: float = SIMILARITY_THRESHOLD) -> Dict[int, float]:
+        """
+        Finds rows whose words are similar to the query words.
+
+        Parameters:
+            query (str): Search text, possibly misspelled or partial
+            threshold (float, optional): Minimum similarity (0-1). Defaults to SIMILARITY_THRESHOLD.
+
+        Returns:
+            Dict[int, float]: Similarity per row at or above threshold, most similar first
+        """
+
+        query_words = list(dict.fromkeys(_words(query)))
+        rare_words = [word for word in query_words if word not in self._common_words]
+        query_words = rare_words or query_words
+        if not query_words:
+            return {}
+
+        totals: Dict[int, float] = {}
+        for word in query_words:
+            for row, similarity in self._word_similarity(word).items():
+                totals[row] = totals.get(row, 0.0) + similarity
+
+        scores = {row: round(total / len(query_words), 3) for row, total in totals.items()}
+        ranked = sorted((row for row, score in scores.items() if score >= threshold), key=lambda row: (-scores[row], row))
+        return {row: scores[row] for row in ranked}
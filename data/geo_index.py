@@ -0,0 +1,208 @@
+"""
+Spatial index over restaurant coordinates.
+Outlets are stored in a KD-tree over 3D unit vectors, where straight-line
+(chord) distance grows with great-circle distance, so radius and k-nearest
+queries prune whole subtrees instead of measuring every outlet.
+"""
+
+#Basic imports
+import heapq
+import math
+from typing import List, Dict, Any, Optional, Tuple
+
+#Third party imports
+import numpy as np
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Global Variables
+EARTH_RADIUS_KM = 6371.0088
+LEAF_SIZE = 16
+
+#All Functions Available
+# restaurant_coordinates(restaurant) -> (latitude, longitude) or None
+# GeoIndex(points) - KD-tree over (latitude, longitude) points, one per row
+# GeoIndex.within(latitude, longitude, radius_km) -> {row: distance_km}
+# GeoIndex.nearest(latitude, longitude, k, radius_km) -> {row: distance_km}
+# GeoIndex.centroid(rows) -> (latitude, longitude) of the given rows
+
+
+def restaurant_coordinates(restaurant: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    Reads a restaurant's location latitude/longitude, or None when they are missing or invalid.
+    """
+
+    loc_info = restaurant.get("location") or {}
+    try:
+        latitude, longitude = float(loc_info["latitude"]), float(loc_info["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def _unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Converts degrees to points on the unit sphere, shape (n, 3).
+    """
+
+    phi, lam = np.radians(latitudes), np.radians(longitudes)
+    return np.column_stack((np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)))
+
+
+def _chord_to_km(chord: np.ndarray) -> np.ndarray:
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+def _km_to_chord(distance_km: float) -> float:
+    return 2 * math.sin(min(distance_km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class GeoIndex:
+    """
+    KD-tree over restaurant coordinates.
+
+    Rows are positions in the restaurant list; rows without coordinates are
+    left out. Internal nodes are (axis, split, left, right) tuples and leaves
+    hold up to LEAF_SIZE point indices that are measured with one NumPy call.
+    """
+
+    def __init__(self, points: List[Optional[Tuple[float, float]]]):
+        indexed = [(row, point) for row, point in enumerate(points) if point is not None]
+        self._rows = np.array([row for row, _ in indexed], dtype=np.int64)
+        self._latlon = np.array([point for _, point in indexed], dtype=np.float64).reshape(-1, 2)
+        self._xyz = _unit_vectors(self._latlon[:, 0], self._latlon[:, 1])
+        self._root = self._build(np.arange(len(indexed))) if indexed else None
+        logger.info(f"Built geo index over {len(indexed)} of {len(points)} restaurants")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _build(self, indices: np.ndarray):
+        """
+        Splits indices on the widest axis at the median until leaves are small.
+        """
+
+        if len(indices) <= LEAF_SIZE:
+            return indices
+        coords = self._xyz[indices]
+        axis = int(np.argmax(coords.max(axis=0) - coords.min(axis=0)))
+        order = indices[np.argsort(coords[:, axis], kind="stable")]
+        middle = len(order) // 2
+        split = float(self._xyz[order[middle], axis])
+        return (axis, split, self._build(order[:middle]), self._build(order[middle:]))
+
+    def _query_point(self, latitude: float, longitude: float) -> np.ndarray:
+        return _unit_vectors(np.array([latitude]), np.array([longitude]))[0]
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Dict[int, float]:
+        """
+        Finds every outlet within radius_km of a point.
+
+        Parameters:
+            latitude (float): Latitude of the search point in degrees
+            longitude (float): Longitude of the search point in degrees
+            radius_km (float): Search radius in kilometres
+
+        Returns:
+            Dict[int, float]: distance_km per matching row, nearest first
+        """
+
+        if self._root is None:
+            return {}
+        query = self._query_point(latitude, longitude)
+        radius = _km_to_chord(radius_km)
+        found_indices, found_chords = [], []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, np.ndarray):
+                chords = np.linalg.norm(self._xyz[node] - query, axis=1)
+                hits = chords <= radius
+                found_indices.append(node[hits])
+                found_chords.append(chords[hits])
+                continue
+            axis, split, left, right = node
+            gap = query[axis] - split
+            if gap - radius <= 0:
+                stack.append(left)
+            if gap + radius >= 0:
+                stack.append(right)
+
+        if not found_indices:
+            return {}
+        indices, chords = np.concatenate(found_indices), np.concatenate(found_chords)
+        return self._as_rows(indices, chords)
+
+    def nearest(self, latitude: float, longitude: float, k: int, radius_km: Optional[float] = None) -> Dict[int, float]:
+        """
+        Finds the k outlets closest to a point, optionally within radius_km.
+
+        Parameters:
+            latitude (float): Latitude of the search point in degrees
+            longitude (float): Longitude of the search point in degrees
+            k (int): Number of outlets wanted
+            radius_km (Optional[float]): Ignore outlets further than this
+
+        Returns:
+            Dict[int, float]: distance_km per matching row, nearest first
+        """
+
+        if self._root is None or k <= 0:
+            return {}
+        query = self._query_point(latitude, longitude)
+        bound = _km_to_chord(radius_km) if radius_km is not None else math.inf
+        best: List[Tuple[float, int]] = []  # max-heap of (-chord, index) holding the k closest so far
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, min_chord = stack.pop()
+            worst = -best[0][0] if len(best) == k else bound
+            if min_chord > worst:
+                continue
+            if isinstance(node, np.ndarray):
+                chords = np.linalg.norm(self._xyz[node] - query, axis=1)
+                for index, chord in zip(node.tolist(), chords.tolist()):
+                    if chord > bound:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-chord, index))
+                    elif chord < -best[0][0]:
+                        heapq.heapreplace(best, (-chord, index))
+                continue
+            axis, split, left, right = node
+            gap = query[axis] - split
+            near, far = (left, right) if gap <= 0 else (right, left)
+            # Visit the near side first (pushed last); the far side is skipped once it cannot hold a closer point
+            stack.append((far, max(min_chord, abs(gap))))
+            stack.append((near, min_chord))
+
+        if not best:
+            return {}
+        indices = np.array([index for _, index in best], dtype=np.int64)
+        chords = np.array([-neg for neg, _ in best], dtype=np.float64)
+        return self._as_rows(indices, chords)
+
+    def _as_rows(self, indices: np.ndarray, chords: np.ndarray) -> Dict[int, float]:
+        """
+        Maps point indices to catalog rows with distances in km, nearest first.
+        """
+
+        order = np.lexsort((self._rows[indices], chords))
+        distances = _chord_to_km(chords[order])
+        return {int(row): round(float(km), 3) for row, km in zip(self._rows[indices[order]], distances)}
+
+    def centroid(self, rows: List[int]) -> Optional[Tuple[float, float]]:
+        """
+        Returns the mean position of the given rows, or None when none of them has coordinates.
+        """
+
+        mask = np.isin(self._rows, list(rows))
+        if not mask.any():
+            return None
+        mean = self._xyz[mask].mean(axis=0)
+        latitude = math.degrees(math.atan2(mean[2], math.hypot(mean[0], mean[1])))
+        longitude = math.degrees(math.atan2(mean[1], mean[0]))
+        return latitude, longitude
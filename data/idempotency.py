@@ -0,0 +1,87 @@
+"""
+Idempotency keys for reservation requests.
+A client (or the agent, using its tool call ID) sends an Idempotency-Key with
+a booking. The first result stored under the key is returned for every retry
+with that key, so a retried or double-submitted request never books twice
+and never repeats validation, the capacity check or the write.
+"""
+
+#Basic imports
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
+
+#Global Variables
+DEFAULT_IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_IDEMPOTENCY_MAX_ENTRIES = 10000
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+#All Functions Available
+# request_fingerprint(payload) -> stable hash of a request body
+# IdempotencyTable(max_entries, ttl_seconds, clock) - bounded, expiring key -> (fingerprint, response) table
+# IdempotencyTable.get(key) / IdempotencyTable.put(key, fingerprint, response)
+
+
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    """
+    Hashes a request body so a key reused for a different request can be told apart from a retry.
+
+    Parameters:
+        payload (Dict[str, Any]): Request body
+
+    Returns:
+        str: Hex SHA-256 of the body's canonical JSON
+    """
+
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyTable:
+    """
+    Thread-safe in-memory table of stored responses, evicting the oldest
+    entries beyond max_entries and ignoring entries older than ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_IDEMPOTENCY_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Returns (fingerprint, response) stored under key, or None when missing or expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, fingerprint, response = entry
+            if self._clock() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            return fingerprint, response
+
+    def put(self, key: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        """
+        Stores the response for key unless a live one is already stored (the first result wins).
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[0] < self.ttl_seconds:
+                return
+            self._entries[key] = (self._clock(), fingerprint, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,283 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+Counters, gauges and latency histograms are kept in memory and rendered by
+GET /metrics, so any Prometheus-compatible scraper (or curl) can read them
+locally without an agent or an external service. With several API workers
+each process serves its own numbers.
+"""
+
+#Basic imports
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import List, Dict, Tuple, Callable, Optional, Iterator, Sequence, Union
+
+#Global Variables
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+#All Functions Available
+# MetricsRegistry.counter / gauge / histogram(name, help, labelnames) - create and register a metric
+# MetricsRegistry.render() -> text exposition of every registered metric
+# Counter.inc(amount, **labels) / Gauge.set(value, **labels) / set_function(function) - read at scrape time
+# Histogram.observe(seconds, **labels) / Histogram.time(**labels) - context manager timing a block
+# RequestMetricsMiddleware(app, latency, requests, route_path) - ASGI middleware recording latency per route
+# registry and the GoodFoods metrics: REQUEST_SECONDS, REQUESTS_TOTAL, STAGE_SECONDS, BOOKINGS_TOTAL, BOOKING_CHANGES_TOTAL, WAITLIST_EVENTS_TOTAL, ADMISSION_REJECTED_TOTAL, ...
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """
+    Renders {name="value",...}, escaping backslashes, quotes and newlines.
+    """
+
+    pairs = []
+    for name, value in zip(labelnames, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    Base class holding a metric's name, help text, label names and lock.
+    """
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+
+
+class _ValueMetric(_Metric):
+    """
+    One number per label set. set_function() makes the metric read its
+    value(s) at scrape time instead, e.g. the current catalog size or
+    counters kept by another component.
+    """
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], Union[float, Dict[Tuple[str, ...], float]]]] = None
+
+    def set_function(self, function: Callable[[], Union[float, Dict[Tuple[str, ...], float]]]) -> None:
+        """
+        Reads the metric from function() at scrape time: a number, or {label values tuple: number} for labelled metrics.
+        """
+
+        self._function = function
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        if self._function is not None:
+            result = self._function()
+            values = sorted(result.items()) if isinstance(result, dict) else [((), result)]
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Counter(_ValueMetric):
+    """
+    Monotonically increasing count per label set.
+    """
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_ValueMetric):
+    """
+    Value per label set that can go up and down.
+    """
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    Cumulative latency histogram per label set, with _bucket, _sum and _count series.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative, last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """
+        Observes the wall time of the with-block, also when it raises.
+        """
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._series.items())
+        lines = self.header()
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                upper_bound = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, upper_bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request. Requests are labelled with the
+    matched route template (e.g. /restaurants/search), not the raw path, so
+    label cardinality stays bounded. route_path(scope) gives the template of
+    requests answered before routing (e.g. refused by admission control).
+    """
+
+    def __init__(self, app, latency: Histogram, requests: Counter,
+                 route_path: Optional[Callable[[dict], Optional[str]]] = None):
+        self.app = app
+        self.latency = latency
+        self.requests = requests
+        self.route_path = route_path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            path = getattr(scope.get("route"), "path", None)
+            if path is None and self.route_path is not None:
+                path = self.route_path(scope)
+            path = path or "unmatched"
+            self.latency.observe(time.perf_counter() - started, method=scope["method"], path=path)
+            self.requests.inc(method=scope["method"], path=path, status=str(status[0]))
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.histogram(
+    "goodfoods_http_request_duration_seconds", "HTTP request latency by route.", ("method", "path"))
+REQUESTS_TOTAL = registry.counter(
+    "goodfoods_http_requests_total", "HTTP requests by route and status code.", ("method", "path", "status"))
+STAGE_SECONDS = registry.histogram(
+    "goodfoods_stage_duration_seconds",
+    "Time spent in internal stages (search_match, search_encode, capacity_check, order_persist, journal_fsync, journal_compaction, availability_grid, waitlist_promotion).",
+    ("stage",))
+BOOKINGS_TOTAL = registry.counter(
+    "goodfoods_bookings_total", "Reservation attempts by outcome (confirmed, confirmed_from_waitlist, rejected_capacity, rejected_validation, persist_failed, idempotent_replay, idempotency_conflict).", ("outcome",))
+BOOKING_CHANGES_TOTAL = registry.counter(
+    "goodfoods_booking_changes_total", "Booking modifications and cancellations by action (modify, cancel) and outcome.", ("action", "outcome"))
+WAITLIST_EVENTS_TOTAL = registry.counter(
+    "goodfoods_waitlist_events_total", "Waitlist entries by event (joined, promoted, expired, left).", ("event",))
+WAITLIST_DAYS = registry.gauge("goodfoods_waitlist_days", "Restaurant-days that have parties waiting for seats.")
+ADMISSION_REJECTED_TOTAL = registry.counter(
+    "goodfoods_admission_rejected_total", "Requests refused by admission control, by priority and reason (rate_limited, queue_full, queue_timeout).",
+    ("priority", "reason"))
+ADMISSION_ACTIVE = registry.gauge("goodfoods_admission_active", "Requests running per priority.", ("priority",))
+ADMISSION_QUEUED = registry.gauge("goodfoods_admission_queued", "Requests waiting for a slot per priority.", ("priority",))
+CATALOG_RESTAURANTS = registry.gauge("goodfoods_catalog_restaurants", "Restaurants in the current catalog snapshot.")
+CATALOG_VERSION = registry.gauge("goodfoods_catalog_version", "Version of the current catalog snapshot.")
+BOOKINGS_STORED = registry.gauge("goodfoods_bookings_stored", "Bookings held by the storage backend, cancelled ones included.")
+SEARCH_CACHE_EVENTS = registry.counter(
+    "goodfoods_search_cache_events_total", "Search cache counters since start (hits, misses, evictions, expirations, stale, invalidations).", ("event",))
+SEARCH_CACHE_ENTRIES = registry.gauge("goodfoods_search_cache_entries", "Responses currently held by the search cache.")
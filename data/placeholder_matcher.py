@@ -0,0 +1,116 @@
+"""
+Placeholder detection for reservation fields.
+Known junk values ('your name', '1234567890', 'tomorrow', ...) are read per
+field from placeholder_values.json and compiled once into an Aho-Corasick
+automaton, so checking a value costs one pass over its characters no matter
+how many placeholders are configured.
+"""
+
+#Basic imports
+import json
+import os
+from collections import deque
+from typing import List, Dict, Iterable, Optional
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Global Variables
+PLACEHOLDER_FILE = "placeholder_values.json"
+
+#All Functions Available
+# PlaceholderMatcher(patterns) - case-insensitive multi-substring matcher
+# PlaceholderMatcher.find(text) -> first placeholder found in text, or None
+# load_placeholder_matchers(path) -> {field: PlaceholderMatcher} from a JSON file
+
+
+class PlaceholderMatcher:
+    """
+    Aho-Corasick automaton over lowercased patterns.
+
+    find() reports whether any pattern occurs as a substring of the lowercased
+    text, which is what `any(p in text for p in patterns)` computed before,
+    in time linear in the text length.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[str]] = [None]
+        self.pattern_count = 0
+
+        for pattern in {str(pattern).lower() for pattern in patterns}:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(None)
+                state = next_state
+            self._output[state] = pattern
+            self.pattern_count += 1
+
+        # Breadth-first over the trie: a state's failure link is the longest proper
+        # suffix of its path that is also a trie path; it inherits that state's output
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._output[next_state] is None:
+                    self._output[next_state] = self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Optional[str]:
+        """
+        Returns a placeholder occurring in text (case-insensitive), or None.
+
+        Parameters:
+            text (str): Value to check
+
+        Returns:
+            Optional[str]: The first placeholder whose end is reached while scanning text
+        """
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                return output[state]
+        return None
+
+
+def load_placeholder_matchers(path: str) -> Dict[str, PlaceholderMatcher]:
+    """
+    Compiles one matcher per field from a JSON file of {field: [placeholder, ...]}.
+
+    Parameters:
+        path (str): Placeholder file
+
+    Returns:
+        Dict[str, PlaceholderMatcher]: Matcher per field in file order, empty if the file is missing
+    """
+
+    try:
+        with open(path, 'r') as f:
+            placeholder_values: Dict[str, List[str]] = json.load(f)
+        logger.info(f"Successfully loaded {os.path.basename(path)}")
+    except FileNotFoundError:
+        logger.error(f"Error: {os.path.basename(path)} not found, placeholder checks disabled")
+        return {}
+
+    matchers = {field: PlaceholderMatcher(values) for field, values in placeholder_values.items()}
+    logger.info(f"Compiled placeholder matchers for {', '.join(f'{f} ({m.pattern_count})' for f, m in matchers.items())}")
+    return matchers
@@ -0,0 +1,107 @@
+"""
+JSON encoding for API responses.
+Uses orjson when it is installed and falls back to the standard json module
+otherwise; both produce the same compact UTF-8 output. Restaurant records are
+encoded once per catalog snapshot, and a search response is assembled by
+splicing those bytes with the per-query match fields instead of rebuilding and
+re-encoding every restaurant dict.
+"""
+
+#Basic imports
+import json
+from typing import List, Dict, Any, Iterable
+
+#Third party imports
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+#All Functions Available
+# encode_json(value) -> compact UTF-8 JSON bytes
+# encode_restaurant_records(restaurants) -> one pre-encoded record per restaurant
+# splice_record(encoded, extra) -> encoded record with extra keys appended
+# splice_object(head, key, encoded_items) -> encoded head object with a JSON array of encoded items appended
+# FastJSONResponse - JSONResponse rendered with encode_json
+
+
+def encode_json(value: Any) -> bytes:
+    """
+    Serializes a value to compact UTF-8 JSON, the way FastAPI's JSONResponse does.
+
+    Parameters:
+        value (Any): JSON-compatible value (dicts, lists, str, int, float, bool, None)
+
+    Returns:
+        bytes: Encoded JSON
+    """
+
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_restaurant_records(restaurants: Iterable[Dict[str, Any]]) -> List[bytes]:
+    """
+    Encodes every restaurant once, in catalog order.
+
+    Parameters:
+        restaurants (Iterable[Dict[str, Any]]): Restaurant list
+
+    Returns:
+        List[bytes]: Encoded restaurant per catalog row
+    """
+
+    return [encode_json(restaurant) for restaurant in restaurants]
+
+
+def splice_record(encoded: bytes, extra: Dict[str, Any]) -> bytes:
+    """
+    Appends keys to an encoded JSON object, giving the same bytes as encoding {**record, **extra}
+    for keys the record does not already have.
+
+    Parameters:
+        encoded (bytes): Encoded JSON object
+        extra (Dict[str, Any]): Keys to append
+
+    Returns:
+        bytes: Encoded object with the extra keys
+    """
+
+    if not extra:
+        return encoded
+    tail = encode_json(extra)
+    if encoded == b"{}":
+        return tail
+    return encoded[:-1] + b"," + tail[1:]
+
+
+def splice_object(head: Dict[str, Any], key: str, encoded_items: Iterable[bytes]) -> bytes:
+    """
+    Encodes head and appends key with a JSON array built from already-encoded items.
+
+    Parameters:
+        head (Dict[str, Any]): Object fields to encode normally
+        key (str): Name of the array field to append
+        encoded_items (Iterable[bytes]): Encoded array elements
+
+    Returns:
+        bytes: Encoded object
+    """
+
+    encoded_head = encode_json(head)
+    field = encode_json(key) + b":[" + b",".join(encoded_items) + b"]}"
+    if encoded_head == b"{}":
+        return b"{" + field
+    return encoded_head[:-1] + b"," + field
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when available.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
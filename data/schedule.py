@@ -0,0 +1,135 @@
+"""
+Time and schedule helpers shared by the capacity, availability and search code.
+Times are handled as integer minutes after midnight and operating days as a
+weekday bitmask (bit 0 = Monday ... bit 6 = Sunday).
+"""
+
+#Basic imports
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Tuple
+
+#Global Variables
+MINUTES_PER_DAY = 24 * 60
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DEFAULT_DINING_DURATION_MINUTES = 90
+
+#All Functions Available
+# parse_hhmm(value) -> minutes after midnight
+# format_hhmm(minutes) -> 'HH:MM'
+# weekday_mask(operating_days) -> weekday bitmask
+# parse_weekday(value) -> 0 = Monday ... 6 = Sunday, from a day name or YYYY-MM-DD date
+# opening_minutes(operating_hours) -> (open, close), close past 1440 for after-midnight closing
+# dining_duration(restaurant) -> minutes a table stays occupied
+# split_by_day(reservation_date, start_minute, duration) -> [(date, start, end), ...]
+
+
+def parse_hhmm(value: str) -> int:
+    """
+    Converts an 'HH:MM' string to minutes after midnight ('24:00' -> 1440).
+
+    Raises:
+        ValueError: If the value is not in HH:MM format
+    """
+
+    hours, minutes = str(value).strip().split(":")
+    if not (hours.isdigit() and minutes.isdigit() and len(minutes) == 2 and int(minutes) < 60):
+        raise ValueError(f"Not an HH:MM time: {value}")
+    return int(hours) * 60 + int(minutes)
+
+
+def format_hhmm(minutes: int) -> str:
+    """
+    Converts minutes after midnight to an 'HH:MM' string.
+    """
+
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def weekday_mask(operating_days: Iterable[str]) -> int:
+    """
+    Encodes operating day names as a bitmask, bit 0 = Monday ... bit 6 = Sunday.
+    """
+
+    mask = 0
+    for day in operating_days:
+        if day.capitalize() in WEEKDAYS:
+            mask |= 1 << WEEKDAYS.index(day.capitalize())
+    return mask
+
+
+def parse_weekday(value: str) -> int:
+    """
+    Reads a weekday from a day name ('Sunday', 'sun') or a YYYY-MM-DD date.
+
+    Returns:
+        int: 0 = Monday ... 6 = Sunday
+
+    Raises:
+        ValueError: If the value is neither a day name nor a date
+    """
+
+    text = str(value).strip().lower()
+    if len(text) >= 3:
+        for index, day in enumerate(WEEKDAYS):
+            if day.lower().startswith(text):
+                return index
+    return date.fromisoformat(text).weekday()
+
+
+def opening_minutes(operating_hours: Dict[str, str]) -> Tuple[int, int]:
+    """
+    Reads a restaurant's opening interval in minutes.
+
+    A close time at or before the open time means the restaurant closes after
+    midnight, so 1440 is added to it. Missing or malformed hours count as closed.
+
+    Parameters:
+        operating_hours (Dict[str, str]): {'open': 'HH:MM', 'close': 'HH:MM'}
+
+    Returns:
+        Tuple[int, int]: (open_minute, close_minute)
+    """
+
+    try:
+        open_minute = parse_hhmm(operating_hours["open"])
+        close_minute = parse_hhmm(operating_hours["close"])
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return 0, 0
+    if close_minute <= open_minute:
+        close_minute += MINUTES_PER_DAY
+    return open_minute, close_minute
+
+
+def dining_duration(restaurant: Dict[str, Any]) -> int:
+    """
+    Returns how long a party occupies its seats at this restaurant, in minutes.
+    Uses the restaurant's dining_duration_minutes, or DEFAULT_DINING_DURATION_MINUTES.
+    """
+
+    return int(restaurant.get("dining_duration_minutes") or DEFAULT_DINING_DURATION_MINUTES)
+
+
+def split_by_day(reservation_date: str, start_minute: int, duration: int) -> List[Tuple[str, int, int]]:
+    """
+    Splits a stay starting at start_minute on reservation_date into per-date
+    pieces, so a late booking also occupies the early minutes of the next day.
+
+    Parameters:
+        reservation_date (str): Date in YYYY-MM-DD format
+        start_minute (int): Minutes after midnight when the party arrives
+        duration (int): Minutes the party stays
+
+    Returns:
+        List[Tuple[str, int, int]]: (date, start_minute, end_minute) pieces with end <= 1440.
+        If the date cannot be parsed the stay is cut off at midnight.
+    """
+
+    end_minute = start_minute + duration
+    pieces = [(reservation_date, start_minute, min(end_minute, MINUTES_PER_DAY))]
+    if end_minute > MINUTES_PER_DAY:
+        try:
+            next_date = (date.fromisoformat(reservation_date) + timedelta(days=1)).isoformat()
+        except ValueError:
+            return pieces
+        pieces.append((next_date, 0, min(end_minute - MINUTES_PER_DAY, MINUTES_PER_DAY)))
+    return pieces
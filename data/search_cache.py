@@ -0,0 +1,105 @@
+"""
+Bounded LRU cache for encoded search responses.
+Entries are tagged with the catalog version they were computed from and
+expire after a TTL, so a catalog change or an old entry is never served.
+Values are the already-serialized JSON bytes, so a hit skips both matching
+and response encoding.
+"""
+
+#Basic imports
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Callable, Tuple
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#All Functions Available
+# SearchResultCache(max_entries, ttl_seconds, clock) - LRU + TTL cache keyed by normalized query
+# SearchResultCache.get(key, version) -> cached bytes or None
+# SearchResultCache.put(key, version, value)
+# SearchResultCache.invalidate()
+# SearchResultCache.stats() -> hit/miss/eviction counters
+
+
+class SearchResultCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and catalog-version tagging.
+
+    max_entries = 0 disables caching (every get is a miss, puts are ignored).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max(int(max_entries), 0)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[int, float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "stale": 0, "invalidations": 0}
+
+    def get(self, key: str, version: int) -> Optional[bytes]:
+        """
+        Returns the cached response for key, or None when it is missing, expired
+        or computed from another catalog version.
+
+        Parameters:
+            key (str): Normalized query
+            version (int): Current catalog version
+
+        Returns:
+            Optional[bytes]: Encoded response
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            entry_version, expires_at, value = entry
+            if entry_version != version or self._clock() >= expires_at:
+                del self._entries[key]
+                self._counters["stale" if entry_version != version else "expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key: str, version: int, value: bytes) -> None:
+        """
+        Stores an encoded response, evicting the least recently used entries beyond max_entries.
+
+        Parameters:
+            key (str): Normalized query
+            version (int): Catalog version the response was computed from
+            value (bytes): Encoded response
+        """
+
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (version, self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self) -> None:
+        """
+        Drops every entry, e.g. after the catalog changed.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._counters["invalidations"] += 1
+        logger.info("Search result cache invalidated")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters together with its current and maximum size.
+        """
+
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "max_entries": self.max_entries}
@@ -0,0 +1,431 @@
+"""
+In-memory inverted index over the restaurant catalog.
+Built once when the catalog loads so search queries are answered with index
+lookups and boolean row masks instead of a scan over every restaurant.
+"""
+
+#Basic imports
+import json
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterable, Sequence
+
+#Third party imports
+import numpy as np
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Internal imports
+from data.catalog_columns import CatalogColumns
+from data.fuzzy_index import TrigramIndex
+from data.schedule import MINUTES_PER_DAY, parse_hhmm, parse_weekday
+
+#Global Variables
+NGRAM_SIZE = 3
+CAPACITY_FIELDS = ("restaurant_max_seating_capacity", "max_booking_party_size")
+FUZZY_FIELDS = ("name", "location")
+
+#All Functions Available
+# RestaurantSearchIndex(restaurants, columns) - inverted index over a restaurant list
+# RestaurantSearchIndex.score(query) -> match_count array, per-field row masks and fuzzy similarity per row
+# RestaurantSearchIndex.rank(match_counts, top_k, tie_breaks) -> rows ordered by match_count
+# RestaurantSearchIndex.matched_fields(field_masks, row) -> matched_fields of one row
+# RestaurantSearchIndex.row_mask(rows) -> boolean mask with the given rows set
+# RestaurantSearchIndex.to_column(values_by_row, default) -> dense float column from a sparse {row: value}
+# RestaurantSearchIndex.match(query, top_k) -> ranked (row, match_count, matched_fields)
+# RestaurantSearchIndex.mask_for(key, value) -> boolean row mask for one field
+# RestaurantSearchIndex.cached_mask_for(key, value, cache) -> mask_for memoized across a batch
+# RestaurantSearchIndex.rows_for(key, value) / cached_rows_for(key, value, cache) -> the same as row sets
+# RestaurantSearchIndex.similar_rows_for(key, value, cache) -> trigram similarity per row for name/location
+# RestaurantSearchIndex.open_at_mask(open_at) / open_at_rows(open_at) -> rows open at a time, optionally on a given day
+
+
+def _ngrams(text: str, max_size: int = NGRAM_SIZE) -> Set[str]:
+    """
+    Collects every substring of text with length 1 to max_size.
+
+    Parameters:
+        text (str): Lowercased text to split into n-grams
+        max_size (int, optional): Longest n-gram to emit. Defaults to NGRAM_SIZE.
+
+    Returns:
+        Set[str]: All distinct n-grams found in the text
+    """
+
+    grams = set()
+    for size in range(1, max_size + 1):
+        for start in range(len(text) - size + 1):
+            grams.add(text[start:start + size])
+    return grams
+
+
+def _intersect(posting_sets: Iterable[Set[int]]) -> Set[int]:
+    """
+    Intersects posting sets, starting from the smallest one.
+
+    Parameters:
+        posting_sets (Iterable[Set[int]]): Row sets to intersect
+
+    Returns:
+        Set[int]: Rows present in every posting set
+    """
+
+    ordered = sorted(posting_sets, key=len)
+    if not ordered:
+        return set()
+    result = set(ordered[0])
+    for posting in ordered[1:]:
+        result &= posting
+        if not result:
+            break
+    return result
+
+
+class RestaurantSearchIndex:
+    """
+    Per-field index over a list of restaurants.
+
+    Rows are positions in the restaurant list, so results can be returned in
+    catalog order. Name and location map n-grams to row sets; a substring
+    query is answered from the n-gram postings and only the surviving
+    candidates are verified against the original text. They also get a
+    trigram index, used when a value matches nothing exactly (typos such as
+    'Indranagar'). Every other field is answered from the CatalogColumns:
+    cuisines and operating days are matched on their few distinct interned
+    strings, capacities and opening hours are array comparisons. Each field
+    resolves to a boolean row mask and scoring adds the masks up, so matched
+    rows are only turned into Python objects for the results returned.
+    """
+
+    def __init__(self, restaurants: List[Dict[str, Any]], columns: Optional[CatalogColumns] = None):
+        self.restaurants = restaurants
+        self.columns = columns if columns is not None else CatalogColumns(restaurants)
+        self.row_count = len(restaurants)
+
+        self._text: Dict[str, List[List[str]]] = {"name": [], "location": []}
+        self._grams: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self._text}
+
+        for row, restaurant in enumerate(restaurants):
+            loc_info = restaurant.get("location", {})
+            self._add_text("name", row, [restaurant.get("name", "").lower()])
+            self._add_text("location", row, [loc_info.get("address", "").lower(), loc_info.get("landmark", "").lower()])
+
+        self._fuzzy: Dict[str, TrigramIndex] = {field: TrigramIndex(self._text[field]) for field in FUZZY_FIELDS}
+
+        logger.info(f"Built search index over {len(restaurants)} restaurants")
+
+    def _add_text(self, field: str, row: int, texts: List[str]) -> None:
+        """
+        Stores the lowercased texts of a row and posts their n-grams.
+        """
+
+        self._text[field].append(texts)
+        postings = self._grams[field]
+        for text in texts:
+            for gram in _ngrams(text):
+                postings.setdefault(gram, set()).add(row)
+
+    def _substring_rows(self, field: str, needle: str) -> Set[int]:
+        """
+        Finds rows where needle is a substring of any text stored for field.
+
+        Parameters:
+            field (str): Indexed text field name
+            needle (str): Lowercased search string
+
+        Returns:
+            Set[int]: Rows containing the needle
+        """
+
+        postings = self._grams[field]
+        if len(needle) <= NGRAM_SIZE:
+            return set(postings.get(needle, ()))
+
+        grams = {needle[i:i + NGRAM_SIZE] for i in range(len(needle) - NGRAM_SIZE + 1)}
+        if any(gram not in postings for gram in grams):
+            return set()
+        candidates = _intersect(postings[gram] for gram in grams)
+        texts = self._text[field]
+        return {row for row in candidates if any(needle in text for text in texts[row])}
+
+    def row_mask(self, rows: Iterable[int]) -> np.ndarray:
+        """
+        Returns a boolean mask over the catalog with the given rows set.
+        """
+
+        mask = np.zeros(self.row_count, dtype=bool)
+        mask[list(rows)] = True
+        return mask
+
+    def mask_for(self, key: str, value: Any) -> Optional[np.ndarray]:
+        """
+        Resolves the rows matching a single query field.
+
+        Parameters:
+            key (str): Query field name
+            value (Any): Query value for that field
+
+        Returns:
+            Optional[np.ndarray]: Boolean mask of matching rows, or None when the field is not indexed
+        """
+
+        columns = self.columns
+        if key in ("name", "location"):
+            return self.row_mask(self._substring_rows(key, str(value).lower()))
+
+        if key == "cuisine":
+            if isinstance(value, str):
+                return columns.cuisines.rows_with_any(columns.cuisines.codes_containing(value.lower()))
+            return columns.cuisines.rows_with_any(columns.cuisines.codes_for(value))
+
+        if key == "operating_days":
+            return columns.operating_days.rows_with_any(columns.operating_days.codes_containing(value.lower()))
+
+        if key == "operating_hours":
+            mask = np.ones(self.row_count, dtype=bool)
+            if "open" in value:
+                mask &= columns.opening_time.rows_equal(value["open"])
+            if "close" in value:
+                mask &= columns.closing_time.rows_equal(value["close"])
+            return mask
+
+        if key == "open_at":
+            return self.open_at_mask(value)
+
+        if key in CAPACITY_FIELDS:
+            try:
+                value_int = int(str(value).strip())
+            except (ValueError, TypeError) as e:
+                logger.info(f"Error converting capacity value '{value}' to integer: {e}")
+                return np.zeros(self.row_count, dtype=bool)
+            return columns.capacity(key) >= value_int
+
+        return None
+
+    def rows_for(self, key: str, value: Any) -> Optional[Set[int]]:
+        """
+        mask_for() as a set of rows.
+        """
+
+        mask = self.mask_for(key, value)
+        return None if mask is None else set(np.flatnonzero(mask).tolist())
+
+    def open_at_mask(self, open_at: Dict[str, str]) -> np.ndarray:
+        """
+        Finds restaurants open at a time of day, optionally on a given day.
+
+        A restaurant is open at minute t of weekday w when it operates on w and
+        open <= t < close, or when it operated on the day before and its
+        after-midnight close is still ahead (t + 1440 < close). Without a day,
+        any operating day counts.
+
+        Parameters:
+            open_at (Dict[str, str]): {'time': 'HH:MM', 'day': weekday name or YYYY-MM-DD (optional)}
+
+        Returns:
+            np.ndarray: Boolean mask of rows open at that time, all False if the time or day cannot be read
+        """
+
+        try:
+            minute = parse_hhmm(open_at["time"])
+            weekday = parse_weekday(open_at["day"]) if open_at.get("day") else None
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            logger.info(f"Error reading open_at value '{open_at}': {e}")
+            return np.zeros(self.row_count, dtype=bool)
+
+        columns = self.columns
+        in_session = (columns.open_minute <= minute) & (minute < columns.close_minute)
+        in_spillover = minute + MINUTES_PER_DAY < columns.close_minute
+        if weekday is None:
+            return (columns.day_mask != 0) & (in_session | in_spillover)
+        open_today = ((columns.day_mask >> weekday) & 1).astype(bool)
+        open_yesterday = ((columns.day_mask >> ((weekday - 1) % 7)) & 1).astype(bool)
+        return (open_today & in_session) | (open_yesterday & in_spillover)
+
+    def open_at_rows(self, open_at: Dict[str, str]) -> Set[int]:
+        """
+        open_at_mask() as a set of rows.
+        """
+
+        return set(np.flatnonzero(self.open_at_mask(open_at)).tolist())
+
+    def cached_mask_for(self, key: str, value: Any, cache: Optional[Dict[Tuple[str, str], Optional[np.ndarray]]]) -> Optional[np.ndarray]:
+        """
+        mask_for() memoized in a caller-owned cache, so a batch of queries
+        resolves each distinct (field, value) pair against the index only once.
+        Cached masks are shared and must not be modified.
+
+        Parameters:
+            key (str): Query field name
+            value (Any): Query value for that field
+            cache (Optional[Dict]): Shared cache for one batch, or None to skip caching
+
+        Returns:
+            Optional[np.ndarray]: Boolean mask of matching rows, or None when the field is not indexed
+        """
+
+        if cache is None:
+            return self.mask_for(key, value)
+        cache_key = (key, json.dumps(value, sort_keys=True, default=str))
+        if cache_key not in cache:
+            cache[cache_key] = self.mask_for(key, value)
+        return cache[cache_key]
+
+    def cached_rows_for(self, key: str, value: Any, cache: Optional[Dict]) -> Optional[Set[int]]:
+        """
+        cached_mask_for() as a set of rows.
+        """
+
+        mask = self.cached_mask_for(key, value, cache)
+        return None if mask is None else set(np.flatnonzero(mask).tolist())
+
+    def similar_rows_for(self, key: str, value: str, cache: Optional[Dict] = None) -> Dict[int, float]:
+        """
+        Resolves a name or location value by trigram similarity, memoized like cached_mask_for().
+
+        Parameters:
+            key (str): 'name' or 'location'
+            value (str): Possibly misspelled or partial query text
+            cache (Optional[Dict]): Shared cache for one batch, or None to skip caching
+
+        Returns:
+            Dict[int, float]: Similarity (0-1) per similar row, most similar first
+        """
+
+        if cache is None:
+            return self._fuzzy[key].similar(value)
+        cache_key = ("similar:" + key, value)
+        if cache_key not in cache:
+            cache[cache_key] = self._fuzzy[key].similar(value)
+        return cache[cache_key]
+
+    def score(self, query: Dict[str, Any], cache: Optional[Dict] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray], Dict[int, float]]:
+        """
+        Scores every restaurant against the query using the index.
+
+        Each recognised field adds one to a row's match_count when it matches.
+        A name or location that matches nothing exactly falls back to trigram
+        similarity, and rows found that way get a similarity below 1.
+        Any other field is an exact-equality filter: rows that fail it stop
+        collecting matches for the remaining fields, as in the original scan.
+
+        Parameters:
+            query (Dict[str, Any]): Search criteria with empty values already removed
+            cache (Optional[Dict]): Field lookup cache shared across a batch of queries
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray], Dict[int, float]]: match_count per row
+            (0 for rows matching no field), the rows each query field matched as a
+            boolean mask in query order, and the lowest fuzzy similarity of rows
+            matched by similarity
+        """
+
+        active = np.ones(self.row_count, dtype=bool)
+        match_counts = np.zeros(self.row_count, dtype=np.int32)
+        field_masks: Dict[str, np.ndarray] = {}
+        similarity: Dict[int, float] = {}
+
+        for key, value in query.items():
+            mask = self.cached_mask_for(key, value, cache)
+            if mask is None:
+                candidates = np.flatnonzero(active)
+                keep = np.array([self.restaurants[row].get(key) == value for row in candidates.tolist()], dtype=bool)
+                active[candidates[~keep]] = False
+                continue
+
+            if not mask.any() and key in self._fuzzy and isinstance(value, str):
+                similar = self.similar_rows_for(key, value, cache)
+                mask = self.row_mask(similar)
+                for row in np.flatnonzero(mask & active).tolist():
+                    similarity[row] = min(similarity.get(row, 1.0), similar[row])
+
+            matched = mask & active
+            match_counts += matched
+            field_masks[key] = matched
+
+        return match_counts, field_masks, similarity
+
+    @staticmethod
+    def matched_fields(field_masks: Dict[str, np.ndarray], row: int) -> Dict[str, bool]:
+        """
+        Builds the matched_fields dict of one row from score()'s field masks.
+        """
+
+        return {key: True for key, mask in field_masks.items() if mask[row]}
+
+    def to_column(self, values_by_row: Dict[int, float], default: float = 0.0) -> np.ndarray:
+        """
+        Spreads a sparse {row: value} mapping over a float column, default elsewhere.
+        """
+
+        column = np.full(self.row_count, default, dtype=np.float64)
+        if values_by_row:
+            column[list(values_by_row)] = list(values_by_row.values())
+        return column
+
+    @staticmethod
+    def rank(match_counts: np.ndarray, top_k: Optional[int] = None, tie_breaks: Sequence[np.ndarray] = ()) -> List[int]:
+        """
+        Orders the rows with a non-zero match_count by match_count descending.
+        Ties are ordered by each tie_breaks column ascending in turn (e.g.
+        1 - similarity, then distance) and finally by catalog order. When
+        top_k is below the number of matches, candidates are picked with
+        np.argpartition on a composite key and only those are sorted.
+
+        Parameters:
+            match_counts (np.ndarray): match_count per row from score()
+            top_k (Optional[int]): Number of best rows wanted, None for all
+            tie_breaks (Sequence[np.ndarray]): Secondary sort columns, one value per row
+
+        Returns:
+            List[int]: Ranked rows
+        """
+
+        rows = np.flatnonzero(match_counts)
+        if top_k is not None and top_k < len(rows):
+            rows = RestaurantSearchIndex._top_candidates(match_counts, rows, top_k, tie_breaks)
+        sort_keys = [rows] + [column[rows] for column in reversed(tie_breaks)] + [-match_counts[rows]]
+        ranked = rows[np.lexsort(sort_keys)]
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        return ranked.tolist()
+
+    @staticmethod
+    def _top_candidates(match_counts: np.ndarray, rows: np.ndarray, top_k: int, tie_breaks: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Narrows the matching rows down to the top_k best plus any rows tied with the k-th one.
+
+        The composite key is -match_count plus the first tie-break (or the row,
+        without tie-breaks) scaled into [0, 0.5], so it never reorders rows and
+        rows with different match_counts never overlap. Rows it cannot tell
+        apart are all kept, and rank() orders the candidates exactly.
+        """
+
+        if top_k <= 0:
+            return rows[:0]
+        tie_break = tie_breaks[0][rows] if tie_breaks else rows
+        low, high = tie_break.min(), tie_break.max()
+        scaled = (tie_break - low) * (0.5 / (high - low)) if high > low else np.zeros(len(rows))
+        composite = scaled - match_counts[rows]
+        kth = composite[np.argpartition(composite, top_k - 1)[top_k - 1]]
+        return rows[composite <= kth]
+
+    def match(self, query: Dict[str, Any], top_k: Optional[int] = None) -> List[Tuple[int, int, Dict[str, bool]]]:
+        """
+        Scores and ranks restaurants against the query.
+
+        Parameters:
+            query (Dict[str, Any]): Search criteria with empty values already removed
+            top_k (Optional[int]): Number of best matches wanted, None for all
+
+        Returns:
+            List[Tuple[int, int, Dict[str, bool]]]: (row, match_count, matched_fields)
+            sorted by match_count descending, ties by similarity then catalog order
+        """
+
+        match_counts, field_masks, similarity = self.score(query)
+        tie_breaks = [1 - self.to_column(similarity, 1.0)] if similarity else []
+        return [
+            (row, int(match_counts[row]), self.matched_fields(field_masks, row))
+            for row in self.rank(match_counts, top_k, tie_breaks)
+        ]
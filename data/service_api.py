@@ -1,6 +1,6 @@
 """
 FastAPI endpoints for restaurant booking system.
-Handles restaurant search and reservation management.
+Handles restaurant search, reservation management and the waitlist.
 """
 
 #Basic imports
@@ -8,10 +8,34 @@ import json
 from typing import List, Optional, Dict, Any, Union
 import uvicorn
 import os
+import atexit
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
 
 #Third party imports
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Response, Header
 from pydantic import BaseModel, Field
+from starlette.routing import Match
+
+#Internal imports
+from data.catalog import Catalog, CatalogWatcher, validate_catalog
+from data.search_cache import SearchResultCache
+from data.metrics import (registry, RequestMetricsMiddleware, CONTENT_TYPE, REQUEST_SECONDS, REQUESTS_TOTAL,
+                          STAGE_SECONDS, BOOKINGS_TOTAL, BOOKING_CHANGES_TOTAL, WAITLIST_EVENTS_TOTAL, WAITLIST_DAYS,
+                          ADMISSION_REJECTED_TOTAL, ADMISSION_ACTIVE, ADMISSION_QUEUED, CATALOG_RESTAURANTS, CATALOG_VERSION, BOOKINGS_STORED, SEARCH_CACHE_EVENTS, SEARCH_CACHE_ENTRIES)
+from data.admission import AdmissionControlMiddleware, AdmissionGate, TokenBucketLimiter, client_identity
+from data.booking_index import contact_key
+from data.capacity_ledger import CANCELLED_STATUS
+from data.idempotency import request_fingerprint, MAX_IDEMPOTENCY_KEY_LENGTH
+from data.placeholder_matcher import load_placeholder_matchers, PLACEHOLDER_FILE
+from data.response_encoding import FastJSONResponse, encode_json, splice_record, splice_object
+from data.storage_backend import create_storage_backend, read_restaurant_file, stay_dates, RESTAURANTS_FILE
+from data.waitlist import WaitlistPromoter, WAITING, PROMOTED, EXPIRED, LEFT
+from data.availability_grid import build_availability_grid
+from data.schedule import MINUTES_PER_DAY, dining_duration, parse_hhmm
 
 # Setting up Basic Logging
 import logging
@@ -24,36 +48,191 @@ logging.basicConfig(
 logger = logging.getLogger('goodfoods.api')
 
 #Global Variables
+SEARCH_CONTROL_FIELDS = ("limit", "offset", "fields")
+GEO_FIELDS = ("near", "latitude", "longitude", "radius_km", "nearest")
+DEFAULT_RADIUS_KM = 5.0
+ALWAYS_RETURNED_FIELDS = ("restaurant_id", "matched_fields", "match_count", "distance_km", "similarity")
+CASE_INSENSITIVE_FIELDS = ("name", "location", "operating_days", "near")
+RESERVATION_FIELDS = ("restaurant_id", "orderer_name", "orderer_contact", "party_size", "reservation_date", "reservation_time")
+MODIFIABLE_FIELDS = RESERVATION_FIELDS
+BOOKING_CHANGE_ATTEMPTS = 3
 BASE_DIR = os.path.dirname(os.path.abspath(__file__)) 
-DATA_DIR = os.path.join(BASE_DIR, "data")
+DATA_DIR = os.getenv("GOODFOODS_DATA_DIR", BASE_DIR)
+STORAGE_BACKEND = os.getenv("GOODFOODS_STORAGE", "json")
+SQLITE_PATH = os.getenv("GOODFOODS_SQLITE_PATH")
+SEARCH_CACHE_SIZE = int(os.getenv("GOODFOODS_SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("GOODFOODS_SEARCH_CACHE_TTL", "300"))
+CATALOG_WATCH_SECONDS = float(os.getenv("GOODFOODS_CATALOG_WATCH_SECONDS", "5"))
+ADMIN_TOKEN = os.getenv("GOODFOODS_ADMIN_TOKEN")
+WORKERS = int(os.getenv("GOODFOODS_WORKERS", "1"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("GOODFOODS_IDEMPOTENCY_SIZE", "10000"))
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("GOODFOODS_IDEMPOTENCY_TTL", "86400"))
+WAITLIST_SWEEP_SECONDS = float(os.getenv("GOODFOODS_WAITLIST_SWEEP_SECONDS", "30"))
+SEARCH_PRIORITY = "search"
+WRITE_PRIORITY = "write"
+UNLIMITED_PATHS = ("/metrics", "/restaurants/search/cache", "/docs", "/openapi.json")
+# Writes run in the threadpool (40 threads by default); capping them below that leaves threads for reads
+SEARCH_CONCURRENCY = int(os.getenv("GOODFOODS_SEARCH_CONCURRENCY", "64"))
+WRITE_CONCURRENCY = int(os.getenv("GOODFOODS_WRITE_CONCURRENCY", "16"))
+ADMISSION_QUEUE_FACTOR = 2
+ADMISSION_TIMEOUT_SECONDS = float(os.getenv("GOODFOODS_ADMISSION_TIMEOUT", "1"))
+SEARCH_RATE = float(os.getenv("GOODFOODS_SEARCH_RATE", "20"))
+WRITE_RATE = float(os.getenv("GOODFOODS_WRITE_RATE", "5"))
+RATE_BURST_FACTOR = 2
+# X-Client-Id is only believed from these addresses (the chat UI on the same host) or with the shared secret
+TRUSTED_CLIENT_ID_PROXIES = frozenset(address.strip() for address in os.getenv("GOODFOODS_TRUSTED_PROXIES", "127.0.0.1,::1").split(",")
+                                      if address.strip())
+CLIENT_ID_SECRET = os.getenv("GOODFOODS_CLIENT_ID_SECRET")
+PLACEHOLDER_PATH = os.getenv("GOODFOODS_PLACEHOLDER_FILE", os.path.join(BASE_DIR, PLACEHOLDER_FILE))
 
 #All Functions Available
-# RestaurantQuery, Reservation - Pydantic models for API requests
-# search_restaurant_information(query)
+# RestaurantQuery, Reservation, ReservationUpdate - Pydantic models for API requests
+# request_priority(method, path) - admission control priority of a request, None if never limited
+# route_template(scope) - route template of a request answered before routing, for the metrics labels
+# search_cache_key(query) / encode_response(result)
+# reload_catalog() - rebuilds the catalog from restaurant_list.json and swaps it in
+# project_restaurant(restaurant, fields)
+# find_nearby_restaurants(geo_query, field_rows_cache)
+# plan_restaurant_search(query, field_rows_cache) - matched catalog rows and response fields
+# search_restaurant_information(query, field_rows_cache)
+# encode_search_response(query, field_rows_cache) - search response as JSON bytes spliced from pre-encoded records
+# search_restaurant_batch(queries)
 # review_information_before_order(order_info)
-# check_capacity(restaurant_id, requested_party_size, reservation_date, reservation_time, debug)
+# check_capacity(restaurant_id, requested_party_size, reservation_date, reservation_time, debug, excluding)
+# party_size_limit_check(restaurant, party_size) - error result for a party over max_booking_party_size
 # detect_placeholder_values(order_info)
-# make_new_order(order_info, capacity_debug)
+# replay_idempotent_result(idempotency_key, fingerprint) - stored response for a retried booking
+# make_new_order(order_info, capacity_debug, idempotency_key)
+# contact_check(record, orderer_contact) - error result unless the contact number is the record's own
+# find_orders(order_id, orderer_contact) - bookings by order ID and contact number, or by contact number
+# booking_window(order) -> (restaurant_id, date, time, dining duration) of a stored order
+# modify_order(order_id, orderer_contact, changes, capacity_debug) / cancel_order(order_id, orderer_contact)
+# slot_has_passed(entry) / waitlist_position(entry) / notify_waitlist(window) - seats of a dining window were freed
+# join_waitlist(order_info) / waitlist_status(waitlist_id, orderer_contact) / leave_waitlist(waitlist_id, orderer_contact)
+# promote_waitlist_entry(entry) / promote_waitlist(restaurant_id, reservation_date) - book waiting parties that now fit
+# get_availability(restaurant_ids, start_date, days, slot_minutes, party_size, include_grid)
 # api_search_restaurants(query)
-# api_make_reservation(query)
-
-try:
-    with open(os.path.join(BASE_DIR, 'bookings_list.json'), 'r') as f:
-        order_management_table: List[Dict[str, Any]] = json.load(f)
-    logger.info("Successfully loaded bookings_list.json")
-except FileNotFoundError:
-    logger.error("Error: bookings_list.json not found")
-    order_management_table = []
-
-try:
-    with open(os.path.join(BASE_DIR, 'restaurant_list.json'), 'r') as f:
-        restaurant_information_table: List[Dict[str, Any]] = json.load(f)
-    logger.info("Successfully loaded restaurant_list.json")
-except FileNotFoundError:
-    logger.error("Error: restaurant_list.json not found")
-    restaurant_information_table = []
-
-app = FastAPI()
+# api_search_restaurants_batch(batch)
+# api_search_cache_stats()
+# api_metrics() - Prometheus text exposition
+# api_reload_catalog(x_admin_token)
+# api_make_reservation(query, response, idempotency_key)
+# api_find_reservations(order_id, orderer_contact) / api_get_reservation(order_id, orderer_contact)
+# api_modify_reservation(order_id, update, orderer_contact) / api_cancel_reservation(order_id, orderer_contact)
+# api_join_waitlist(reservation) / api_waitlist_status(waitlist_id) / api_leave_waitlist(waitlist_id, orderer_contact)
+# api_availability(query)
+
+# Every worker process imports this module and gets its own copy of in-memory state,
+# so several workers may only share bookings through the SQLite store and its file locks
+if WORKERS > 1 and STORAGE_BACKEND != "sqlite":
+    raise RuntimeError(f"GOODFOODS_WORKERS={WORKERS} needs GOODFOODS_STORAGE=sqlite, "
+                       f"the {STORAGE_BACKEND} backend keeps bookings in one process")
+
+storage = create_storage_backend(STORAGE_BACKEND, DATA_DIR, SQLITE_PATH, IDEMPOTENCY_MAX_ENTRIES, IDEMPOTENCY_TTL_SECONDS)
+atexit.register(storage.close)
+logger.info(f"Using {STORAGE_BACKEND} storage backend")
+
+# Current catalog snapshot. Replaced as a whole by reload_catalog(); readers take one
+# reference per request and keep using it, so they never see a half-built index.
+catalog = Catalog(storage.load_restaurants())
+catalog_reload_lock = threading.Lock()
+search_cache = SearchResultCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS)
+placeholder_matchers = load_placeholder_matchers(PLACEHOLDER_PATH)
+# Runs waitlist promotions off the request path; requests that free seats only queue the affected days
+waitlist_promoter = WaitlistPromoter(lambda restaurant_id, reservation_date: promote_waitlist(restaurant_id, reservation_date),
+                                     storage.waitlist_days, WAITLIST_SWEEP_SECONDS)
+
+# Sizes and cache counters are read when /metrics is scraped
+CATALOG_RESTAURANTS.set_function(lambda: len(catalog.restaurants))
+CATALOG_VERSION.set_function(lambda: catalog.version)
+BOOKINGS_STORED.set_function(lambda: storage.order_count())
+SEARCH_CACHE_EVENTS.set_function(lambda: {
+    (event,): count for event, count in search_cache.stats().items() if event not in ("entries", "max_entries")
+})
+SEARCH_CACHE_ENTRIES.set_function(lambda: search_cache.stats()["entries"])
+WAITLIST_DAYS.set_function(lambda: len(storage.waitlist_days()))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Watches restaurant_list.json while the API is serving (GOODFOODS_CATALOG_WATCH_SECONDS, 0 disables)
+    and runs the waitlist promoter.
+    """
+
+    watcher = None
+    if CATALOG_WATCH_SECONDS > 0:
+        watcher = CatalogWatcher(os.path.join(DATA_DIR, RESTAURANTS_FILE), reload_catalog, CATALOG_WATCH_SECONDS)
+        watcher.start()
+    waitlist_promoter.start()
+    # Parties may have been left waiting for seats freed before a restart
+    for restaurant_id, reservation_date in storage.waitlist_days():
+        waitlist_promoter.notify(restaurant_id, [reservation_date])
+    yield
+    waitlist_promoter.stop()
+    if watcher is not None:
+        watcher.stop()
+
+
+def request_priority(method: str, path: str) -> Optional[str]:
+    """
+    Classifies a request for admission control. Searches, availability and
+    other reads are 'search'; bookings, changes and waitlist joins are 'write'.
+    Metrics, docs and admin calls are never limited.
+
+    Parameters:
+        method (str): HTTP method
+        path (str): Request path
+
+    Returns:
+        Optional[str]: SEARCH_PRIORITY, WRITE_PRIORITY or None
+    """
+
+    if path in UNLIMITED_PATHS or path.startswith("/admin/"):
+        return None
+    if method in ("GET", "HEAD") or path.startswith("/restaurants/search") or path == "/availability":
+        return SEARCH_PRIORITY
+    return WRITE_PRIORITY
+
+
+def route_template(scope: dict) -> Optional[str]:
+    """
+    Finds the template of the route that would serve a request (e.g. /reservations/{order_id}),
+    so requests refused before routing are still labelled by route in the metrics.
+
+    Parameters:
+        scope (dict): ASGI scope of the request
+
+    Returns:
+        Optional[str]: Route template, or None if no route matches
+    """
+
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return None
+
+
+# Per priority: a concurrency gate with a queue of ADMISSION_QUEUE_FACTOR times its size, and per-client
+# token buckets allowing bursts of RATE_BURST_FACTOR seconds' worth of requests; 0 disables either
+admission_gates = {
+    priority: AdmissionGate(limit, limit * ADMISSION_QUEUE_FACTOR, ADMISSION_TIMEOUT_SECONDS)
+    for priority, limit in ((SEARCH_PRIORITY, SEARCH_CONCURRENCY), (WRITE_PRIORITY, WRITE_CONCURRENCY)) if limit > 0
+}
+rate_limiters = {
+    priority: TokenBucketLimiter(rate, rate * RATE_BURST_FACTOR)
+    for priority, rate in ((SEARCH_PRIORITY, SEARCH_RATE), (WRITE_PRIORITY, WRITE_RATE)) if rate > 0
+}
+ADMISSION_ACTIVE.set_function(lambda: {(priority,): gate.stats()["active"] for priority, gate in admission_gates.items()})
+ADMISSION_QUEUED.set_function(lambda: {(priority,): gate.stats()["queued"] for priority, gate in admission_gates.items()})
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+# Added first so it runs inside the metrics middleware: recorded latency includes the wait for a slot
+app.add_middleware(AdmissionControlMiddleware, classify=request_priority, gates=admission_gates, limiters=rate_limiters,
+                   on_reject=lambda priority, reason: ADMISSION_REJECTED_TOTAL.inc(priority=priority, reason=reason),
+                   identify=lambda scope: client_identity(scope, TRUSTED_CLIENT_ID_PROXIES, CLIENT_ID_SECRET))
+app.add_middleware(RequestMetricsMiddleware, latency=REQUEST_SECONDS, requests=REQUESTS_TOTAL, route_path=route_template)
 
 class RestaurantQuery(BaseModel):
     """
@@ -61,13 +240,45 @@ class RestaurantQuery(BaseModel):
     All fields are optional to allow flexible searching.
     """
 
+    name: Optional[str] = None
     location: Optional[str] = None
     cuisine: Optional[Union[str, List[str]]] = None
     operating_days: Optional[str] = None
     operating_hours: Optional[Dict[str, str]] = None
+    open_at: Optional[Dict[str, str]] = Field(default=None, description="{'time': 'HH:MM', 'day': weekday or YYYY-MM-DD}: restaurants open at that moment")
     restaurant_max_seating_capacity: Optional[int] = None
     max_booking_party_size: Optional[int] = None
+    limit: Optional[int] = Field(default=None, ge=1, description="Return at most this many best matches")
+    offset: Optional[int] = Field(default=None, ge=0, description="Skip this many best matches (pagination)")
+    fields: Optional[List[str]] = Field(default=None, description="Restaurant keys to include in each result")
+    near: Optional[str] = Field(default=None, description="Area or landmark to search around, e.g. 'Koramangala'")
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius_km: Optional[float] = Field(default=None, gt=0, le=100, description="Search radius around the point, defaults to 5 km")
+    nearest: Optional[int] = Field(default=None, ge=1, le=100, description="Return only the k closest outlets")
     
+class BatchRestaurantQuery(BaseModel):
+    """
+    Pydantic model for several restaurant searches sent in one request.
+    Queries are keyed by a caller-chosen ID (e.g. the tool call ID), or given
+    as a list, in which case results are keyed by list position.
+    """
+
+    queries: Union[Dict[str, RestaurantQuery], List[RestaurantQuery]]
+
+class AvailabilityQuery(BaseModel):
+    """
+    Pydantic model for availability grid requests.
+    Covers all restaurants unless restaurant_ids is given.
+    """
+
+    restaurant_ids: Optional[List[str]] = None
+    start_date: Optional[str] = Field(default=None, description="First date in YYYY-MM-DD format, defaults to today")
+    days: int = Field(default=7, ge=1, le=31)
+    slot_minutes: int = Field(default=30, ge=5, le=240)
+    party_size: Optional[int] = Field(default=None, ge=1)
+    include_grid: bool = True
+
 class Reservation(BaseModel):
     """
     Pydantic model for restaurant reservation requests.
@@ -81,141 +292,335 @@ class Reservation(BaseModel):
     reservation_date: str
     reservation_time: str
 
+class ReservationUpdate(BaseModel):
+    """
+    Pydantic model for changing an existing reservation.
+    Only the fields that are set are changed.
+    """
 
-def search_restaurant_information(query: Dict[str, Any]) -> Dict[str, Union[str, List[Dict[str, Any]]]]:
-   """
+    restaurant_id: Optional[str] = None
+    orderer_name: Optional[str] = None
+    orderer_contact: Optional[str] = None
+    party_size: Optional[int] = None
+    reservation_date: Optional[str] = None
+    reservation_time: Optional[str] = None
+    capacity_debug: bool = False
+
+
+def search_cache_key(query: Dict[str, Any]) -> str:
+    """
+    Normalizes a search query into a cache key.
+    Empty values are dropped, keys sorted and case-insensitive text fields lowercased,
+    so queries that return the same response share one key.
+
+    Parameters:
+        query (Dict[str, Any]): Search criteria and controls as received
+
+    Returns:
+        str: Canonical JSON form of the query
+    """
+
+    normalized = {}
+    for key, value in query.items():
+        if not value and key not in ("latitude", "longitude"):
+            continue
+        if value is None:
+            continue
+        if isinstance(value, str) and (key in CASE_INSENSITIVE_FIELDS or key == "cuisine"):
+            value = value.lower()
+        normalized[key] = value
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def encode_response(result: Dict[str, Any]) -> bytes:
+    """
+    Serializes a response the way FastAPI's JSONResponse does (orjson when installed).
+    """
+
+    return encode_json(result)
+
+
+def reload_catalog() -> Dict[str, Any]:
+    """
+    Re-reads restaurant_list.json, builds a new catalog with all its indexes
+    and swaps it in. Requests keep using the previous snapshot until the swap,
+    and a catalog that fails validation is never installed.
+
+    Returns:
+        Dict[str, Any]: Reload result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - catalog_version, restaurants: New version and restaurant count (success only)
+    """
+
+    global catalog
+    with catalog_reload_lock:
+        try:
+            restaurants = read_restaurant_file(DATA_DIR)
+            validate_catalog(restaurants)
+            # Building the indexes also fails on entries validate_catalog lets through, e.g. a cuisine that is not a list
+            new_catalog = Catalog(restaurants, catalog.version + 1)
+        except Exception as e:
+            logger.error(f"CATALOG RELOAD REJECTED: {type(e).__name__}: {e}")
+            return {"status": "error", "message": f"Catalog not reloaded: {type(e).__name__}: {e}"}
+
+        storage.replace_restaurants(restaurants)
+        catalog = new_catalog
+        search_cache.invalidate()
+
+    # A larger capacity or shorter dining duration can seat waiting parties
+    for restaurant_id, reservation_date in storage.waitlist_days():
+        waitlist_promoter.notify(restaurant_id, [reservation_date])
+
+    logger.info(f"CATALOG RELOADED: version {new_catalog.version} with {len(restaurants)} restaurants")
+    return {
+        "status": "success",
+        "message": "Catalog reloaded",
+        "catalog_version": new_catalog.version,
+        "restaurants": len(restaurants)
+    }
+
+
+def project_restaurant(restaurant: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Keeps only the requested keys of a restaurant result.
+
+    Parameters:
+        restaurant (Dict[str, Any]): Restaurant (or search result) dict
+        fields (Optional[List[str]]): Keys to keep; restaurant_id and match details are always kept
+
+    Returns:
+        Dict[str, Any]: Projected dict, or the original dict when fields is empty
+    """
+
+    if not fields:
+        return restaurant
+    return {k: v for k, v in restaurant.items() if k in fields or k in ALWAYS_RETURNED_FIELDS}
+
+
+def find_nearby_restaurants(geo_query: Dict[str, Any], field_rows_cache: Optional[Dict] = None,
+                            snapshot: Optional[Catalog] = None) -> Optional[Dict[str, Any]]:
+    """
+    Resolves the geo part of a search to distances from the search point.
+
+    The point is latitude/longitude when both are given, otherwise the centre
+    of the outlets whose address or landmark mentions `near`. Outlets within
+    radius_km (default DEFAULT_RADIUS_KM) are returned, or only the `nearest`
+    k of them when nearest is set (radius_km then only applies if given).
+
+    Parameters:
+        geo_query (Dict[str, Any]): near, latitude, longitude, radius_km and nearest values (None when unset)
+        field_rows_cache (Optional[Dict]): Index lookup cache shared by the queries of one batch
+        snapshot (Optional[Catalog]): Catalog to search, the current one when None
+
+    Returns:
+        Optional[Dict[str, Any]]: None when the query has no usable point, otherwise
+            - search_point: {'latitude', 'longitude'} used for the search
+            - distances: distance_km per catalog row, nearest first
+    """
+
+    snapshot = snapshot or catalog
+    latitude, longitude = geo_query.get("latitude"), geo_query.get("longitude")
+    if latitude is None or longitude is None:
+        near = (geo_query.get("near") or "").strip()
+        if not near:
+            return None
+        rows = snapshot.search_index.cached_rows_for("location", near, field_rows_cache)
+        if not rows and near.lower().startswith("near "):
+            rows = snapshot.search_index.cached_rows_for("location", near[5:].strip(), field_rows_cache)
+        point = snapshot.geo_index.centroid(rows) if rows else None
+        if point is None:
+            logger.info(f"Could not place '{near}' on the map")
+            return None
+        latitude, longitude = point
+
+    radius_km = geo_query.get("radius_km")
+    if geo_query.get("nearest"):
+        distances = snapshot.geo_index.nearest(latitude, longitude, geo_query["nearest"], radius_km)
+    else:
+        distances = snapshot.geo_index.within(latitude, longitude, radius_km or DEFAULT_RADIUS_KM)
+
+    logger.info(f"Found {len(distances)} restaurants near ({latitude:.4f}, {longitude:.4f})")
+    return {
+        "search_point": {"latitude": round(latitude, 6), "longitude": round(longitude, 6)},
+        "distances": distances
+    }
+
+
+def plan_restaurant_search(query: Dict[str, Any], field_rows_cache: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Runs a restaurant search down to the catalog rows to return, without building the restaurant records.
+    See search_restaurant_information for the query format.
+
+    Parameters:
+        query (Dict[str, Any]): Search criteria and controls
+        field_rows_cache (Optional[Dict]): Index lookup cache shared by the queries of one batch
+
+    Returns:
+        Dict[str, Any]: Search plan containing:
+            - snapshot: Catalog the rows refer to
+            - response: Response fields other than restaurants
+            - rows: (catalog row, per-query result fields) for every restaurant to return, in order
+            - fields: Restaurant keys to return (None for all)
+    """
+
+    logger.info(f"Received search query: {query}")
+
+    snapshot = catalog
+    restaurants = snapshot.restaurants
+    limit = query.get("limit")
+    offset = max(int(query.get("offset") or 0), 0)
+    fields = query.get("fields")
+    nearby = find_nearby_restaurants({k: query.get(k) for k in GEO_FIELDS}, field_rows_cache, snapshot)
+    if nearby is None and query.get("near") and not query.get("location"):
+        # The place could not be located; fall back to matching it as location text
+        query = {**query, "location": query["near"]}
+    query = {k: v for k, v in query.items() if v and k not in SEARCH_CONTROL_FIELDS and k not in GEO_FIELDS}
+    logger.info(f"SEARCH QUERY after removing empty values: {query}")
+
+    top_restaurant_rows = [(row, {}) for row in range(min(10, limit or 10, len(restaurants)))]
+
+    if not query and nearby is None:
+        logger.info("EMPTY QUERY: Returning top restaurants")
+        response = {
+            "status": "empty query",
+            "message": "Since the query was empty, here are some top most preferred options. Collect additional info from user to match.",
+        }
+        return {"snapshot": snapshot, "response": response, "rows": top_restaurant_rows, "fields": fields}
+
+    logger.info(f"Starting restaurant matching process for {len(restaurants)} restaurants")
+    search_index = snapshot.search_index
+    match_counts, field_masks, similarity = search_index.score(query, field_rows_cache)
+    distances = None
+    if nearby is not None:
+        # Only outlets around the point stay matched, each with one more matched field
+        distances = nearby["distances"]
+        is_near = search_index.row_mask(distances)
+        match_counts = np.where(is_near, match_counts + 1, 0)
+        field_masks = {**{key: mask & is_near for key, mask in field_masks.items()}, "near": is_near}
+    total_matches = int(np.count_nonzero(match_counts))
+    logger.info(f"Found {total_matches} matching restaurants")
+
+    if not total_matches:
+        logger.info("NO MATCHES: Returning top 10 restaurants with status message")
+        response = {
+            "status": "no_matches",
+            "message": "No matching restaurants found. Here are some top most preferred options. Collect additional info from user to match.",
+        }
+        return {"snapshot": snapshot, "response": response, "rows": top_restaurant_rows, "fields": fields}
+
+    top_k = offset + limit if limit else None
+    # Equal match counts: exact before fuzzy matches, then closest first
+    tie_breaks = []
+    if similarity:
+        tie_breaks.append(1 - search_index.to_column(similarity, 1.0))
+    if distances is not None:
+        tie_breaks.append(search_index.to_column(distances, 0.0))
+    ranked_rows = search_index.rank(match_counts, top_k, tie_breaks)[offset:]
+    next_offset = offset + len(ranked_rows) if offset + len(ranked_rows) < total_matches else None
+
+    logger.info(f"Returning {len(ranked_rows)} matched restaurants")
+    rows = []
+    for row in ranked_rows:
+        result_fields = {
+            "matched_fields": search_index.matched_fields(field_masks, row),
+            "match_count": int(match_counts[row])
+        }
+        if distances is not None:
+            result_fields["distance_km"] = distances[row]
+        if row in similarity:
+            result_fields["similarity"] = similarity[row]
+        rows.append((row, result_fields))
+
+    response = {
+        "status": "matches_found",
+        "message": f"Found {total_matches} restaurants matching your criteria.",
+        "total_matches": total_matches,
+        "offset": offset,
+        "next_offset": next_offset,
+    }
+    if nearby is not None:
+        response["search_point"] = nearby["search_point"]
+    return {"snapshot": snapshot, "response": response, "rows": rows, "fields": fields}
+
+
+def search_restaurant_information(query: Dict[str, Any], field_rows_cache: Optional[Dict] = None) -> Dict[str, Union[str, List[Dict[str, Any]]]]:
+    """
     Search for restaurants based on query parameters.
 
     Parameters:
         query (Dict[str, Any]): Search criteria including location, cuisine, operating hours, etc.
+            Optional controls: limit (best N matches, selected with np.argpartition before sorting),
+            offset (matches to skip) and fields (restaurant keys to return).
+            Geo criteria (near or latitude/longitude, with radius_km or nearest) keep
+            only outlets around the point, count as one matched field and rank
+            equally good matches by distance. A name or location that matches nothing
+            exactly is resolved by trigram similarity (typos, partial words).
+        field_rows_cache (Optional[Dict]): Index lookup cache shared by the queries of one batch
 
     Returns:
         Dict[str, Union[str, List[Dict[str, Any]]]]: Search results containing:
             - status: Search status ('empty query', 'no_matches', 'matches_found')
             - message: Human readable result description
             - restaurants: List of matching restaurants with match details
+            - total_matches, offset, next_offset: Pagination details (matches_found only)
+            - search_point: Point used for geo criteria, with distance_km on every result (geo searches only)
+            Results found by similarity carry a similarity score (0-1).
     """
-   
-   logger.info(f"Received search query: {query}")
 
-   query = {k: v for k, v in query.items() if v}  
-   logger.info(f"SEARCH QUERY after removing empty values: {query}")
+    with STAGE_SECONDS.time(stage="search_match"):
+        plan = plan_restaurant_search(query, field_rows_cache)
+    restaurants = plan["snapshot"].restaurants
+    return {
+        **plan["response"],
+        "restaurants": [project_restaurant({**restaurants[row], **result_fields}, plan["fields"]) for row, result_fields in plan["rows"]]
+    }
 
-   top_restaurant_info = restaurant_information_table[:10]
-   
-   if not query:
-       logger.info("EMPTY QUERY: Returning top restaurants")
-       return {
-           "status": "empty query",
-           "message": "Since the query was empty, here are some top most preferred options. Collect additional info from user to match.",
-           "restaurants": top_restaurant_info
-       }
-       
-   restaurant_matches = []
-   logger.info(f"Starting restaurant matching process for {len(restaurant_information_table)} restaurants")
-   for restaurant in restaurant_information_table:
-       logger.info(f"\nTesting restaurant: {restaurant['name']}")
-       match_count = 0
-       matches = {}
-       
-       for key, value in query.items():
-        logger.info(f"  Checking field: {key} = {value}")
-        if key == "cuisine":
-               
-                if isinstance(value, str):
-                   cuisine_match = any(value.lower() in cuisine.lower() for cuisine in restaurant.get("cuisine", []))
-                else:
-                   cuisine_match = any(c in restaurant.get("cuisine", []) for c in value)
-                if cuisine_match:
-                    logger.info(f"  Cuisine match: {cuisine_match}")
-                    match_count += 1
-                    matches[key] = True
-               
-        elif key == "location":
-               loc_info = restaurant.get("location", {})
-               location_query_str = str(value)
-               
-               
-               location_matches = (
-                   location_query_str.lower() in loc_info.get("address", "").lower() or
-                   location_query_str.lower() in loc_info.get("landmark", "").lower()
-               )
-               if location_matches:
-                logger.info(f"  Location match: {location_matches}")
-                match_count += 1
-                matches[key] = True
-                   
-        elif key == "operating_days":
-               days = restaurant.get("operating_days", [])
-               day_match = any(value.lower() in day.lower() for day in days)
-               if day_match:
-                logger.info(f"  Operating day match: {day_match}")
-                match_count += 1
-                matches[key] = True
-                   
-        elif key == "operating_hours":
-               rest_hours = restaurant.get("operating_hours", {})
-               hours_match = True
-               if "open" in value and rest_hours.get("open") != value["open"]:
-                   hours_match = False
-               if "close" in value and rest_hours.get("close") != value["close"]:
-                   hours_match = False
-               if hours_match:
-                logger.info(f"Operating hours match: {hours_match}")
-                match_count += 1
-                matches[key] = True
-               
-        elif key in ["restaurant_max_seating_capacity", "max_booking_party_size"]:
-               try:
-                value_int = int(str(value).strip())
-                restaurant_capacity = restaurant.get(key, 0)
-                capacity_match = restaurant_capacity >= value_int
-                logger.info(f"Comparing capacity: restaurant {restaurant_capacity} >= requested {value_int}")
-                if capacity_match:
-                   logger.info(f"  Capacity match: {capacity_match}")
-                   match_count += 1
-                   matches[key] = True
-               except (ValueError, TypeError) as e:
-                logger.info(f"Error converting capacity value '{value}' to integer for {restaurant['name']}: {e}")
-                continue   
+
+def encode_search_response(query: Dict[str, Any], field_rows_cache: Optional[Dict] = None) -> bytes:
+    """
+    Runs search_restaurant_information and returns its encoded JSON response.
+    Restaurant records are spliced from the bytes pre-encoded with the catalog
+    snapshot, so only the per-query match fields are encoded per request.
+
+    Parameters:
+        query (Dict[str, Any]): Search criteria and controls
+        field_rows_cache (Optional[Dict]): Index lookup cache shared by the queries of one batch
+
+    Returns:
+        bytes: Same JSON as encode_response(search_restaurant_information(query))
+    """
+
+    with STAGE_SECONDS.time(stage="search_match"):
+        plan = plan_restaurant_search(query, field_rows_cache)
+    with STAGE_SECONDS.time(stage="search_encode"):
+        snapshot, fields = plan["snapshot"], plan["fields"]
+        if fields:
+            records = (encode_json(project_restaurant({**snapshot.restaurants[row], **result_fields}, fields))
+                       for row, result_fields in plan["rows"])
         else:
-               field_match = restaurant.get(key) == value
-               logger.info(f"  Field match for {key}: {field_match}")
-               if not field_match:
-                   match = False
-                   break
-                   
-       if match_count > 0:
-            logger.info(f"Restaurant {restaurant['name']} matched {match_count} criteria: {matches}")
-            restaurant_matches.append({
-                "restaurant": restaurant,
-                "match_count": match_count,
-                "matched_fields": matches
-            })
-           
-   restaurant_matches.sort(key=lambda x: x["match_count"], reverse=True)
-   logger.info(f"Found {len(restaurant_matches)} matching restaurants")
-   
-   if not restaurant_matches:
-       logger.info("NO MATCHES: Returning top 10 restaurants with status message")
-       return {
-           "status": "no_matches",
-           "message": "No matching restaurants found. Here are some top most preferred options. Collect additional info from user to match.",
-           "restaurants": top_restaurant_info
-       }
-
-   logger.info(f"Returning {len(restaurant_matches)} matched restaurants")    
-   return {
-    "status": "matches_found",
-    "message": f"Found {len(restaurant_matches)} restaurants matching your criteria.",
-    "restaurants": [
-        {
-            **match["restaurant"],  
-            "matched_fields": match["matched_fields"],
-            "match_count": match["match_count"]
-        } for match in restaurant_matches
-    ]
-}
+            records = (splice_record(snapshot.encoded_restaurants[row], result_fields) for row, result_fields in plan["rows"])
+        return splice_object(plan["response"], "restaurants", records)
+
+
+def search_restaurant_batch(queries: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs several restaurant searches in one pass over the index.
+    Identical field criteria shared by several queries are resolved only once.
+
+    Parameters:
+        queries (Dict[str, Dict[str, Any]]): Search criteria keyed by query ID
+
+    Returns:
+        Dict[str, Dict[str, Any]]: search_restaurant_information result per query ID
+    """
+
+    logger.info(f"Received batch of {len(queries)} search queries")
+    field_rows_cache: Dict = {}
+    return {
+        query_id: search_restaurant_information(query, field_rows_cache)
+        for query_id, query in queries.items()
+    }
 
 
 def review_information_before_order(order_info: Dict[str, Any]) -> Dict[str, Union[str, List[str]]]:
@@ -230,28 +635,57 @@ def review_information_before_order(order_info: Dict[str, Any]) -> Dict[str, Uni
             - status: 'complete' or 'invalid'
             - missing_fields: List of required fields that are missing (if any)
             - placeholder_fields: List of fields containing placeholder values (if any)
+            - invalid_fields: List of fields with a malformed value: a reservation_date that is not YYYY-MM-DD,
+              a reservation_time that is not HH:MM or a party_size below 1 (if any)
     """
 
    required_fields = ["restaurant_id", "orderer_name", "orderer_contact", "party_size", "reservation_date", "reservation_time"]
 
-   missing_fields = [field for field in required_fields if field not in order_info or not order_info[field]]
+   missing_fields = [field for field in required_fields if order_info.get(field) in (None, "")]
 
    placeholder_check = detect_placeholder_values(order_info)
    placeholder_fields = placeholder_check["placeholder_fields"]
 
-   if missing_fields or placeholder_fields:
+   invalid_fields = []
+   party_size = order_info.get("party_size")
+   if party_size not in (None, "") and "party_size" not in placeholder_fields:
+        if isinstance(party_size, bool) or not isinstance(party_size, int) or party_size < 1:
+            invalid_fields.append("party_size")
+
+   if order_info.get("reservation_date") and "reservation_date" not in placeholder_fields:
+        # Dates are compared as strings by the capacity checks, so '2026-1-5' must not pass for '2026-01-05'
+        try:
+            reservation_date = str(order_info["reservation_date"])
+            if datetime.strptime(reservation_date, "%Y-%m-%d").strftime("%Y-%m-%d") != reservation_date:
+                invalid_fields.append("reservation_date")
+        except ValueError:
+            invalid_fields.append("reservation_date")
+
+   if order_info.get("reservation_time") and "reservation_time" not in placeholder_fields:
+        try:
+            if parse_hhmm(order_info["reservation_time"]) >= MINUTES_PER_DAY:
+                invalid_fields.append("reservation_time")
+        except ValueError:
+            invalid_fields.append("reservation_time")
+
+   if missing_fields or placeholder_fields or invalid_fields:
         return {
             "status": "invalid",
             "missing_fields": missing_fields,
-            "placeholder_fields": placeholder_fields
+            "placeholder_fields": placeholder_fields,
+            "invalid_fields": invalid_fields
         }
    
    return {"status": "complete"}
 
 
-def check_capacity(restaurant_id: str, requested_party_size: int, reservation_date: str, reservation_time: str, debug: bool) -> Union[bool, Dict[str, Any]]:
+def check_capacity(restaurant_id: str, requested_party_size: int, reservation_date: str, reservation_time: str, debug: bool,
+                   excluding: Optional[Dict[str, Any]] = None) -> Union[bool, Dict[str, Any]]:
     """
-    Checks if restaurant can accommodate the requested party size at specified time.
+    Checks if restaurant can accommodate the requested party size for a full
+    dining window starting at the specified time. Every booking holds its seats
+    for the restaurant's dining duration, so overlapping bookings at different
+    times count against the same seats.
 
     Parameters:
         restaurant_id (str): Unique identifier of the restaurant
@@ -259,6 +693,7 @@ def check_capacity(restaurant_id: str, requested_party_size: int, reservation_da
         reservation_date (str): Date of reservation in YYYY-MM-DD format
         reservation_time (str): Time of reservation in HH:MM format
         debug (bool): If True, returns detailed capacity information
+        excluding (Optional[Dict[str, Any]]): Stored order whose seats are not counted, the one being modified
 
     Returns:
         Union[bool, Dict[str, Any]]: 
@@ -266,16 +701,14 @@ def check_capacity(restaurant_id: str, requested_party_size: int, reservation_da
             - If debug=True: Dictionary with detailed capacity information
     """
 
-    restaurant = next((r for r in restaurant_information_table if r["restaurant_id"] == restaurant_id), None)
+    restaurant = catalog.lookup.get(restaurant_id)
     if not restaurant:
         return False
     
     max_capacity = restaurant["restaurant_max_seating_capacity"]
     
-    current_total = sum(order["party_size"] for order in order_management_table 
-                        if order["restaurant_id"] == restaurant_id and 
-                        order["reservation_date"] == reservation_date and 
-                        order["reservation_time"] == reservation_time)
+    with STAGE_SECONDS.time(stage="capacity_check"):
+        current_total = storage.peak_seats(restaurant_id, reservation_date, reservation_time, dining_duration(restaurant), excluding)
     available_capacity = max_capacity - current_total
     is_within_capacity = (current_total + requested_party_size) <= max_capacity
     if debug:
@@ -291,9 +724,33 @@ def check_capacity(restaurant_id: str, requested_party_size: int, reservation_da
         return is_within_capacity
 
 
+def party_size_limit_check(restaurant: Dict[str, Any], party_size: int) -> Optional[Dict[str, Any]]:
+    """
+    Rejects a party larger than the restaurant takes in a single booking (max_booking_party_size).
+
+    Parameters:
+        restaurant (Dict[str, Any]): Catalog entry of the restaurant
+        party_size (int): Number of people in the party
+
+    Returns:
+        Optional[Dict[str, Any]]: Error result with max_booking_party_size, or None if the party may book
+    """
+
+    limit = restaurant.get("max_booking_party_size")
+    if limit is None or party_size <= limit:
+        return None
+    return {
+        "status": "error",
+        "message": f"{restaurant.get('name', restaurant['restaurant_id'])} takes bookings for at most {limit} people",
+        "max_booking_party_size": limit
+    }
+
+
 def detect_placeholder_values(order_info: Dict[str, Any]) -> Dict[str, Union[bool, List[str]]]:
     """
     Detects common placeholder values in order information.
+    Placeholders per field come from placeholder_values.json (GOODFOODS_PLACEHOLDER_FILE)
+    and are matched as case-insensitive substrings.
 
     Parameters:
         order_info (Dict[str, Any]): Order information to check for placeholders
@@ -304,59 +761,70 @@ def detect_placeholder_values(order_info: Dict[str, Any]) -> Dict[str, Union[boo
             - placeholder_fields: List of fields containing placeholder values
     """
 
-    placeholder_values = {
-        "orderer_name": [
-            "user", "your name", "your full name", "name", "customer", "customer name",
-            "customer's name", "the user", "the customer", "placeholder", "john doe", 
-            "jane doe", "user name", "username", "[name]", "(name)", "customer_name", 
-            "orderer", "person", "guest", "guest name", "your_name"
-        ],
-        "orderer_contact": [
-            "contact", "your contact", "your phone", "your number", "your phone number",
-            "your contact number", "phone", "phone number", "contact number", "mobile",
-            "mobile number", "user contact", "user phone", "user number", "123456789",
-            "1234567890", "9876543210", "user's contact", "user's phone", "customer contact",
-            "customer phone", "customer number", "phone_number", "contact_number", 
-            "your_phone_number", "your_contact"
-        ]
-    }
-    
     has_placeholders = False
     placeholder_fields = []
-    
-    for field, placeholders in placeholder_values.items():
+
+    # The contact number format is checked even when the file lists no contact placeholders
+    for field in dict.fromkeys([*placeholder_matchers, "orderer_contact"]):
         if field in order_info:
             value = str(order_info[field]).lower().strip()
-            if any(placeholder.lower() in value for placeholder in placeholders):
+            matcher = placeholder_matchers.get(field)
+            if matcher is not None and matcher.find(value) is not None:
                 has_placeholders = True
                 placeholder_fields.append(field)
-            
+
             elif field == "orderer_contact":
                 # Require strictly numeric and exactly 10 digits
                 if (not value.isdigit()) or (len(value) != 10):
                     has_placeholders = True
                     placeholder_fields.append(field)
-    
-    for field in ["reservation_date", "reservation_time"]:
-        if field in order_info:
-            value = str(order_info[field]).lower()
-            if "tomorrow" in value or "tonight" in value or "today" in value or "next" in value:
-                has_placeholders = True
-                placeholder_fields.append(field)
-    
+
     return {
         "has_placeholders": has_placeholders,
         "placeholder_fields": placeholder_fields
     }
 
 
-def make_new_order(order_info: dict, capacity_debug: bool = False) ->  Dict[str, Any]:
+def replay_idempotent_result(idempotency_key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    Looks up the response already given for an idempotency key.
+
+    Parameters:
+        idempotency_key (str): Key sent with the reservation
+        fingerprint (str): Fingerprint of the current reservation details
+
+    Returns:
+        Optional[Dict[str, Any]]: None for a new key; the stored response marked with
+        idempotent_replay; or an idempotency_conflict error when the key was used for other details
+    """
+
+    stored = storage.idempotent_result(idempotency_key)
+    if stored is None:
+        return None
+    stored_fingerprint, response = stored
+    if stored_fingerprint != fingerprint:
+        logger.info(f"IDEMPOTENCY CONFLICT: Key {idempotency_key} was used for different reservation details")
+        BOOKINGS_TOTAL.inc(outcome="idempotency_conflict")
+        return {
+            "status": "error",
+            "message": "Idempotency key was already used for different reservation details",
+            "idempotency_conflict": True
+        }
+    logger.info(f"IDEMPOTENT REPLAY: Returning the stored response for key {idempotency_key}")
+    BOOKINGS_TOTAL.inc(outcome="idempotent_replay")
+    return {**response, "idempotent_replay": True}
+
+
+def make_new_order(order_info: dict, capacity_debug: bool = False, idempotency_key: Optional[str] = None) ->  Dict[str, Any]:
     """
     Creates a new restaurant reservation after validating information and checking capacity.
+    With an idempotency key the result is stored, and a retry with the same key
+    gets it back without being validated, capacity-checked or stored again.
 
     Parameters:
         order_info (Dict[str, Any]): Complete order information including customer and reservation details
         capacity_debug (bool, optional): If True, includes detailed capacity check information. Defaults to False.
+        idempotency_key (Optional[str]): Key identifying retries of the same booking, e.g. the agent's tool call ID
 
     Returns:
         Dict[str, Any]: Order result containing:
@@ -365,112 +833,967 @@ def make_new_order(order_info: dict, capacity_debug: bool = False) ->  Dict[str,
             - order: Complete order details if successful
             - missing_fields: List of missing fields if validation fails
             - placeholder_fields: List of fields with placeholders if validation fails
+            - invalid_fields: List of fields with malformed values if validation fails
             - capacity_details: Detailed capacity information if capacity check fails and debug=True
+            - restaurant_not_found: True if no restaurant has the given restaurant_id
+            - max_booking_party_size: The restaurant's limit, if the party is larger
+            - waitlist_available: True if capacity check fails; the party can join_waitlist for this slot
+            - idempotent_replay: True if this is the stored response of an earlier request with the same key
+            - idempotency_conflict: True if the key was already used for different reservation details
     """
 
     logger.info(f"ORDER REQUEST: {order_info}")
 
+    fingerprint = request_fingerprint(order_info) if idempotency_key else None
+    if idempotency_key:
+        replay = replay_idempotent_result(idempotency_key, fingerprint)
+        if replay is not None:
+            return replay
+
+    def remember(result: Dict[str, Any]) -> Dict[str, Any]:
+        if idempotency_key:
+            storage.save_idempotent_result(idempotency_key, fingerprint, result)
+        return result
+
     review = review_information_before_order(order_info)
     if review["status"] == "invalid":
         logger.info(f"ORDER VALIDATION FAILED: Missing fields: {review['missing_fields']}")
-        return {
+        BOOKINGS_TOTAL.inc(outcome="rejected_validation")
+        return remember({
             "status": "error",
             "message": "Information validation failed",
             "missing_fields": review.get("missing_fields", []),
-            "placeholder_fields": review.get("placeholder_fields", [])
-        }
+            "placeholder_fields": review.get("placeholder_fields", []),
+            "invalid_fields": review.get("invalid_fields", [])
+        })
     
     logger.info(f"ORDER VALIDATION PASSED: All required fields present")
 
-    logger.info("CHECKING CAPACITY")
-    capacity_result = check_capacity(
-        order_info["restaurant_id"],
-        order_info["party_size"],
-        order_info["reservation_date"],
-        order_info["reservation_time"],
-        debug=capacity_debug
-    )
-    logger.info("CAPACITY CHECK COMPLETE")
-    logger.info(capacity_result)
-    
-    if isinstance(capacity_result, dict):
-        logger.info(f"CAPACITY CHECK RESULT: {capacity_result}")
-        if not capacity_result["is_within_capacity"]:
-            logger.info(f"CAPACITY EXCEEDED: Restaurant {order_info['restaurant_id']} cannot accommodate {order_info['party_size']} people")
-            return {
-                "status": "error",
-                "message": "Capacity exceeded. Please choose a different time or reduce party size.",
-                "capacity_details": capacity_result
-            }
-    else:
-        if not capacity_result:
-            logger.info(f"CAPACITY EXCEEDED: Restaurant {order_info['restaurant_id']} cannot accommodate {order_info['party_size']} people")
-            return {
-                "status": "error",
-                "message": "Capacity exceeded. Please choose a different time slot or reduce party size."
-            }
-    
-    logger.info("CREATING NEW ORDER")
-    order_id = f"ord{len(order_management_table) + 1:03d}"
-    new_order = order_info.copy()
-    new_order["order_id"] = order_id
-    new_order["status"] = "confirmed"
-    logger.info("NEW ORDER CREATED")
+    restaurant = catalog.lookup.get(order_info["restaurant_id"])
+    if restaurant is None:
+        # Not a capacity problem, so there is no waitlist to offer either
+        logger.info(f"ORDER REJECTED: Unknown restaurant {order_info['restaurant_id']}")
+        BOOKINGS_TOTAL.inc(outcome="rejected_validation")
+        return remember({
+            "status": "error",
+            "message": f"No restaurant found with restaurant_id {order_info['restaurant_id']}",
+            "restaurant_not_found": True
+        })
+    problem = party_size_limit_check(restaurant, order_info["party_size"])
+    if problem is not None:
+        logger.info(f"ORDER REJECTED: Party of {order_info['party_size']} over the booking limit of {order_info['restaurant_id']}")
+        BOOKINGS_TOTAL.inc(outcome="rejected_validation")
+        return remember(problem)
 
+    # Capacity check and order creation must not interleave with another booking whose dining window could overlap
     try:
-        order_management_table.append(new_order)
-        logger.info(f"ORDER CONFIRMED: {order_id} for {order_info['orderer_name']}")
+        with storage.reservation_lock(order_info["restaurant_id"], order_info["reservation_date"], order_info["reservation_time"],
+                                      dining_duration(restaurant)):
+            # A concurrent duplicate waits on the same lock; once it gets in, the first request's result is stored
+            if idempotency_key:
+                replay = replay_idempotent_result(idempotency_key, fingerprint)
+                if replay is not None:
+                    return replay
+
+            logger.info("CHECKING CAPACITY")
+            capacity_result = check_capacity(
+                order_info["restaurant_id"],
+                order_info["party_size"],
+                order_info["reservation_date"],
+                order_info["reservation_time"],
+                debug=capacity_debug
+            )
+            logger.info("CAPACITY CHECK COMPLETE")
+            logger.info(capacity_result)
+
+            if isinstance(capacity_result, dict):
+                logger.info(f"CAPACITY CHECK RESULT: {capacity_result}")
+                if not capacity_result["is_within_capacity"]:
+                    logger.info(f"CAPACITY EXCEEDED: Restaurant {order_info['restaurant_id']} cannot accommodate {order_info['party_size']} people")
+                    BOOKINGS_TOTAL.inc(outcome="rejected_capacity")
+                    return remember({
+                        "status": "error",
+                        "message": "Capacity exceeded. Please choose a different time or reduce party size.",
+                        "capacity_details": capacity_result,
+                        "waitlist_available": True
+                    })
+            else:
+                if not capacity_result:
+                    logger.info(f"CAPACITY EXCEEDED: Restaurant {order_info['restaurant_id']} cannot accommodate {order_info['party_size']} people")
+                    BOOKINGS_TOTAL.inc(outcome="rejected_capacity")
+                    return remember({
+                        "status": "error",
+                        "message": "Capacity exceeded. Please choose a different time slot or reduce party size.",
+                        "waitlist_available": True
+                    })
 
-        with open('data/bookings_list.json', 'w') as f:
-            json.dump(order_management_table, f, indent=2)
+            logger.info("CREATING NEW ORDER")
+            order_id = storage.next_order_id()
+            new_order = order_info.copy()
+            new_order["order_id"] = order_id
+            new_order["status"] = "confirmed"
+            logger.info("NEW ORDER CREATED")
 
-        logger.info(f"ORDER SAVED TO DATABASE")
+            # A failure here propagates out of the lock, which rolls the transaction back (SQLite)
+            with STAGE_SECONDS.time(stage="order_persist"):
+                storage.add_order(new_order)
+            BOOKINGS_TOTAL.inc(outcome="confirmed")
+            logger.info(f"ORDER CONFIRMED: {order_id} for {order_info['orderer_name']}")
 
+            logger.info(f"ORDER SAVED TO DATABASE")
+
+            # Stored before the lock is released (and, with SQLite, in the order's transaction)
+            return remember({
+                "status": "success",
+                "message": "Reservation confirmed",
+                "order": new_order
+            })
     except Exception as e:
-        logger.info(f"ERROR SAVING ORDER: {str(e)}")
-    
+        # Nothing is stored under the idempotency key, so a retry tries the booking again
+        logger.error(f"ERROR SAVING ORDER: {str(e)}")
+        BOOKINGS_TOTAL.inc(outcome="persist_failed")
+        return {
+            "status": "error",
+            "message": "The reservation could not be saved. Please try again."
+        }
+
+
+def contact_check(record: Optional[Dict[str, Any]], orderer_contact: Optional[str], kind: str, record_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Makes sure the caller knows the contact number of a booking or waitlist entry
+    before it is shown or changed. Order and waitlist IDs are sequential, so the ID
+    alone proves nothing. A wrong number is answered like an unknown ID, so IDs
+    cannot be probed for existence.
+
+    Parameters:
+        record (Optional[Dict[str, Any]]): Stored booking or waitlist entry, None if the ID is unknown
+        orderer_contact (Optional[str]): Contact number given by the caller
+        kind (str): 'booking' or 'waitlist entry', for the messages
+        record_id (str): order_id or waitlist_id, for the messages
+
+    Returns:
+        Optional[Dict[str, Any]]: None if the contact matches, else the error result
+        (contact_required when no number was given, not_found otherwise)
+    """
+
+    if not contact_key(orderer_contact):
+        return {"status": "error", "message": f"Give the contact number the {kind} was made with", "contact_required": True}
+    if record is None or contact_key(record.get("orderer_contact")) != contact_key(orderer_contact):
+        return {"status": "error", "message": f"No {kind} found with ID {record_id} for the given details", "not_found": True}
+    return None
+
+
+def find_orders(order_id: Optional[str] = None, orderer_contact: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Looks up bookings through the storage indexes on order_id and contact number.
+
+    Parameters:
+        order_id (Optional[str]): Order ID from the booking confirmation; needs the booking's orderer_contact too
+        orderer_contact (Optional[str]): Contact number used for the bookings; alone it returns all of them
+
+    Returns:
+        Dict[str, Any]: Lookup result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - orders: Matching bookings, cancelled ones included (status 'cancelled')
+            - not_found: True if no booking matched
+            - contact_required: True if an order_id was given without the contact number
+    """
+
+    logger.info(f"BOOKING LOOKUP: order_id={order_id} contact={orderer_contact}")
+
+    if order_id:
+        order = storage.get_order(order_id)
+        problem = contact_check(order, orderer_contact, "booking", order_id)
+        if problem is not None:
+            return problem
+        orders = [order]
+    elif orderer_contact:
+        orders = storage.orders_for_contact(orderer_contact)
+    else:
+        return {"status": "error", "message": "Provide an order_id or an orderer_contact to look up bookings"}
+
+    if not orders:
+        return {"status": "error", "message": "No bookings found for the given details", "not_found": True}
     return {
         "status": "success",
-        "message": "Reservation confirmed",
-        "order": new_order
+        "message": f"Found {len(orders)} booking{'s' if len(orders) != 1 else ''}",
+        "orders": orders
+    }
+
+
+def booking_window(order: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Returns the (restaurant_id, reservation_date, reservation_time, duration) window an order's seats are held for,
+    or None when its time cannot be read (such orders hold no seats).
+    """
+
+    try:
+        parse_hhmm(order["reservation_time"])
+    except (KeyError, ValueError):
+        return None
+    restaurant = catalog.lookup.get(order["restaurant_id"], {})
+    return order["restaurant_id"], order["reservation_date"], order["reservation_time"], dining_duration(restaurant)
+
+
+def modify_order(order_id: str, orderer_contact: Optional[str], changes: Dict[str, Any], capacity_debug: bool = False) -> Dict[str, Any]:
+    """
+    Changes an existing reservation. The seats of the old version are released
+    and those of the new one re-reserved in one step: the capacity check and
+    the update run under the locks of both dining windows, and the booking's
+    own seats are not counted against the new window.
+
+    Parameters:
+        order_id (str): Booking to change
+        orderer_contact (Optional[str]): Contact number the booking was made with; must match
+        changes (Dict[str, Any]): New values for any of MODIFIABLE_FIELDS (a new orderer_contact too); None values are ignored
+        capacity_debug (bool, optional): If True, includes detailed capacity check information. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: Result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - order / previous_order: The booking after and before the change, if successful
+            - missing_fields, placeholder_fields, invalid_fields: Problems with the changed fields if validation fails
+            - capacity_details: Detailed capacity information if capacity check fails and debug=True
+            - restaurant_not_found: True if the new restaurant_id is not in the catalog
+            - max_booking_party_size: The restaurant's limit, if the new party is larger
+            - not_found: True if there is no booking with this order_id and contact number
+            - contact_required: True if no contact number was given
+    """
+
+    logger.info(f"MODIFY REQUEST: {order_id} {changes}")
+
+    changes = {field: value for field, value in changes.items() if field in MODIFIABLE_FIELDS and value is not None}
+    if not changes:
+        return {"status": "error", "message": f"Nothing to change; give new values for any of {', '.join(MODIFIABLE_FIELDS)}"}
+
+    for _ in range(BOOKING_CHANGE_ATTEMPTS):
+        current = storage.get_order(order_id)
+        problem = contact_check(current, orderer_contact, "booking", order_id)
+        if problem is not None:
+            BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="not_found")
+            return problem
+        if current.get("status") == CANCELLED_STATUS:
+            BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="rejected_cancelled")
+            return {"status": "error", "message": f"Booking {order_id} is cancelled and cannot be changed; make a new reservation instead"}
+
+        updated = {**current, **changes}
+        # Only the changed fields are validated, so older bookings with since-tightened formats can still be moved
+        review = review_information_before_order(updated)
+        problems = {key: [field for field in review.get(key, []) if field in changes]
+                    for key in ("missing_fields", "placeholder_fields", "invalid_fields")}
+        if any(problems.values()):
+            logger.info(f"MODIFY VALIDATION FAILED: {problems}")
+            BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="rejected_validation")
+            return {"status": "error", "message": "Information validation failed", **problems}
+        if "restaurant_id" in changes and changes["restaurant_id"] not in catalog.lookup:
+            BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="rejected_validation")
+            return {"status": "error", "message": f"No restaurant found with restaurant_id {changes['restaurant_id']}",
+                    "restaurant_not_found": True}
+        if "restaurant_id" in changes or "party_size" in changes:
+            problem = party_size_limit_check(catalog.lookup[updated["restaurant_id"]], updated["party_size"])
+            if problem is not None:
+                BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="rejected_validation")
+                return problem
+
+        new_window = booking_window(updated)
+        windows = [window for window in (booking_window(current), new_window) if window is not None]
+        with storage.reservations_lock(windows):
+            if storage.get_order(order_id) != current:
+                # Changed by another request between the read and the lock; start over from the new version
+                continue
+
+            capacity_result = check_capacity(updated["restaurant_id"], updated["party_size"], updated["reservation_date"],
+                                             updated["reservation_time"], debug=capacity_debug, excluding=current)
+            within_capacity = capacity_result["is_within_capacity"] if isinstance(capacity_result, dict) else capacity_result
+            if not within_capacity:
+                logger.info(f"CAPACITY EXCEEDED: Booking {order_id} cannot be moved to {new_window}")
+                BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="rejected_capacity")
+                result = {"status": "error", "message": "Capacity exceeded. The booking is unchanged; please choose a different time or party size."}
+                if isinstance(capacity_result, dict):
+                    result["capacity_details"] = capacity_result
+                return result
+
+            with STAGE_SECONDS.time(stage="order_persist"):
+                storage.update_order(updated)
+            BOOKING_CHANGES_TOTAL.inc(action="modify", outcome="done")
+            logger.info(f"ORDER MODIFIED: {order_id}")
+            notify_waitlist(booking_window(current))
+            return {"status": "success", "message": "Reservation updated", "order": updated, "previous_order": current}
+
+    return {"status": "error", "message": f"Booking {order_id} is being changed by another request, please try again"}
+
+
+def cancel_order(order_id: str, orderer_contact: Optional[str]) -> Dict[str, Any]:
+    """
+    Cancels a reservation and releases its seats. The booking is kept with
+    status 'cancelled'; cancelling it again is reported as success.
+
+    Parameters:
+        order_id (str): Booking to cancel
+        orderer_contact (Optional[str]): Contact number the booking was made with; must match
+
+    Returns:
+        Dict[str, Any]: Result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - order: The cancelled booking, if successful
+            - not_found: True if there is no booking with this order_id and contact number
+            - contact_required: True if no contact number was given
+    """
+
+    logger.info(f"CANCEL REQUEST: {order_id}")
+
+    for _ in range(BOOKING_CHANGE_ATTEMPTS):
+        current = storage.get_order(order_id)
+        problem = contact_check(current, orderer_contact, "booking", order_id)
+        if problem is not None:
+            BOOKING_CHANGES_TOTAL.inc(action="cancel", outcome="not_found")
+            return problem
+        if current.get("status") == CANCELLED_STATUS:
+            return {"status": "success", "message": "Reservation was already cancelled", "order": current}
+
+        window = booking_window(current)
+        with storage.reservations_lock([window] if window is not None else []):
+            if storage.get_order(order_id) != current:
+                continue
+            cancelled = {**current, "status": CANCELLED_STATUS}
+            with STAGE_SECONDS.time(stage="order_persist"):
+                storage.update_order(cancelled)
+            BOOKING_CHANGES_TOTAL.inc(action="cancel", outcome="done")
+            logger.info(f"ORDER CANCELLED: {order_id}")
+            notify_waitlist(window)
+            return {"status": "success", "message": "Reservation cancelled", "order": cancelled}
+
+    return {"status": "error", "message": f"Booking {order_id} is being changed by another request, please try again"}
+
+
+def slot_has_passed(entry: Dict[str, Any]) -> bool:
+    """
+    True once the reservation date and time of a waitlist entry lie in the past.
+    """
+
+    try:
+        return datetime.fromisoformat(f"{entry['reservation_date']}T{entry['reservation_time']}") <= datetime.now()
+    except (KeyError, ValueError):
+        return False
+
+
+def waitlist_position(entry: Dict[str, Any]) -> Optional[int]:
+    """
+    Returns the 1-based place of a waiting entry in the queue of its slot, None when it is no longer waiting.
+    """
+
+    queue = [e["waitlist_id"] for e in storage.waiting_entries(entry["restaurant_id"], entry["reservation_date"])
+             if e["reservation_time"] == entry["reservation_time"]]
+    return queue.index(entry["waitlist_id"]) + 1 if entry["waitlist_id"] in queue else None
+
+
+def notify_waitlist(window: Optional[tuple]) -> None:
+    """
+    Queues a promotion pass for the waitlists that the seats of a freed dining window could serve:
+    every date the window touches, and the day before for late bookings that run past midnight.
+
+    Parameters:
+        window (Optional[tuple]): (restaurant_id, reservation_date, reservation_time, duration) as returned by booking_window
+    """
+
+    if window is None:
+        return
+    restaurant_id, reservation_date, reservation_time, duration = window
+    dates = stay_dates(reservation_date, reservation_time, duration)
+    try:
+        dates.append((date.fromisoformat(reservation_date) - timedelta(days=1)).isoformat())
+    except ValueError:
+        pass
+    waitlist_promoter.notify(restaurant_id, dates)
+
+
+def join_waitlist(order_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Puts a party on the waitlist of a fully booked slot. The party is booked
+    automatically, in order of request, as soon as enough seats free up; a
+    request for a slot that has seats is booked on the next promotion pass.
+    Joining again with the same contact number for the same slot returns the
+    existing entry.
+
+    Parameters:
+        order_info (Dict[str, Any]): Complete reservation details, as for make_new_order
+
+    Returns:
+        Dict[str, Any]: Result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - waitlist_entry: The entry with waitlist_id, status 'waiting' and requested_at, if successful
+            - position: Place in the queue of the slot, if successful
+            - missing_fields, placeholder_fields, invalid_fields: If validation fails
+            - max_booking_party_size: The restaurant's limit, if the party is larger
+    """
+
+    logger.info(f"WAITLIST REQUEST: {order_info}")
+
+    review = review_information_before_order(order_info)
+    if review["status"] == "invalid":
+        return {
+            "status": "error",
+            "message": "Information validation failed",
+            "missing_fields": review.get("missing_fields", []),
+            "placeholder_fields": review.get("placeholder_fields", []),
+            "invalid_fields": review.get("invalid_fields", [])
+        }
+
+    restaurant = catalog.lookup.get(order_info["restaurant_id"])
+    if restaurant is None:
+        return {"status": "error", "message": f"No restaurant found with restaurant_id {order_info['restaurant_id']}"}
+    problem = party_size_limit_check(restaurant, order_info["party_size"])
+    if problem is not None:
+        return problem
+    if order_info["party_size"] > restaurant["restaurant_max_seating_capacity"]:
+        return {"status": "error", "message": f"A party of {order_info['party_size']} exceeds the restaurant's "
+                                              f"{restaurant['restaurant_max_seating_capacity']} seats and can never be seated"}
+    if slot_has_passed(order_info):
+        return {"status": "error", "message": "The requested reservation time has already passed"}
+
+    # The duplicate check and the insert run under the slot lock, so two joins at once cannot both add an entry
+    window = booking_window(order_info)
+    with storage.reservations_lock([window] if window is not None else []):
+        for entry in storage.waiting_entries(order_info["restaurant_id"], order_info["reservation_date"]):
+            if (entry["reservation_time"] == order_info["reservation_time"]
+                    and contact_key(entry.get("orderer_contact")) == contact_key(order_info["orderer_contact"])):
+                return {"status": "success", "message": "Already on the waitlist for this slot", "waitlist_entry": entry,
+                        "position": waitlist_position(entry)}
+
+        entry = storage.add_waitlist_entry({
+            **{field: order_info[field] for field in RESERVATION_FIELDS},
+            "status": WAITING,
+            "requested_at": time.time()
+        })
+    WAITLIST_EVENTS_TOTAL.inc(event="joined")
+    logger.info(f"WAITLIST JOINED: {entry['waitlist_id']} for {entry['restaurant_id']} at {entry['reservation_date']} {entry['reservation_time']}")
+    waitlist_promoter.notify(entry["restaurant_id"], [entry["reservation_date"]])
+    return {
+        "status": "success",
+        "message": "Added to the waitlist; the reservation is made automatically when seats free up",
+        "waitlist_entry": entry,
+        "position": waitlist_position(entry)
+    }
+
+
+def waitlist_status(waitlist_id: str, orderer_contact: Optional[str]) -> Dict[str, Any]:
+    """
+    Reports a waitlist entry: its place in the queue while waiting, the order_id once promoted.
+
+    Parameters:
+        waitlist_id (str): Waitlist ID from join_waitlist
+        orderer_contact (Optional[str]): Contact number used to join the waitlist; must match
+
+    Returns:
+        Dict[str, Any]: Result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - waitlist_entry: The entry; its status is 'waiting', 'promoted' (with order_id), 'expired' or 'left'
+            - position: Place in the queue of the slot while waiting
+            - not_found: True if there is no entry with this waitlist_id and contact number
+            - contact_required: True if no contact number was given
+    """
+
+    entry = storage.get_waitlist_entry(waitlist_id)
+    problem = contact_check(entry, orderer_contact, "waitlist entry", waitlist_id)
+    if problem is not None:
+        return problem
+    result = {"status": "success", "message": f"Waitlist entry is {entry['status']}", "waitlist_entry": entry}
+    if entry["status"] == WAITING:
+        result["position"] = waitlist_position(entry)
+    elif entry["status"] == PROMOTED:
+        result["message"] = f"Seats freed up and the reservation was confirmed as {entry['order_id']}"
+    return result
+
+
+def leave_waitlist(waitlist_id: str, orderer_contact: Optional[str]) -> Dict[str, Any]:
+    """
+    Takes a waiting party off the waitlist. An entry that was already promoted
+    keeps its booking, which cancel_order releases.
+
+    Parameters:
+        waitlist_id (str): Waitlist ID from join_waitlist
+        orderer_contact (Optional[str]): Contact number used to join the waitlist; must match
+
+    Returns:
+        Dict[str, Any]: Result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - waitlist_entry: The entry after the change
+            - not_found: True if there is no entry with this waitlist_id and contact number
+            - contact_required: True if no contact number was given
+    """
+
+    entry = storage.get_waitlist_entry(waitlist_id)
+    problem = contact_check(entry, orderer_contact, "waitlist entry", waitlist_id)
+    if problem is not None:
+        return problem
+
+    window = booking_window(entry)
+    # Taken under the slot lock so a promotion of this entry cannot run at the same time
+    with storage.reservations_lock([window] if window is not None else []):
+        entry = storage.get_waitlist_entry(waitlist_id)
+        if entry["status"] != WAITING:
+            message = (f"Seats had already freed up; the reservation {entry['order_id']} stays booked until it is cancelled"
+                       if entry["status"] == PROMOTED else f"Waitlist entry is already {entry['status']}")
+            return {"status": "error" if entry["status"] == PROMOTED else "success", "message": message, "waitlist_entry": entry}
+        entry = {**entry, "status": LEFT}
+        storage.update_waitlist_entry(entry)
+    WAITLIST_EVENTS_TOTAL.inc(event="left")
+    logger.info(f"WAITLIST LEFT: {waitlist_id}")
+    return {"status": "success", "message": "Removed from the waitlist", "waitlist_entry": entry}
+
+
+def promote_waitlist_entry(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Books a waiting party if its slot now has the seats. The capacity check,
+    the new order and the entry's change to 'promoted' happen under the slot
+    locks (and, with SQLite, in one transaction), like make_new_order.
+    Entries whose slot has passed are marked 'expired'.
+
+    Parameters:
+        entry (Dict[str, Any]): Waiting entry from storage.waiting_entries
+
+    Returns:
+        Optional[Dict[str, Any]]: The confirmed order, or None if the party still does not fit
+    """
+
+    window = booking_window(entry)
+    with storage.reservations_lock([window] if window is not None else []):
+        current = storage.get_waitlist_entry(entry["waitlist_id"])
+        if current is None or current["status"] != WAITING:
+            return None
+        if slot_has_passed(current):
+            storage.update_waitlist_entry({**current, "status": EXPIRED})
+            WAITLIST_EVENTS_TOTAL.inc(event="expired")
+            logger.info(f"WAITLIST EXPIRED: {current['waitlist_id']}")
+            return None
+        if not check_capacity(current["restaurant_id"], current["party_size"], current["reservation_date"],
+                              current["reservation_time"], debug=False):
+            return None
+
+        new_order = {field: current[field] for field in RESERVATION_FIELDS}
+        new_order["order_id"] = storage.next_order_id()
+        new_order["status"] = "confirmed"
+        new_order["waitlist_id"] = current["waitlist_id"]
+        with STAGE_SECONDS.time(stage="order_persist"):
+            storage.add_order(new_order)
+        storage.update_waitlist_entry({**current, "status": PROMOTED, "order_id": new_order["order_id"]})
+
+    BOOKINGS_TOTAL.inc(outcome="confirmed_from_waitlist")
+    WAITLIST_EVENTS_TOTAL.inc(event="promoted")
+    logger.info(f"WAITLIST PROMOTED: {current['waitlist_id']} confirmed as {new_order['order_id']}")
+    return new_order
+
+
+def promote_waitlist(restaurant_id: str, reservation_date: str) -> List[Dict[str, Any]]:
+    """
+    Runs one promotion pass over the waitlist of a restaurant-day. Parties
+    are tried oldest request first; a party too large for the seats left is
+    skipped, so smaller parties behind it are still seated, and keeps its
+    place for the next pass. Once a party does not fit at a time, larger
+    parties at the same time are skipped without another capacity check.
+
+    Parameters:
+        restaurant_id (str): Restaurant whose seats were freed
+        reservation_date (str): Date in YYYY-MM-DD format
+
+    Returns:
+        List[Dict[str, Any]]: Orders confirmed in this pass
+    """
+
+    with STAGE_SECONDS.time(stage="waitlist_promotion"):
+        promoted = []
+        smallest_unseated = {}
+        for entry in storage.waiting_entries(restaurant_id, reservation_date):
+            if (entry["party_size"] >= smallest_unseated.get(entry["reservation_time"], float("inf"))
+                    and not slot_has_passed(entry)):
+                continue
+            order = promote_waitlist_entry(entry)
+            if order is not None:
+                promoted.append(order)
+            else:
+                smallest_unseated[entry["reservation_time"]] = min(entry["party_size"],
+                                                                   smallest_unseated.get(entry["reservation_time"], float("inf")))
+    return promoted
+
+
+def get_availability(restaurant_ids: Optional[List[str]], start_date: Optional[str], days: int = 7, slot_minutes: int = 30,
+                     party_size: Optional[int] = None, include_grid: bool = True) -> Dict[str, Any]:
+    """
+    Computes remaining capacity for restaurants over a range of dates and time slots.
+
+    Parameters:
+        restaurant_ids (Optional[List[str]]): Restaurants to include, all when empty
+        start_date (Optional[str]): First date in YYYY-MM-DD format, today when empty
+        days (int, optional): Number of dates. Defaults to 7.
+        slot_minutes (int, optional): Slot granularity, must divide 24 hours. Defaults to 30.
+        party_size (Optional[int]): Seats needed for a slot to be listed as available. Defaults to 1.
+        include_grid (bool, optional): If True, includes the full remaining-seats grid. Defaults to True.
+
+    Returns:
+        Dict[str, Any]: Availability result containing:
+            - status: 'success' or 'error'
+            - message: Human readable result description
+            - dates, slot_times: Grid axes
+            - restaurants: Per restaurant available_slots ({date: [times]}) and, optionally, remaining[date][slot]
+    """
+
+    logger.info(f"AVAILABILITY REQUEST: {restaurant_ids} from {start_date} for {days} days every {slot_minutes} minutes")
+
+    try:
+        first_date = date.fromisoformat(start_date) if start_date else date.today()
+    except ValueError:
+        return {"status": "error", "message": "start_date must be in YYYY-MM-DD format"}
+    if MINUTES_PER_DAY % slot_minutes:
+        return {"status": "error", "message": "slot_minutes must divide 24 hours evenly"}
+
+    snapshot = catalog
+    if restaurant_ids:
+        restaurants = [snapshot.lookup[rid] for rid in dict.fromkeys(restaurant_ids) if rid in snapshot.lookup]
+        if not restaurants:
+            return {"status": "error", "message": f"No restaurants found for ids {restaurant_ids}"}
+    else:
+        restaurants = snapshot.restaurants
+
+    dates = [(first_date + timedelta(days=offset)).isoformat() for offset in range(days)]
+    with STAGE_SECONDS.time(stage="availability_grid"):
+        grid = build_availability_grid(restaurants, first_date, days, slot_minutes, storage.occupancy_for_dates(dates))
+    remaining = grid["remaining"]
+    fits = remaining >= (party_size or 1)
+
+    results = []
+    for row, restaurant in enumerate(restaurants):
+        day_rows, slot_cols = fits[row].nonzero()
+        available_slots: Dict[str, List[str]] = {}
+        for day_row, slot_col in zip(day_rows.tolist(), slot_cols.tolist()):
+            available_slots.setdefault(grid["dates"][day_row], []).append(grid["slot_times"][slot_col])
+        result = {
+            "restaurant_id": restaurant["restaurant_id"],
+            "name": restaurant.get("name"),
+            "available_slots": available_slots
+        }
+        if include_grid:
+            result["remaining"] = remaining[row].tolist()
+        results.append(result)
+
+    return {
+        "status": "success",
+        "message": f"Availability for {len(restaurants)} restaurants over {days} days",
+        "party_size": party_size or 1,
+        "slot_minutes": slot_minutes,
+        "dates": grid["dates"],
+        "slot_times": grid["slot_times"],
+        "restaurants": results
     }
 
 
 @app.post("/restaurants/search")
-async def api_search_restaurants(query: RestaurantQuery):
+def api_search_restaurants(query: RestaurantQuery):
     """
     API endpoint for searching restaurants based on query parameters.
+    Declared sync so FastAPI runs it in its threadpool; a search that misses
+    the cache is CPU work that would otherwise block the event loop.
 
     Parameters:
         query (RestaurantQuery): Search criteria in Pydantic model format
 
     Returns:
-        JSON response with search results
+        JSON response with search results, served from the search cache when the
+        same normalized query was answered recently for the current catalog version
+    """
+    query_dict = query.dict()
+    key = search_cache_key(query_dict)
+    version = catalog.version
+    body = search_cache.get(key, version)
+    if body is None:
+        body = encode_search_response(query_dict)
+        search_cache.put(key, version, body)
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/restaurants/search/batch")
+def api_search_restaurants_batch(batch: BatchRestaurantQuery):
+    """
+    API endpoint for running several restaurant searches in one request.
+    Sync for the same reason as api_search_restaurants.
+
+    Parameters:
+        batch (BatchRestaurantQuery): Search queries keyed by ID, or a list of queries
+
+    Returns:
+        JSON response {"results": {query_id: search result}}; each result is
+        served from the search cache when available
+    """
+    if isinstance(batch.queries, list):
+        queries = {str(position): query.dict() for position, query in enumerate(batch.queries)}
+    else:
+        queries = {query_id: query.dict() for query_id, query in batch.queries.items()}
+
+    version = catalog.version
+    keys = {query_id: search_cache_key(query) for query_id, query in queries.items()}
+    bodies = {query_id: search_cache.get(key, version) for query_id, key in keys.items()}
+    field_rows_cache: Dict = {}
+    for query_id, body in bodies.items():
+        if body is None:
+            bodies[query_id] = encode_search_response(queries[query_id], field_rows_cache)
+            search_cache.put(keys[query_id], version, bodies[query_id])
+
+    parts = [encode_json(query_id) + b":" + bodies[query_id] for query_id in queries]
+    return Response(content=b'{"results":{' + b",".join(parts) + b"}}", media_type="application/json")
+
+
+@app.get("/restaurants/search/cache")
+async def api_search_cache_stats():
+    """
+    API endpoint exposing search cache counters (hits, misses, evictions, ...).
+
+    Returns:
+        JSON response with cache counters and the current catalog version
+    """
+    return {**search_cache.stats(), "catalog_version": catalog.version}
+
+
+@app.get("/metrics")
+async def api_metrics():
+    """
+    API endpoint exposing request latency histograms, internal stage timings,
+    booking outcomes, catalog / booking sizes and search cache counters in the
+    Prometheus text format.
+
+    Returns:
+        Plain-text metrics exposition (one process's numbers when running several workers)
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.post("/admin/catalog/reload")
+def api_reload_catalog(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    API endpoint that reloads restaurant_list.json without a restart.
+    Declared sync so the rebuild runs in FastAPI's threadpool while other
+    requests keep being served from the current catalog.
+
+    Parameters:
+        x_admin_token (Optional[str]): Must match GOODFOODS_ADMIN_TOKEN when that is set
+
+    Returns:
+        JSON response with the new catalog version
+    Raises:
+        HTTPException: 403 for a wrong admin token, 400 if the new catalog is invalid
     """
-    results = search_restaurant_information(query.dict())
-    return results
+
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    result = reload_catalog()
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result)
+    return result
 
 
 @app.post("/reservations")
-async def api_make_reservation(reservation: Reservation):
+def api_make_reservation(reservation: Reservation, response: Response,
+                         idempotency_key: Optional[str] = Header(default=None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH)):
     """
     API endpoint for creating new restaurant reservations.
+    Declared sync so FastAPI runs it in its threadpool; slot locks taken by
+    make_new_order then never block the event loop.
+
+    Parameters:
+        reservation (Reservation): Reservation details in Pydantic model format
+        idempotency_key (Optional[str]): Idempotency-Key header; retries with the same key get the original response
+
+    Returns:
+        JSON response with reservation result, with an Idempotent-Replayed: true header for replays
+    Raises:
+        HTTPException: 400 status code if reservation cannot be completed,
+        409 if the idempotency key was used for different reservation details
+    """
+
+    result = make_new_order(reservation.dict(), idempotency_key=idempotency_key)
+    replay_headers = {"Idempotent-Replayed": "true"} if result.get("idempotent_replay") else None
+    if result.get("idempotency_conflict"):
+        raise HTTPException(status_code=409, detail=result)
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result, headers=replay_headers)
+    if replay_headers:
+        response.headers.update(replay_headers)
+    return result
+
+
+@app.get("/reservations")
+def api_find_reservations(order_id: Optional[str] = None, orderer_contact: Optional[str] = None):
+    """
+    API endpoint for looking up bookings by order ID and contact number, or by contact number alone.
+
+    Parameters:
+        order_id (Optional[str]): Order ID query parameter
+        orderer_contact (Optional[str]): Contact number query parameter, required with order_id
+
+    Returns:
+        JSON response with the matching bookings
+    Raises:
+        HTTPException: 404 if nothing matches, 400 if the contact number is missing
+    """
+
+    result = find_orders(order_id, orderer_contact)
+    if result["status"] == "error":
+        raise HTTPException(status_code=404 if result.get("not_found") else 400, detail=result)
+    return result
+
+
+@app.get("/reservations/{order_id}")
+def api_get_reservation(order_id: str, orderer_contact: Optional[str] = None):
+    """
+    API endpoint for fetching one booking.
+
+    Parameters:
+        order_id (str): Order ID path parameter
+        orderer_contact (Optional[str]): Contact number the booking was made with, required
+
+    Returns:
+        JSON response with the booking in orders
+    Raises:
+        HTTPException: 404 if there is no such booking, 400 if the contact number is missing
+    """
+
+    return api_find_reservations(order_id=order_id, orderer_contact=orderer_contact)
+
+
+@app.patch("/reservations/{order_id}")
+def api_modify_reservation(order_id: str, update: ReservationUpdate, orderer_contact: Optional[str] = None):
+    """
+    API endpoint for changing the time, date, party size, restaurant or contact details of a booking.
+    Declared sync so the slot locks taken by modify_order never block the event loop.
+
+    Parameters:
+        order_id (str): Order ID path parameter
+        update (ReservationUpdate): Fields to change; its orderer_contact is the new contact number
+        orderer_contact (Optional[str]): Query parameter, the contact number the booking was made with; required
+
+    Returns:
+        JSON response with the updated booking
+    Raises:
+        HTTPException: 404 if there is no such booking, 400 if it cannot be changed
+    """
+
+    changes = update.dict()
+    capacity_debug = changes.pop("capacity_debug")
+    result = modify_order(order_id, orderer_contact, changes, capacity_debug)
+    if result["status"] == "error":
+        raise HTTPException(status_code=404 if result.get("not_found") else 400, detail=result)
+    return result
+
+
+@app.delete("/reservations/{order_id}")
+def api_cancel_reservation(order_id: str, orderer_contact: Optional[str] = None):
+    """
+    API endpoint for cancelling a booking and releasing its seats.
+
+    Parameters:
+        order_id (str): Order ID path parameter
+        orderer_contact (Optional[str]): Contact number the booking was made with; required
+
+    Returns:
+        JSON response with the cancelled booking
+    Raises:
+        HTTPException: 404 if there is no such booking, 400 if the contact number is missing
+    """
+
+    result = cancel_order(order_id, orderer_contact)
+    if result["status"] == "error":
+        raise HTTPException(status_code=404 if result.get("not_found") else 400, detail=result)
+    return result
+
+
+@app.post("/waitlist")
+def api_join_waitlist(reservation: Reservation):
+    """
+    API endpoint for waiting on a fully booked slot; the reservation is made when seats free up.
 
     Parameters:
         reservation (Reservation): Reservation details in Pydantic model format
 
     Returns:
-        JSON response with reservation result
+        JSON response with the waitlist entry and its position
     Raises:
-        HTTPException: 400 status code if reservation cannot be completed
+        HTTPException: 400 status code if the party cannot join the waitlist
     """
 
-    result = make_new_order(reservation.dict())
+    result = join_waitlist(reservation.dict())
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result)
     return result
 
 
+@app.get("/waitlist/{waitlist_id}")
+def api_waitlist_status(waitlist_id: str, orderer_contact: Optional[str] = None):
+    """
+    API endpoint for the status of a waitlist entry.
+
+    Parameters:
+        waitlist_id (str): Waitlist ID path parameter
+        orderer_contact (Optional[str]): Contact number used to join the waitlist; required
+
+    Returns:
+        JSON response with the entry, its position while waiting and its order_id once promoted
+    Raises:
+        HTTPException: 404 if there is no such entry, 400 if the contact number is missing
+    """
+
+    result = waitlist_status(waitlist_id, orderer_contact)
+    if result["status"] == "error":
+        raise HTTPException(status_code=404 if result.get("not_found") else 400, detail=result)
+    return result
+
+
+@app.delete("/waitlist/{waitlist_id}")
+def api_leave_waitlist(waitlist_id: str, orderer_contact: Optional[str] = None):
+    """
+    API endpoint for leaving the waitlist.
+
+    Parameters:
+        waitlist_id (str): Waitlist ID path parameter
+        orderer_contact (Optional[str]): Contact number used to join the waitlist; required
+
+    Returns:
+        JSON response with the entry
+    Raises:
+        HTTPException: 404 if there is no such entry, 400 if it was already promoted to a booking
+    """
+
+    result = leave_waitlist(waitlist_id, orderer_contact)
+    if result["status"] == "error":
+        raise HTTPException(status_code=404 if result.get("not_found") else 400, detail=result)
+    return result
+
+
+@app.post("/availability")
+def api_availability(query: AvailabilityQuery):
+    """
+    API endpoint for the remaining-capacity grid across restaurants, dates and time slots.
+
+    Parameters:
+        query (AvailabilityQuery): Restaurants, date range and slot granularity
+
+    Returns:
+        JSON response with availability per restaurant
+    Raises:
+        HTTPException: 400 status code if the query is invalid
+    """
+
+    result = get_availability(query.restaurant_ids, query.start_date, query.days, query.slot_minutes,
+                              query.party_size, query.include_grid)
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result)
+    # Returned as a response so the large grid skips FastAPI's per-value jsonable_encoder pass
+    return FastJSONResponse(result)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
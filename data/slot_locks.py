@@ -0,0 +1,67 @@
+"""
+Per-slot locks for reservation writes.
+Two bookings for the same (restaurant_id, reservation_date, reservation_time)
+serialize on one lock while bookings for other slots proceed in parallel.
+"""
+
+#Basic imports
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, List
+
+#All Functions Available
+# SlotLocks() - table of reference-counted locks keyed by slot
+# SlotLocks.hold(*slots) - context manager acquiring the locks of one or more slots
+
+
+class SlotLocks:
+    """
+    Table of locks keyed by slot. Locks are created on first use and dropped
+    once no thread holds or waits for them, so the table only grows with the
+    number of slots being booked concurrently.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: Dict[Hashable, List] = {}
+
+    def _checkout(self, slot: Hashable) -> threading.Lock:
+        with self._guard:
+            entry = self._locks.get(slot)
+            if entry is None:
+                entry = self._locks[slot] = [threading.Lock(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def _checkin(self, slot: Hashable) -> None:
+        with self._guard:
+            entry = self._locks[slot]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[slot]
+
+    @contextmanager
+    def hold(self, *slots: Hashable) -> Iterator[None]:
+        """
+        Acquires the locks for the given slots in sorted order, so callers
+        holding several slots at once cannot deadlock each other.
+
+        Parameters:
+            *slots (Hashable): Slot keys, e.g. (restaurant_id, reservation_date, reservation_time)
+        """
+
+        acquired = []
+        try:
+            for slot in sorted(set(slots)):
+                lock = self._checkout(slot)
+                try:
+                    lock.acquire()
+                except BaseException:
+                    self._checkin(slot)
+                    raise
+                acquired.append((slot, lock))
+            yield
+        finally:
+            for slot, lock in reversed(acquired):
+                lock.release()
+                self._checkin(slot)
@@ -0,0 +1,863 @@
+"""
+Pluggable storage for the restaurant catalog and bookings.
+The JSON backend keeps everything in memory on top of the booking journal,
+with hash indexes for booking lookups; the SQLite backend keeps both tables
+in a WAL-mode database file that several processes can share. Both also hold
+the waitlist of fully booked slots. The JSON files remain the import/export
+format.
+
+Usage:
+   python -m data.storage_backend export --db data/goodfoods.db --out exported/
+   python -m data.storage_backend import --db data/goodfoods.db --src data/
+"""
+
+#Basic imports
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Internal imports
+from data.booking_journal import BookingJournal
+from data.booking_index import BookingIndex, contact_key
+from data.capacity_ledger import CapacityLedger, CANCELLED_STATUS
+from data.idempotency import IdempotencyTable, DEFAULT_IDEMPOTENCY_MAX_ENTRIES, DEFAULT_IDEMPOTENCY_TTL_SECONDS
+from data.slot_locks import SlotLocks
+from data.waitlist import WaitlistQueue, WAITING, PROMOTED, format_waitlist_id
+from data.schedule import DEFAULT_DINING_DURATION_MINUTES, dining_duration, parse_hhmm, split_by_day
+
+#Global Variables
+RESTAURANTS_FILE = 'restaurant_list.json'
+BOOKINGS_FILE = 'bookings_list.json'
+JOURNAL_FILE = 'bookings_journal.jsonl'
+WAITLIST_FILE = 'waitlist.json'
+WAITLIST_JOURNAL_FILE = 'waitlist_journal.jsonl'
+SQLITE_FILE = 'goodfoods.db'
+ORDER_ID_PATTERN = re.compile(r"^ord(\d+)$")
+IDEMPOTENCY_PRUNE_EVERY = 100
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS restaurants (
+    position INTEGER PRIMARY KEY,
+    restaurant_id TEXT NOT NULL UNIQUE,
+    restaurant_max_seating_capacity INTEGER NOT NULL,
+    max_booking_party_size INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL UNIQUE,
+    restaurant_id TEXT NOT NULL,
+    orderer_contact TEXT,
+    contact_key TEXT,
+    party_size INTEGER NOT NULL,
+    reservation_date TEXT NOT NULL,
+    reservation_time TEXT NOT NULL,
+    status TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_slot ON bookings (restaurant_id, reservation_date, reservation_time);
+CREATE INDEX IF NOT EXISTS idx_bookings_contact ON bookings (orderer_contact);
+CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings (reservation_date);
+CREATE TABLE IF NOT EXISTS order_sequence (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    idempotency_key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_created ON idempotency_keys (created_at);
+CREATE TABLE IF NOT EXISTS waitlist (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    waitlist_id TEXT UNIQUE,
+    restaurant_id TEXT NOT NULL,
+    reservation_date TEXT NOT NULL,
+    reservation_time TEXT NOT NULL,
+    status TEXT NOT NULL,
+    requested_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_waitlist_queue ON waitlist (restaurant_id, reservation_date, status, requested_at);
+"""
+
+#All Functions Available
+# StorageBackend - interface shared by the storage implementations
+# JsonStorageBackend(data_dir, ...) - in-memory tables persisted through the booking journal
+# SqliteStorageBackend(db_path, seed_dir, ...) - WAL-mode SQLite database
+# create_storage_backend(backend, data_dir, sqlite_path, idempotency_max_entries, idempotency_ttl_seconds)
+# stay_windows_lock_keys(windows) -> (restaurant_id, date) slot keys of several dining windows
+# read_restaurant_file(data_dir)
+# format_order_id(number) / highest_order_number(order_ids)
+# read_json_tables(data_dir) / write_json_tables(data_dir, restaurants, orders)
+# stay_dates(reservation_date, reservation_time, duration) -> dates a dining window touches
+
+
+def read_restaurant_file(data_dir: str) -> List[Dict[str, Any]]:
+    """
+    Reads restaurant_list.json from data_dir.
+
+    Parameters:
+        data_dir (str): Directory holding restaurant_list.json
+
+    Returns:
+        List[Dict[str, Any]]: Restaurant catalog, empty if the file is missing
+    """
+
+    try:
+        with open(os.path.join(data_dir, RESTAURANTS_FILE), 'r') as f:
+            restaurants: List[Dict[str, Any]] = json.load(f)
+        logger.info(f"Successfully loaded {RESTAURANTS_FILE}")
+    except FileNotFoundError:
+        logger.error(f"Error: {RESTAURANTS_FILE} not found")
+        restaurants = []
+    return restaurants
+
+
+def format_order_id(number: int) -> str:
+    """
+    Formats an order number as an order ID, e.g. 7 -> 'ord007', 1234 -> 'ord1234'.
+    """
+
+    return f"ord{number:03d}"
+
+
+def highest_order_number(order_ids: Iterable[str]) -> int:
+    """
+    Finds the largest number used by existing 'ordNNN' order IDs.
+
+    Parameters:
+        order_ids (Iterable[str]): Existing order IDs
+
+    Returns:
+        int: Highest order number, 0 if there are none
+    """
+
+    numbers = [int(match.group(1)) for match in map(ORDER_ID_PATTERN.match, (i or "" for i in order_ids)) if match]
+    return max(numbers, default=0)
+
+
+def stay_dates(reservation_date: str, reservation_time: str, duration: int) -> List[str]:
+    """
+    Lists the dates a dining window occupies seats on (two when it crosses midnight).
+
+    Parameters:
+        reservation_date (str): Date of reservation in YYYY-MM-DD format
+        reservation_time (str): Time of reservation in HH:MM format
+        duration (int): Dining duration in minutes
+
+    Returns:
+        List[str]: Dates in YYYY-MM-DD format
+    """
+
+    return [piece_date for piece_date, _, _ in split_by_day(reservation_date, parse_hhmm(reservation_time), duration)]
+
+
+def stay_windows_lock_keys(windows: Iterable[Tuple[str, str, str, int]]) -> List[Tuple[str, str]]:
+    """
+    Lists the (restaurant_id, date) slot lock keys of several dining windows.
+
+    Parameters:
+        windows (Iterable[Tuple[str, str, str, int]]): (restaurant_id, reservation_date, reservation_time, duration) windows
+
+    Returns:
+        List[Tuple[str, str]]: Slot keys, possibly repeated
+    """
+
+    return [(restaurant_id, d) for restaurant_id, reservation_date, reservation_time, duration in windows
+            for d in stay_dates(reservation_date, reservation_time, duration)]
+
+
+def read_json_tables(data_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Reads the catalog and bookings from the JSON files in data_dir.
+
+    Parameters:
+        data_dir (str): Directory holding restaurant_list.json and bookings_list.json
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: {"restaurants": [...], "orders": [...]}
+    """
+
+    journal = BookingJournal(os.path.join(data_dir, BOOKINGS_FILE), os.path.join(data_dir, JOURNAL_FILE))
+    return {"restaurants": read_restaurant_file(data_dir), "orders": journal.load()}
+
+
+def write_json_tables(data_dir: str, restaurants: List[Dict[str, Any]], orders: List[Dict[str, Any]]) -> None:
+    """
+    Writes the catalog and bookings to JSON files in data_dir.
+
+    Parameters:
+        data_dir (str): Target directory, created if missing
+        restaurants (List[Dict[str, Any]]): Restaurant catalog
+        orders (List[Dict[str, Any]]): Confirmed orders
+    """
+
+    os.makedirs(data_dir, exist_ok=True)
+    for file_name, rows in ((RESTAURANTS_FILE, restaurants), (BOOKINGS_FILE, orders)):
+        with open(os.path.join(data_dir, file_name), 'w') as f:
+            json.dump(rows, f, indent=2)
+    logger.info(f"Exported {len(restaurants)} restaurants and {len(orders)} orders to {data_dir}")
+
+
+class StorageBackend:
+    """
+    Interface for catalog and booking storage.
+    """
+
+    def load_restaurants(self) -> List[Dict[str, Any]]:
+        """
+        Returns the full restaurant catalog in catalog order.
+        """
+        raise NotImplementedError
+
+    def list_orders(self) -> List[Dict[str, Any]]:
+        """
+        Returns every stored order in write order.
+        """
+        raise NotImplementedError
+
+    def order_count(self) -> int:
+        """
+        Returns the number of stored orders.
+        """
+        raise NotImplementedError
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored order with this order_id, or None.
+        """
+        raise NotImplementedError
+
+    def orders_for_contact(self, contact: str) -> List[Dict[str, Any]]:
+        """
+        Returns the orders placed with a contact number (compared by contact_key), oldest first.
+        """
+        raise NotImplementedError
+
+    def peak_seats(self, restaurant_id: str, reservation_date: str, reservation_time: str, duration: int,
+                   excluding: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Returns the most seats in use at any minute of a dining window,
+        counting every booking whose own dining window overlaps it except
+        the stored order passed as excluding.
+        """
+        raise NotImplementedError
+
+    def occupancy_for_dates(self, reservation_dates: List[str]) -> CapacityLedger:
+        """
+        Returns a ledger whose occupancy() is complete for the given dates
+        and the day after each of them.
+        """
+        raise NotImplementedError
+
+    def reservation_lock(self, restaurant_id: str, reservation_date: str, reservation_time: str, duration: int):
+        """
+        Context manager that makes a capacity check and the following
+        add_order atomic for every restaurant date the dining window touches.
+        """
+        return self.reservations_lock([(restaurant_id, reservation_date, reservation_time, duration)])
+
+    def reservations_lock(self, windows: List[Tuple[str, str, str, int]]):
+        """
+        reservation_lock over several (restaurant_id, reservation_date, reservation_time, duration)
+        windows at once, e.g. the old and new window of a modified order.
+        """
+        raise NotImplementedError
+
+    def next_order_id(self) -> str:
+        """
+        Returns a new order ID that has never been handed out before.
+        """
+        raise NotImplementedError
+
+    def add_order(self, order: Dict[str, Any]) -> None:
+        """
+        Persists a confirmed order.
+        """
+        raise NotImplementedError
+
+    def update_order(self, order: Dict[str, Any]) -> None:
+        """
+        Replaces the stored order with the same order_id (modified or cancelled),
+        releasing the seats of the old version and holding those of the new one.
+        """
+        raise NotImplementedError
+
+    def idempotent_result(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Returns (request fingerprint, response) stored under an idempotency key, or None when unknown or expired.
+        """
+        raise NotImplementedError
+
+    def save_idempotent_result(self, key: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        """
+        Stores the response for an idempotency key; a live stored response is never overwritten.
+        Inside reservation_lock it is written together with the order.
+        """
+        raise NotImplementedError
+
+    def add_waitlist_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stores a new waitlist entry and returns it with its assigned waitlist_id.
+        """
+        raise NotImplementedError
+
+    def get_waitlist_entry(self, waitlist_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the waitlist entry with this waitlist_id, or None.
+        """
+        raise NotImplementedError
+
+    def update_waitlist_entry(self, entry: Dict[str, Any]) -> None:
+        """
+        Replaces the stored waitlist entry with the same waitlist_id, e.g. once it was promoted.
+        """
+        raise NotImplementedError
+
+    def waiting_entries(self, restaurant_id: str, reservation_date: str) -> List[Dict[str, Any]]:
+        """
+        Returns the entries still waiting for a restaurant-day, in queue order (oldest request first).
+        """
+        raise NotImplementedError
+
+    def waitlist_days(self) -> List[Tuple[str, str]]:
+        """
+        Returns the (restaurant_id, reservation_date) pairs that have waiting entries.
+        """
+        raise NotImplementedError
+
+    def replace_restaurants(self, restaurants: List[Dict[str, Any]]) -> None:
+        """
+        Replaces the stored catalog, e.g. after restaurant_list.json was edited.
+        Existing bookings are kept and re-counted with the new dining durations.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases files or connections held by the backend.
+        """
+
+
+class JsonStorageBackend(StorageBackend):
+    """
+    Keeps both tables in memory. Orders are persisted through the append-only
+    booking journal and capacity is answered from the per-minute occupancy ledger.
+    Bookings are found through hash indexes on order_id and contact number that
+    every write updates. Idempotency keys live in memory only and are forgotten on restart.
+    The waitlist is a priority queue per slot, persisted through its own journal.
+    """
+
+    def __init__(self, data_dir: str, idempotency_max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES,
+                 idempotency_ttl_seconds: float = DEFAULT_IDEMPOTENCY_TTL_SECONDS):
+        self.restaurants = read_restaurant_file(data_dir)
+        self.durations = {r["restaurant_id"]: dining_duration(r) for r in self.restaurants}
+        self.journal = BookingJournal(os.path.join(data_dir, BOOKINGS_FILE), os.path.join(data_dir, JOURNAL_FILE))
+        self.orders: List[Dict[str, Any]] = self.journal.load()
+        self.index = BookingIndex(self.orders)
+        self.ledger = CapacityLedger(self.orders, self.duration_for)
+        self._ledger_lock = threading.Lock()
+        self.slot_locks = SlotLocks()
+        self._order_id_lock = threading.Lock()
+        self._last_order_number = highest_order_number(order.get("order_id") for order in self.orders)
+        self.idempotency = IdempotencyTable(idempotency_max_entries, idempotency_ttl_seconds)
+        self.waitlist_journal = BookingJournal(os.path.join(data_dir, WAITLIST_FILE), os.path.join(data_dir, WAITLIST_JOURNAL_FILE),
+                                               key_field="waitlist_id", record_field="entry", snapshot_required=False)
+        self.waitlist = WaitlistQueue(self.waitlist_journal.load())
+        # A promotion writes the order before the entry; finish one interrupted in between
+        if len(self.waitlist):
+            for order in self.orders:
+                entry = self.waitlist.get(order.get("waitlist_id"))
+                if entry is not None and entry.get("status") == WAITING:
+                    self.update_waitlist_entry({**entry, "status": PROMOTED, "order_id": order["order_id"]})
+
+    def duration_for(self, restaurant_id: str) -> int:
+        return self.durations.get(restaurant_id, DEFAULT_DINING_DURATION_MINUTES)
+
+    def load_restaurants(self) -> List[Dict[str, Any]]:
+        return self.restaurants
+
+    def list_orders(self) -> List[Dict[str, Any]]:
+        return list(self.orders)
+
+    def order_count(self) -> int:
+        return len(self.orders)
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        return self.index.get(order_id)
+
+    def orders_for_contact(self, contact: str) -> List[Dict[str, Any]]:
+        return self.index.for_contact(contact)
+
+    def peak_seats(self, restaurant_id: str, reservation_date: str, reservation_time: str, duration: int,
+                   excluding: Optional[Dict[str, Any]] = None) -> int:
+        return self.ledger.peak_seats(restaurant_id, reservation_date, reservation_time, duration, excluding)
+
+    def occupancy_for_dates(self, reservation_dates: List[str]) -> CapacityLedger:
+        return self.ledger
+
+    def reservations_lock(self, windows: List[Tuple[str, str, str, int]]):
+        return self.slot_locks.hold(*stay_windows_lock_keys(windows))
+
+    def next_order_id(self) -> str:
+        with self._order_id_lock:
+            self._last_order_number += 1
+            return format_order_id(self._last_order_number)
+
+    def add_order(self, order: Dict[str, Any]) -> None:
+        # Journal first: when the write fails, memory still matches the files and the order was never booked.
+        # Compacting under the same lock keeps every journaled order in the snapshot it truncates to.
+        with self._ledger_lock:
+            self.journal.append({"op": "create", "order": order})
+            self.orders.append(order)
+            self.index.add(order)
+            self.ledger.add(order)
+            if self.journal.compaction_due:
+                self.journal.compact(self.orders)
+
+    def update_order(self, order: Dict[str, Any]) -> None:
+        with self._ledger_lock:
+            if self.index.get(order["order_id"]) is None:
+                raise KeyError(order["order_id"])
+            self.journal.append({"op": "update", "order": order})
+            previous = self.index.replace(order)
+            self.ledger.remove(previous)
+            self.ledger.add(order)
+            if self.journal.compaction_due:
+                self.journal.compact(self.orders)
+
+    def idempotent_result(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        return self.idempotency.get(key)
+
+    def save_idempotent_result(self, key: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        self.idempotency.put(key, fingerprint, response)
+
+    def add_waitlist_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self.waitlist.add(entry)
+        self._journal_waitlist("create", entry)
+        return entry
+
+    def get_waitlist_entry(self, waitlist_id: str) -> Optional[Dict[str, Any]]:
+        return self.waitlist.get(waitlist_id)
+
+    def update_waitlist_entry(self, entry: Dict[str, Any]) -> None:
+        if self.waitlist.get(entry["waitlist_id"]) is None:
+            raise KeyError(entry["waitlist_id"])
+        self.waitlist.update(entry)
+        self._journal_waitlist("update", entry)
+
+    def _journal_waitlist(self, op: str, entry: Dict[str, Any]) -> None:
+        self.waitlist_journal.append({"op": op, "entry": entry})
+        if self.waitlist_journal.compaction_due:
+            self.waitlist_journal.compact(self.waitlist.entries())
+
+    def waiting_entries(self, restaurant_id: str, reservation_date: str) -> List[Dict[str, Any]]:
+        return self.waitlist.waiting(restaurant_id, reservation_date)
+
+    def waitlist_days(self) -> List[Tuple[str, str]]:
+        return self.waitlist.days()
+
+    def replace_restaurants(self, restaurants: List[Dict[str, Any]]) -> None:
+        durations = {r["restaurant_id"]: dining_duration(r) for r in restaurants}
+        with self._ledger_lock:
+            self.restaurants = restaurants
+            if durations != self.durations:
+                # Occupancy depends on dining durations; rebuild it from every stored order
+                self.durations = durations
+                self.ledger = CapacityLedger(self.orders, self.duration_for)
+
+    def close(self) -> None:
+        self.journal.close()
+        self.waitlist_journal.close()
+
+
+class SqliteStorageBackend(StorageBackend):
+    """
+    Stores both tables in an SQLite database in WAL mode.
+
+    Each thread gets its own connection; WAL lets readers proceed while a
+    writer commits, and the database file can be shared by several processes.
+    A reservation runs inside a BEGIN IMMEDIATE transaction, which holds the
+    database write lock from the capacity check until the order is committed.
+    Restaurants and orders keep their full JSON payload next to the indexed
+    columns used for lookups. Capacity checks load the bookings of the
+    surrounding dates and rebuild their per-minute occupancy. An empty
+    database is seeded from the JSON files in seed_dir. Bookings are looked up
+    through the order_id and contact_key indexes. Idempotency keys are
+    a table too, so every worker process sees them, and expired or surplus
+    keys are pruned every IDEMPOTENCY_PRUNE_EVERY writes. Waitlist entries are
+    a table whose index returns a restaurant-day's queue in request order.
+    """
+
+    def __init__(self, db_path: str, seed_dir: str = None, idempotency_max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES,
+                 idempotency_ttl_seconds: float = DEFAULT_IDEMPOTENCY_TTL_SECONDS):
+        self.db_path = db_path
+        self._local = threading.local()
+        self.slot_locks = SlotLocks()
+        self.idempotency_max_entries = idempotency_max_entries
+        self.idempotency_ttl_seconds = idempotency_ttl_seconds
+        self._idempotency_writes = 0
+
+        conn = self._connection()
+        conn.executescript(SQLITE_SCHEMA)
+        self._migrate_contact_key()
+        if seed_dir is not None:
+            self._seed_if_empty(seed_dir)
+        self._init_order_sequence()
+        self.durations = {r["restaurant_id"]: dining_duration(r) for r in self.load_restaurants()}
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the calling thread's connection, opening it on first use.
+        """
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _seed_if_empty(self, seed_dir: str) -> None:
+        """
+        Imports the JSON tables when the database has no restaurants yet.
+        """
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT COUNT(*) FROM restaurants").fetchone()[0] == 0:
+                tables = read_json_tables(seed_dir)
+                self._insert_restaurants(conn, tables["restaurants"])
+                for order in tables["orders"]:
+                    self._insert_order(conn, order)
+                logger.info(f"Seeded {self.db_path} with {len(tables['restaurants'])} restaurants and {len(tables['orders'])} orders")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _migrate_contact_key(self) -> None:
+        """
+        Adds and fills the contact_key column in databases created before it existed.
+        """
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(bookings)")}
+            if "contact_key" not in columns:
+                conn.execute("ALTER TABLE bookings ADD COLUMN contact_key TEXT")
+                rows = conn.execute("SELECT seq, orderer_contact FROM bookings").fetchall()
+                conn.executemany("UPDATE bookings SET contact_key = ? WHERE seq = ?",
+                                 [(contact_key(contact), seq) for seq, contact in rows])
+                logger.info(f"Added contact_key to {len(rows)} bookings in {self.db_path}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_contact_key ON bookings (contact_key)")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _init_order_sequence(self) -> None:
+        """
+        Starts the order sequence after the highest order ID already stored.
+        """
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT COUNT(*) FROM order_sequence").fetchone()[0] == 0:
+                order_ids = (order_id for (order_id,) in conn.execute("SELECT order_id FROM bookings"))
+                conn.execute("INSERT INTO order_sequence (id, value) VALUES (0, ?)", (highest_order_number(order_ids),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _insert_restaurants(conn: sqlite3.Connection, restaurants: List[Dict[str, Any]]) -> None:
+        conn.executemany(
+            "INSERT INTO restaurants (position, restaurant_id, restaurant_max_seating_capacity, max_booking_party_size, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (position, r["restaurant_id"], r["restaurant_max_seating_capacity"], r.get("max_booking_party_size"), json.dumps(r))
+                for position, r in enumerate(restaurants)
+            ]
+        )
+
+    @staticmethod
+    def _insert_order(conn: sqlite3.Connection, order: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT INTO bookings (order_id, restaurant_id, orderer_contact, contact_key, party_size, reservation_date, reservation_time, status, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (order["order_id"], order["restaurant_id"], order.get("orderer_contact"), contact_key(order.get("orderer_contact")),
+             order["party_size"], order["reservation_date"], order["reservation_time"], order.get("status"), json.dumps(order))
+        )
+
+    def load_restaurants(self) -> List[Dict[str, Any]]:
+        rows = self._connection().execute("SELECT payload FROM restaurants ORDER BY position").fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def list_orders(self) -> List[Dict[str, Any]]:
+        rows = self._connection().execute("SELECT payload FROM bookings ORDER BY seq").fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def order_count(self) -> int:
+        return self._connection().execute("SELECT COALESCE(MAX(seq), 0) FROM bookings").fetchone()[0]
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT payload FROM bookings WHERE order_id = ?", (order_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def orders_for_contact(self, contact: str) -> List[Dict[str, Any]]:
+        key = contact_key(contact)
+        if not key:
+            return []
+        rows = self._connection().execute("SELECT payload FROM bookings WHERE contact_key = ? ORDER BY seq", (key,)).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def duration_for(self, restaurant_id: str) -> int:
+        return self.durations.get(restaurant_id, DEFAULT_DINING_DURATION_MINUTES)
+
+    def _ledger_for(self, reservation_dates: Iterable[str], restaurant_id: str = None) -> CapacityLedger:
+        """
+        Builds an occupancy ledger from the bookings on the given dates and the
+        day before each, since a late booking spills past midnight.
+        """
+
+        dates = set()
+        for reservation_date in reservation_dates:
+            dates.add(reservation_date)
+            try:
+                dates.add((date.fromisoformat(reservation_date) - timedelta(days=1)).isoformat())
+            except ValueError:
+                pass
+        if not dates:
+            return CapacityLedger((), self.duration_for)
+
+        placeholders = ", ".join("?" for _ in dates)
+        sql = ("SELECT restaurant_id, reservation_date, reservation_time, party_size FROM bookings "
+               f"WHERE reservation_date IN ({placeholders}) AND (status IS NULL OR status != ?)")
+        params = list(dates) + [CANCELLED_STATUS]
+        if restaurant_id is not None:
+            sql += " AND restaurant_id = ?"
+            params.append(restaurant_id)
+        rows = self._connection().execute(sql, params).fetchall()
+        orders = (
+            {"restaurant_id": rid, "reservation_date": d, "reservation_time": t, "party_size": seats}
+            for rid, d, t, seats in rows
+        )
+        return CapacityLedger(orders, self.duration_for)
+
+    def peak_seats(self, restaurant_id: str, reservation_date: str, reservation_time: str, duration: int,
+                   excluding: Optional[Dict[str, Any]] = None) -> int:
+        ledger = self._ledger_for(stay_dates(reservation_date, reservation_time, duration), restaurant_id)
+        return ledger.peak_seats(restaurant_id, reservation_date, reservation_time, duration, excluding)
+
+    def occupancy_for_dates(self, reservation_dates: List[str]) -> CapacityLedger:
+        following = []
+        for reservation_date in reservation_dates:
+            try:
+                following.append((date.fromisoformat(reservation_date) + timedelta(days=1)).isoformat())
+            except ValueError:
+                pass
+        return self._ledger_for(list(reservation_dates) + following)
+
+    @contextmanager
+    def reservations_lock(self, windows: List[Tuple[str, str, str, int]]) -> Iterator[None]:
+        with self.slot_locks.hold(*stay_windows_lock_keys(windows)):
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def next_order_id(self) -> str:
+        number = self._connection().execute(
+            "UPDATE order_sequence SET value = value + 1 WHERE id = 0 RETURNING value"
+        ).fetchone()[0]
+        return format_order_id(number)
+
+    def add_order(self, order: Dict[str, Any]) -> None:
+        self._insert_order(self._connection(), order)
+
+    def update_order(self, order: Dict[str, Any]) -> None:
+        # Capacity is rebuilt from the bookings table on every check, so updating the row releases and re-reserves seats
+        updated = self._connection().execute(
+            "UPDATE bookings SET restaurant_id = ?, orderer_contact = ?, contact_key = ?, party_size = ?, "
+            "reservation_date = ?, reservation_time = ?, status = ?, payload = ? WHERE order_id = ?",
+            (order["restaurant_id"], order.get("orderer_contact"), contact_key(order.get("orderer_contact")), order["party_size"],
+             order["reservation_date"], order["reservation_time"], order.get("status"), json.dumps(order), order["order_id"])
+        ).rowcount
+        if not updated:
+            raise KeyError(order["order_id"])
+
+    def idempotent_result(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        row = self._connection().execute(
+            "SELECT fingerprint, response FROM idempotency_keys WHERE idempotency_key = ? AND created_at > ?",
+            (key, time.time() - self.idempotency_ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def save_idempotent_result(self, key: str, fingerprint: str, response: Dict[str, Any]) -> None:
+        conn = self._connection()
+        now = time.time()
+        # An expired row under the same key is replaced, a live one is kept
+        conn.execute(
+            "INSERT INTO idempotency_keys (idempotency_key, fingerprint, response, created_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (idempotency_key) DO UPDATE SET fingerprint = excluded.fingerprint, "
+            "response = excluded.response, created_at = excluded.created_at WHERE created_at <= ?",
+            (key, fingerprint, json.dumps(response), now, now - self.idempotency_ttl_seconds)
+        )
+        self._idempotency_writes += 1
+        if self._idempotency_writes % IDEMPOTENCY_PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM idempotency_keys WHERE created_at <= ?", (now - self.idempotency_ttl_seconds,))
+            conn.execute(
+                "DELETE FROM idempotency_keys WHERE idempotency_key IN "
+                "(SELECT idempotency_key FROM idempotency_keys ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.idempotency_max_entries,)
+            )
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Runs the block in a BEGIN IMMEDIATE transaction, or in the caller's one when already inside reservations_lock.
+        """
+
+        conn = self._connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def add_waitlist_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with self._write_transaction() as conn:
+            seq = conn.execute(
+                "INSERT INTO waitlist (restaurant_id, reservation_date, reservation_time, status, requested_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?) RETURNING seq",
+                (entry["restaurant_id"], entry["reservation_date"], entry["reservation_time"], entry["status"],
+                 entry["requested_at"], json.dumps(entry))
+            ).fetchone()[0]
+            entry = {**entry, "waitlist_id": format_waitlist_id(seq)}
+            conn.execute("UPDATE waitlist SET waitlist_id = ?, payload = ? WHERE seq = ?",
+                         (entry["waitlist_id"], json.dumps(entry), seq))
+        return entry
+
+    def get_waitlist_entry(self, waitlist_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT payload FROM waitlist WHERE waitlist_id = ?", (waitlist_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update_waitlist_entry(self, entry: Dict[str, Any]) -> None:
+        with self._write_transaction() as conn:
+            updated = conn.execute("UPDATE waitlist SET status = ?, payload = ? WHERE waitlist_id = ?",
+                                   (entry["status"], json.dumps(entry), entry["waitlist_id"])).rowcount
+        if not updated:
+            raise KeyError(entry["waitlist_id"])
+
+    def waiting_entries(self, restaurant_id: str, reservation_date: str) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT payload FROM waitlist WHERE restaurant_id = ? AND reservation_date = ? AND status = ? "
+            "ORDER BY requested_at, seq",
+            (restaurant_id, reservation_date, WAITING)
+        ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def waitlist_days(self) -> List[Tuple[str, str]]:
+        rows = self._connection().execute(
+            "SELECT DISTINCT restaurant_id, reservation_date FROM waitlist WHERE status = ?", (WAITING,)).fetchall()
+        return [(restaurant_id, reservation_date) for restaurant_id, reservation_date in rows]
+
+    def replace_restaurants(self, restaurants: List[Dict[str, Any]]) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM restaurants")
+            self._insert_restaurants(conn, restaurants)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.durations = {r["restaurant_id"]: dining_duration(r) for r in restaurants}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_storage_backend(backend: str, data_dir: str, sqlite_path: str = None,
+                           idempotency_max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES,
+                           idempotency_ttl_seconds: float = DEFAULT_IDEMPOTENCY_TTL_SECONDS) -> StorageBackend:
+    """
+    Builds the configured storage backend.
+
+    Parameters:
+        backend (str): 'json' or 'sqlite'
+        data_dir (str): Directory holding the JSON files (data or seed data)
+        sqlite_path (str, optional): Database file for the sqlite backend. Defaults to data_dir/goodfoods.db.
+        idempotency_max_entries (int, optional): Most idempotency keys kept
+        idempotency_ttl_seconds (float, optional): How long a stored idempotent response is replayed
+
+    Returns:
+        StorageBackend: Ready-to-use storage backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+
+    if backend == "json":
+        return JsonStorageBackend(data_dir, idempotency_max_entries, idempotency_ttl_seconds)
+    if backend == "sqlite":
+        return SqliteStorageBackend(sqlite_path or os.path.join(data_dir, SQLITE_FILE), seed_dir=data_dir,
+                                    idempotency_max_entries=idempotency_max_entries,
+                                    idempotency_ttl_seconds=idempotency_ttl_seconds)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import or export the GoodFoods SQLite store as JSON files")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("--db", required=True, help="SQLite database file")
+    parser.add_argument("--src", help="Directory with restaurant_list.json and bookings_list.json to seed an empty database from")
+    parser.add_argument("--out", help="Directory to export the JSON files into")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "import":
+        if not args.src:
+            parser.error("import requires --src")
+        store = SqliteStorageBackend(args.db, seed_dir=args.src)
+    else:
+        if not args.out:
+            parser.error("export requires --out")
+        store = SqliteStorageBackend(args.db)
+        write_json_tables(args.out, store.load_restaurants(), store.list_orders())
+    store.close()
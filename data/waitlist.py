@@ -0,0 +1,243 @@
+"""
+Waitlist for fully booked slots.
+Parties that could not be seated wait per (restaurant_id, reservation_date,
+reservation_time) slot in a priority queue ordered by request time. When seats
+free up (a cancellation, a modification or a larger catalog capacity) a
+background promoter re-checks the affected restaurant-days and books every
+waiting party that now fits, oldest request first, skipping parties too
+large for the seats left so smaller ones behind them can still be seated.
+"""
+
+#Basic imports
+import heapq
+import re
+import threading
+from typing import List, Dict, Any, Tuple, Iterable, Callable, Optional, Set
+
+# Setting up Basic Logging
+import logging
+logger = logging.getLogger('goodfoods.api')
+
+#Global Variables
+WAITING = "waiting"
+PROMOTED = "promoted"
+EXPIRED = "expired"
+LEFT = "left"
+WAITLIST_ID_PATTERN = re.compile(r"^wl(\d+)$")
+
+#All Functions Available
+# format_waitlist_id(number) / highest_waitlist_number(waitlist_ids)
+# queue_priority(entry) -> sort key of a waiting entry
+# WaitlistQueue(entries) - in-memory priority queue per slot
+# WaitlistQueue.add(entry) / get(waitlist_id) / update(entry) / waiting(restaurant_id, reservation_date) / days() / entries()
+# WaitlistPromoter(promote, waiting_days, sweep_seconds) - background thread running promotions
+# WaitlistPromoter.notify(restaurant_id, reservation_dates) - queue restaurant-days for a promotion pass
+
+
+def format_waitlist_id(number: int) -> str:
+    """
+    Formats a waitlist number as a waitlist ID, e.g. 7 -> 'wl007'.
+    """
+
+    return f"wl{number:03d}"
+
+
+def highest_waitlist_number(waitlist_ids: Iterable[str]) -> int:
+    """
+    Finds the largest number used by existing 'wlNNN' waitlist IDs, 0 if there are none.
+    """
+
+    numbers = [int(match.group(1)) for match in (WAITLIST_ID_PATTERN.match(str(i)) for i in waitlist_ids) if match]
+    return max(numbers, default=0)
+
+
+def queue_priority(entry: Dict[str, Any]) -> Tuple[float, int]:
+    """
+    Returns the queue order of an entry: earlier requests first, ties by waitlist number.
+    """
+
+    match = WAITLIST_ID_PATTERN.match(str(entry.get("waitlist_id")))
+    return entry["requested_at"], int(match.group(1)) if match else 0
+
+
+class WaitlistQueue:
+    """
+    Waitlist entries in memory, with a heap of waiting entries per slot.
+
+    Entries that stop waiting (promoted, expired, left) stay retrievable by
+    waitlist_id and are dropped from their heap lazily.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # (restaurant_id, reservation_date) -> reservation_time -> heap of (priority, waitlist_id)
+        self._slots: Dict[Tuple[str, str], Dict[str, List[Tuple[Tuple[float, int], str]]]] = {}
+        for entry in entries:
+            self._store(entry)
+        self._last_number = highest_waitlist_number(self._entries)
+
+    def _store(self, entry: Dict[str, Any]) -> None:
+        previous = self._entries.get(entry["waitlist_id"])
+        self._entries[entry["waitlist_id"]] = entry
+        if entry.get("status") == WAITING and (previous is None or previous.get("status") != WAITING):
+            day = self._slots.setdefault((entry["restaurant_id"], entry["reservation_date"]), {})
+            heapq.heappush(day.setdefault(entry["reservation_time"], []), (queue_priority(entry), entry["waitlist_id"]))
+
+    def add(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queues a new entry, assigning its waitlist_id.
+
+        Parameters:
+            entry (Dict[str, Any]): Reservation details with requested_at and status 'waiting'
+
+        Returns:
+            Dict[str, Any]: The stored entry
+        """
+
+        with self._lock:
+            self._last_number += 1
+            entry = {**entry, "waitlist_id": format_waitlist_id(self._last_number)}
+            self._store(entry)
+            return entry
+
+    def get(self, waitlist_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(waitlist_id)
+
+    def update(self, entry: Dict[str, Any]) -> None:
+        """
+        Replaces a stored entry, e.g. after it was promoted or left the queue.
+        """
+
+        with self._lock:
+            self._store(entry)
+
+    def _waiting_heap(self, day: Dict[str, List], reservation_time: str) -> List:
+        """
+        Drops entries that stopped waiting from the top of a slot's heap. Caller holds the lock.
+        """
+
+        heap = day[reservation_time]
+        heap[:] = [item for item in heap if self._entries[item[1]].get("status") == WAITING]
+        heapq.heapify(heap)
+        if not heap:
+            del day[reservation_time]
+        return heap
+
+    def waiting(self, restaurant_id: str, reservation_date: str) -> List[Dict[str, Any]]:
+        """
+        Returns the waiting entries of a restaurant-day across all its slots, in queue order.
+        """
+
+        with self._lock:
+            day = self._slots.get((restaurant_id, reservation_date))
+            if not day:
+                return []
+            heaps = [sorted(self._waiting_heap(day, reservation_time)) for reservation_time in list(day)]
+            if not day:
+                del self._slots[(restaurant_id, reservation_date)]
+            return [self._entries[waitlist_id] for _, waitlist_id in heapq.merge(*heaps)]
+
+    def days(self) -> List[Tuple[str, str]]:
+        """
+        Returns the (restaurant_id, reservation_date) pairs with waiting entries.
+        """
+
+        with self._lock:
+            return [key for key, day in self._slots.items()
+                    if any(self._entries[waitlist_id].get("status") == WAITING for heap in day.values() for _, waitlist_id in heap)]
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Returns every entry, waiting or not, in the order they joined.
+        """
+
+        with self._lock:
+            return list(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class WaitlistPromoter:
+    """
+    Background thread that runs promote(restaurant_id, reservation_date) for
+    restaurant-days queued with notify(), so requests that free seats return
+    without waiting for the promotions. Every sweep_seconds it also queues
+    every restaurant-day that has waiting entries, which picks up seats freed
+    by other worker processes and expires entries whose slot has passed.
+    Errors raised by promote are logged and the promoter keeps running.
+    """
+
+    def __init__(self, promote: Callable[[str, str], Any], waiting_days: Callable[[], Iterable[Tuple[str, str]]],
+                 sweep_seconds: float = 30.0):
+        self.promote = promote
+        self.waiting_days = waiting_days
+        self.sweep_seconds = sweep_seconds
+        self._pending: Set[Tuple[str, str]] = set()
+        self._wakeup = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, restaurant_id: str, reservation_dates: Iterable[str]) -> None:
+        """
+        Queues restaurant-days for a promotion pass and returns immediately.
+        """
+
+        with self._wakeup:
+            self._pending.update((restaurant_id, reservation_date) for reservation_date in reservation_dates)
+            self._wakeup.notify()
+
+    def start(self) -> None:
+        """
+        Starts the promoter in a daemon thread.
+        """
+
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="waitlist-promoter", daemon=True)
+        self._thread.start()
+        logger.info(f"Waitlist promoter started (sweep every {self.sweep_seconds}s)")
+
+    def stop(self) -> None:
+        """
+        Stops the promoter and waits for the current pass to finish.
+        """
+
+        with self._wakeup:
+            self._stopped = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def run_pending(self) -> int:
+        """
+        Runs the promotion pass of every queued restaurant-day in the calling thread.
+
+        Returns:
+            int: Restaurant-days processed
+        """
+
+        with self._wakeup:
+            pending, self._pending = self._pending, set()
+        for restaurant_id, reservation_date in sorted(pending):
+            try:
+                self.promote(restaurant_id, reservation_date)
+            except Exception as e:
+                logger.error(f"Waitlist promotion failed for {restaurant_id} on {reservation_date}: {e}")
+        return len(pending)
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                if not self._pending and not self._stopped:
+                    if not self._wakeup.wait(self.sweep_seconds if self.sweep_seconds > 0 else None) and self.sweep_seconds > 0:
+                        try:
+                            self._pending.update(self.waiting_days())
+                        except Exception as e:
+                            logger.error(f"Waitlist sweep failed: {e}")
+                if self._stopped:
+                    return
+            self.run_pending()
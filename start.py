@@ -8,6 +8,12 @@ then launches the Streamlit interface as the main process.
 
 Usage:
    python start.py
+   python start.py --workers 4            # API in 4 worker processes sharing one SQLite store
+   python start.py --workers 4 --api-only # API only, no Streamlit
+
+With more than one worker every process has its own memory, so bookings are
+kept in the SQLite store (GOODFOODS_STORAGE=sqlite is set automatically) whose
+write lock serializes capacity checks and bookings across all workers.
 
 Dependencies:
    - uvicorn
@@ -16,17 +22,32 @@ Dependencies:
 """
 
 #Basic imports
+import argparse
 import subprocess
+import sys
 import threading
 import time
 import webbrowser
 import os
 
-def start_fastapi_server():
+def prepare_shared_store():
+    """Switch to the SQLite store for multi-worker mode and seed it once, before the workers start"""
+    storage_backend = os.environ.setdefault("GOODFOODS_STORAGE", "sqlite")
+    if storage_backend != "sqlite":
+        sys.exit(f"--workers needs the sqlite storage backend, GOODFOODS_STORAGE is {storage_backend}")
+
+    from data.storage_backend import create_storage_backend
+    data_dir = os.getenv("GOODFOODS_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+    create_storage_backend("sqlite", data_dir, os.getenv("GOODFOODS_SQLITE_PATH")).close()
+
+def start_fastapi_server(workers=1):
     """Start the FastAPI server in a separate process"""
     try:
-        print("Starting FastAPI server...")
-        subprocess.Popen(["uvicorn", "data.service_api:app", "--host", "0.0.0.0", "--port", "8000"])
+        print(f"Starting FastAPI server with {workers} worker(s)...")
+        command = ["uvicorn", "data.service_api:app", "--host", "0.0.0.0", "--port", "8000"]
+        if workers > 1:
+            command += ["--workers", str(workers)]
+        return subprocess.Popen(command)
     except Exception as e:
         print(f"Error starting FastAPI server: {e}")
         return None
@@ -41,8 +62,23 @@ def start_streamlit_app():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start the GoodFoods API and chat UI")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("GOODFOODS_WORKERS", "1")),
+                        help="API worker processes (0 = one per CPU core)")
+    parser.add_argument("--api-only", action="store_true", help="Run only the API server, without Streamlit")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    os.environ["GOODFOODS_WORKERS"] = str(workers)
+    if workers > 1:
+        prepare_shared_store()
+
+    if args.api_only:
+        api_process = start_fastapi_server(workers)
+        sys.exit(api_process.wait() if api_process else 1)
+
     # Start FastAPI in a separate thread
-    api_thread = threading.Thread(target=start_fastapi_server)
+    api_thread = threading.Thread(target=start_fastapi_server, args=(workers,))
     api_thread.daemon = True
     api_thread.start()
     
@@ -0,0 +1,95 @@
+"""
+Shared fixtures for the API tests.
+The API module reads its configuration from the environment when it is
+imported, so the environment is set here, before any test imports it: a
+temporary copy of the data directory, with the catalog watcher, the waitlist
+sweep and the rate limits turned off. Every test that uses the API runs once
+per storage backend, each time against a fresh copy of the seed data.
+"""
+
+#Basic imports
+import itertools
+import os
+from datetime import date, timedelta
+import shutil
+import sys
+import tempfile
+
+#Third party imports
+import pytest
+
+#Global Variables
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_FILES = ("restaurant_list.json", "bookings_list.json")
+STORAGE_BACKENDS = ("json", "sqlite")
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="goodfoods-tests-")
+
+for seed_file in SEED_FILES:
+    shutil.copy(os.path.join(REPO_DIR, "data", seed_file), TEST_DATA_DIR)
+os.environ.update({
+    "GOODFOODS_DATA_DIR": TEST_DATA_DIR,
+    "GOODFOODS_STORAGE": "sqlite",
+    "GOODFOODS_CATALOG_WATCH_SECONDS": "0",
+    "GOODFOODS_WAITLIST_SWEEP_SECONDS": "0",
+    "GOODFOODS_SEARCH_RATE": "0",
+    "GOODFOODS_WRITE_RATE": "0",
+})
+sys.path.insert(0, REPO_DIR)
+
+#Internal imports
+from data.storage_backend import create_storage_backend
+
+# Each booking gets its own day, so tests never compete for the same seats
+_booking_days = itertools.count(1)
+
+
+def copy_seed_files(directory):
+    for seed_file in SEED_FILES:
+        shutil.copy(os.path.join(REPO_DIR, "data", seed_file), directory)
+    return str(directory)
+
+
+@pytest.fixture(scope="session")
+def service_api():
+    import data.service_api as service_api
+    yield service_api
+    service_api.storage.close()
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(params=STORAGE_BACKENDS)
+def api(request, service_api, tmp_path_factory, monkeypatch):
+    """
+    The API module, with its storage swapped for a fresh backend of each kind.
+    """
+
+    storage = create_storage_backend(request.param, copy_seed_files(tmp_path_factory.mktemp(request.param)))
+    monkeypatch.setattr(service_api, "storage", storage)
+    yield service_api
+    storage.close()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """
+    A fresh copy of the seed catalog and bookings.
+    """
+
+    return copy_seed_files(tmp_path)
+
+
+@pytest.fixture
+def order_info(api):
+    """
+    Complete reservation details for a party of 2 at the first restaurant of the catalog.
+    """
+
+    restaurant = api.catalog.restaurants[0]
+    return {
+        "restaurant_id": restaurant["restaurant_id"],
+        "orderer_name": "Asha Rao",
+        "orderer_contact": "9845012377",
+        "party_size": 2,
+        "reservation_date": (date(2027, 1, 1) + timedelta(days=next(_booking_days))).isoformat(),
+        "reservation_time": "19:00",
+    }
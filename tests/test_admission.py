@@ -0,0 +1,60 @@
+"""
+Tests for admission control as seen through the API.
+"""
+
+#Third party imports
+from fastapi.testclient import TestClient
+
+#Internal imports
+from data.admission import TokenBucketLimiter, client_identity
+
+
+def test_rate_limited_request_is_labelled_with_its_route(api, monkeypatch):
+    # One request per client, then the bucket is empty for a long time
+    monkeypatch.setitem(api.rate_limiters, api.WRITE_PRIORITY, TokenBucketLimiter(0.001, 1))
+    client = TestClient(api.app, headers={"X-Client-Id": "metrics-label-test"})
+    path = "/reservations/{order_id}"
+    rejected_before = api.REQUESTS_TOTAL.value(method="DELETE", path=path, status="429")
+
+    client.delete("/reservations/ord-missing-1")
+    response = client.delete("/reservations/ord-missing-2")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"]
+    assert api.REQUESTS_TOTAL.value(method="DELETE", path=path, status="429") == rejected_before + 1
+    assert api.REQUESTS_TOTAL.value(method="DELETE", path="unmatched", status="429") == 0
+
+
+def scope_from(peer, headers):
+    return {"client": (peer, 50000), "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]}
+
+
+def test_client_id_from_an_untrusted_address_is_ignored():
+    scope = scope_from("203.0.113.7", {"x-client-id": "made-up"})
+
+    assert client_identity(scope, trusted_proxies={"127.0.0.1"}) == "ip:203.0.113.7"
+
+
+def test_client_id_from_a_trusted_proxy_is_used():
+    scope = scope_from("127.0.0.1", {"x-client-id": "session-1"})
+
+    assert client_identity(scope, trusted_proxies={"127.0.0.1"}) == "id:session-1"
+
+
+def test_client_id_needs_the_right_shared_secret():
+    with_secret = scope_from("203.0.113.7", {"x-client-id": "session-1", "x-client-secret": "s3cret"})
+    wrong_secret = scope_from("203.0.113.7", {"x-client-id": "session-1", "x-client-secret": "guess"})
+
+    assert client_identity(with_secret, shared_secret="s3cret") == "id:session-1"
+    assert client_identity(wrong_secret, shared_secret="s3cret") == "ip:203.0.113.7"
+    assert client_identity(with_secret) == "ip:203.0.113.7"
+
+
+def test_new_client_ids_do_not_escape_the_rate_limit(api, monkeypatch):
+    monkeypatch.setitem(api.rate_limiters, api.WRITE_PRIORITY, TokenBucketLimiter(0.001, 1))
+    client = TestClient(api.app)
+
+    statuses = [client.delete("/reservations/ord-missing", headers={"X-Client-Id": f"id-{attempt}"}).status_code
+                for attempt in range(3)]
+
+    assert statuses[1:] == [429, 429]
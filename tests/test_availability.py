@@ -0,0 +1,102 @@
+"""
+Tests for the availability grid.
+"""
+
+#Basic imports
+from datetime import date, timedelta
+
+#Third party imports
+import numpy as np
+import pytest
+
+#Internal imports
+from data.availability_grid import build_availability_grid
+from data.capacity_ledger import CapacityLedger
+from data.schedule import MINUTES_PER_DAY, WEEKDAYS, dining_duration, format_hhmm, opening_minutes
+
+
+RESTAURANTS = [
+    {"restaurant_id": "r001", "restaurant_max_seating_capacity": 20, "dining_duration_minutes": 90,
+     "operating_hours": {"open": "11:00", "close": "23:00"}, "operating_days": WEEKDAYS},
+    {"restaurant_id": "r002", "restaurant_max_seating_capacity": 12, "dining_duration_minutes": 150,
+     "operating_hours": {"open": "18:00", "close": "02:00"}, "operating_days": ["Friday", "Saturday"]},
+    {"restaurant_id": "r003", "restaurant_max_seating_capacity": 8,
+     "operating_hours": {"open": "00:00", "close": "00:00"}, "operating_days": ["Sunday"]},
+]
+
+
+def is_open(restaurant, day, minute):
+    """
+    Reference: open in today's session, or in the part of yesterday's session that runs past midnight.
+    """
+
+    open_minute, close_minute = opening_minutes(restaurant["operating_hours"])
+    today, yesterday = WEEKDAYS[day.weekday()], WEEKDAYS[(day.weekday() - 1) % 7]
+    return ((today in restaurant["operating_days"] and open_minute <= minute < close_minute) or
+            (yesterday in restaurant["operating_days"] and minute + MINUTES_PER_DAY < close_minute))
+
+
+def random_orders(generator, first_date, count):
+    return [{
+        "order_id": f"ord{500 + number}",
+        "restaurant_id": str(generator.choice(["r001", "r002", "r003"])),
+        "party_size": int(generator.integers(1, 7)),
+        "reservation_date": (first_date + timedelta(days=int(generator.integers(-1, 4)))).isoformat(),
+        "reservation_time": format_hhmm(int(generator.choice([0, 60, 690, 1080, 1200, 1290, 1380, 1425]))),
+    } for number in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_grid_matches_a_capacity_check_per_slot(seed):
+    generator = np.random.default_rng(seed)
+    # 2027-01-01 is a Friday, so the grid covers late weekend sessions
+    first_date = date(2027, 1, 1)
+    durations = {r["restaurant_id"]: dining_duration(r) for r in RESTAURANTS}
+    ledger = CapacityLedger(random_orders(generator, first_date, 80), durations.get)
+
+    grid = build_availability_grid(RESTAURANTS, first_date, 3, 30, ledger)
+
+    assert grid["remaining"].shape == (3, 3, 48)
+    for row, restaurant in enumerate(RESTAURANTS):
+        for col, grid_date in enumerate(grid["dates"]):
+            for slot, slot_time in enumerate(grid["slot_times"]):
+                minute = slot * 30
+                expected = 0
+                if is_open(restaurant, date.fromisoformat(grid_date), minute):
+                    booked = ledger.peak_seats(restaurant["restaurant_id"], grid_date, slot_time, durations[restaurant["restaurant_id"]])
+                    expected = max(restaurant["restaurant_max_seating_capacity"] - booked, 0)
+                assert grid["remaining"][row, col, slot] == expected, (restaurant["restaurant_id"], grid_date, slot_time)
+
+
+def test_booking_takes_seats_from_the_slots_it_overlaps(api, order_info):
+    restaurant = api.catalog.lookup[order_info["restaurant_id"]]
+    before = api.get_availability([restaurant["restaurant_id"]], order_info["reservation_date"], days=1)
+    api.make_new_order({**order_info, "party_size": 6})
+
+    after = api.get_availability([restaurant["restaurant_id"]], order_info["reservation_date"], days=1)
+
+    slot_times = after["slot_times"]
+    changed = [slot_times[slot] for slot, (old, new) in enumerate(zip(before["restaurants"][0]["remaining"][0],
+                                                                        after["restaurants"][0]["remaining"][0])) if old != new]
+    booked_minute = int(order_info["reservation_time"][:2]) * 60
+    duration = dining_duration(restaurant)
+    assert changed == [slot_times[slot] for slot in range(len(slot_times))
+                       if booked_minute - duration < slot * 30 < booked_minute + duration]
+    assert all(old - new == 6 for old, new in zip(before["restaurants"][0]["remaining"][0], after["restaurants"][0]["remaining"][0])
+               if old != new)
+
+
+def test_slots_too_small_for_the_party_are_left_out(api, order_info):
+    result = api.get_availability([order_info["restaurant_id"]], order_info["reservation_date"], days=1,
+                                  party_size=5, include_grid=False)
+
+    assert "remaining" not in result["restaurants"][0]
+    full = api.get_availability([order_info["restaurant_id"]], order_info["reservation_date"], days=1)
+    expected = [time for time, seats in zip(full["slot_times"], full["restaurants"][0]["remaining"][0]) if seats >= 5]
+    assert result["restaurants"][0]["available_slots"].get(order_info["reservation_date"], []) == expected
+
+
+def test_bad_requests_are_rejected(api):
+    assert api.get_availability(None, "17/10/2026")["status"] == "error"
+    assert api.get_availability(None, "2027-01-01", slot_minutes=7)["status"] == "error"
+    assert api.get_availability(["R001"], "2027-01-01")["status"] == "error"
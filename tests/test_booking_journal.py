@@ -0,0 +1,140 @@
+"""
+Tests for the append-only booking journal.
+"""
+
+#Basic imports
+import json
+import os
+
+#Third party imports
+import pytest
+
+#Internal imports
+from data.booking_journal import BookingJournal
+from data.storage_backend import JsonStorageBackend
+
+
+class FailingFile:
+    """
+    Journal file that writes only the first half of a line, then fails like a full disk.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, text):
+        self.file.write(text[:len(text) // 2])
+        self.file.flush()
+        raise OSError("No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+@pytest.fixture
+def journal_paths(tmp_path):
+    snapshot_path = os.path.join(tmp_path, "bookings_list.json")
+    with open(snapshot_path, 'w') as f:
+        f.write("[]")
+    return snapshot_path, os.path.join(tmp_path, "bookings_journal.jsonl")
+
+
+def test_failed_append_leaves_no_partial_line(journal_paths):
+    journal = BookingJournal(*journal_paths)
+    journal.append({"op": "create", "order": {"order_id": "ord001"}})
+    journal._file = FailingFile(journal._file)
+
+    with pytest.raises(OSError):
+        journal.append({"op": "create", "order": {"order_id": "ord002"}})
+    journal.append({"op": "create", "order": {"order_id": "ord003"}})
+    journal.close()
+
+    assert [order["order_id"] for order in BookingJournal(*journal_paths).load()] == ["ord001", "ord003"]
+
+
+def order(order_id, **changes):
+    return {"order_id": order_id, "party_size": 2, **changes}
+
+
+def test_journal_is_replayed_over_the_snapshot(journal_paths):
+    snapshot_path, journal_path = journal_paths
+    with open(snapshot_path, 'w') as f:
+        json.dump([order("ord001"), order("ord002")], f)
+    journal = BookingJournal(*journal_paths)
+    journal.load()
+    journal.append({"op": "create", "order": order("ord003")})
+    journal.append({"op": "update", "order": order("ord001", party_size=6)})
+    # Already in the snapshot: replaying it again must not add a second copy
+    journal.append({"op": "create", "order": order("ord002")})
+    journal.close()
+
+    assert BookingJournal(*journal_paths).load() == [order("ord001", party_size=6), order("ord002"), order("ord003")]
+
+
+def test_torn_last_line_is_skipped(journal_paths):
+    journal = BookingJournal(*journal_paths)
+    journal.append({"op": "create", "order": order("ord001")})
+    journal.close()
+    with open(journal_paths[1], 'a') as f:
+        f.write('{"op": "create", "order": {"order_id": "ord0')
+
+    assert BookingJournal(*journal_paths).load() == [order("ord001")]
+
+
+def test_fsync_waits_for_a_full_batch(journal_paths, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    journal = BookingJournal(*journal_paths, fsync_batch_size=3, fsync_interval_seconds=3600)
+
+    for number in range(1, 6):
+        journal.append({"op": "create", "order": order(f"ord00{number}")})
+
+    assert len(synced) == 1
+    journal.sync()
+    assert len(synced) == 2
+    journal.sync()
+    assert len(synced) == 2
+    journal.close()
+
+
+def test_compaction_moves_the_journal_into_the_snapshot(journal_paths):
+    snapshot_path, journal_path = journal_paths
+    journal = BookingJournal(*journal_paths, compact_every=3)
+    orders = journal.load()
+    for number in range(1, 4):
+        orders.append(order(f"ord00{number}"))
+        journal.append({"op": "create", "order": orders[-1]})
+    assert journal.compaction_due
+
+    journal.compact(orders)
+
+    assert not journal.compaction_due
+    assert os.path.getsize(journal_path) == 0
+    with open(snapshot_path) as f:
+        assert json.load(f) == orders
+    journal.append({"op": "update", "order": order("ord002", party_size=4)})
+    journal.close()
+
+    assert BookingJournal(*journal_paths).load() == [order("ord001"), order("ord002", party_size=4), order("ord003")]
+
+
+def test_json_backend_restarts_with_the_same_orders_after_compaction(data_dir):
+    storage = JsonStorageBackend(data_dir)
+    storage.journal.compact_every = 4
+    for number in range(10):
+        storage.add_order({"order_id": f"ord{900 + number}", "restaurant_id": "r001", "orderer_name": "Asha Rao",
+                           "orderer_contact": "9845012377", "party_size": 2, "reservation_date": "2027-03-01",
+                           "reservation_time": f"{10 + number}:00", "status": "confirmed"})
+    storage.update_order({**storage.get_order("ord905"), "status": "cancelled"})
+    orders = storage.list_orders()
+    seats = [storage.peak_seats("r001", "2027-03-01", f"{hour}:00", 60) for hour in range(10, 20)]
+    storage.close()
+
+    with open(os.path.join(data_dir, "bookings_journal.jsonl")) as f:
+        assert len(f.readlines()) < 11
+    reloaded = JsonStorageBackend(data_dir)
+
+    assert reloaded.list_orders() == orders
+    assert reloaded.get_order("ord905")["status"] == "cancelled"
+    assert [reloaded.peak_seats("r001", "2027-03-01", f"{hour}:00", 60) for hour in range(10, 20)] == seats
+    reloaded.close()
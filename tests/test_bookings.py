@@ -0,0 +1,205 @@
+"""
+Tests for creating, looking up, modifying and cancelling bookings.
+"""
+
+#Basic imports
+from datetime import date
+
+#Third party imports
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+#Internal imports
+from data.capacity_ledger import CapacityLedger, CANCELLED_STATUS
+from data.schedule import MINUTES_PER_DAY, parse_hhmm
+from data.storage_backend import create_storage_backend
+
+
+def test_unknown_restaurant_is_not_offered_the_waitlist(api, order_info):
+    result = api.make_new_order({**order_info, "restaurant_id": "R001"})
+
+    assert result["status"] == "error"
+    assert result["restaurant_not_found"] is True
+    assert "waitlist_available" not in result
+
+
+def test_booking_cannot_move_to_an_unknown_restaurant(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+
+    result = api.modify_order(order_id, order_info["orderer_contact"], {"restaurant_id": "R001"})
+
+    assert result["status"] == "error"
+    assert result["restaurant_not_found"] is True
+    assert api.storage.get_order(order_id)["restaurant_id"] == order_info["restaurant_id"]
+
+
+def test_malformed_reservation_date_is_rejected(api, order_info):
+    for reservation_date in ("17/10/2026", "2026-02-30", "2026-1-5"):
+        result = api.make_new_order({**order_info, "reservation_date": reservation_date})
+
+        assert result["status"] == "error"
+        assert result["invalid_fields"] == ["reservation_date"]
+
+
+def test_party_size_below_one_is_rejected(api, order_info):
+    for party_size in (0, -2):
+        result = api.make_new_order({**order_info, "party_size": party_size})
+
+        assert result["status"] == "error"
+        assert result["invalid_fields"] == ["party_size"]
+        assert result["missing_fields"] == []
+
+
+def test_modification_with_invalid_values_leaves_the_booking_unchanged(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+
+    bad_date = api.modify_order(order_id, order_info["orderer_contact"], {"reservation_date": "31-12-2026"})
+    bad_party_size = api.modify_order(order_id, order_info["orderer_contact"], {"party_size": 0})
+
+    assert bad_date["status"] == "error"
+    assert bad_date["invalid_fields"] == ["reservation_date"]
+    assert bad_party_size["status"] == "error"
+    assert bad_party_size["invalid_fields"] == ["party_size"]
+    stored = api.storage.get_order(order_id)
+    assert (stored["reservation_date"], stored["party_size"]) == (order_info["reservation_date"], order_info["party_size"])
+
+
+def test_booking_by_order_id_needs_the_matching_contact(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+
+    assert api.find_orders(order_id)["contact_required"] is True
+    assert api.find_orders(order_id, "9000000001")["not_found"] is True
+    assert api.find_orders(order_id, "+91 " + order_info["orderer_contact"])["orders"][0]["order_id"] == order_id
+
+
+def test_modification_with_a_mismatched_contact_is_refused(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+
+    missing = api.modify_order(order_id, None, {"party_size": 4})
+    mismatched = api.modify_order(order_id, "9000000001", {"party_size": 4})
+
+    assert missing["contact_required"] is True
+    assert mismatched["not_found"] is True
+    assert api.storage.get_order(order_id)["party_size"] == order_info["party_size"]
+
+
+def test_cancellation_with_a_mismatched_contact_is_refused(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+
+    assert api.cancel_order(order_id, None)["contact_required"] is True
+    assert api.cancel_order(order_id, "9000000001")["not_found"] is True
+    assert api.storage.get_order(order_id)["status"] == "confirmed"
+    assert api.cancel_order(order_id, order_info["orderer_contact"])["status"] == "success"
+
+
+def test_unknown_order_id_and_wrong_contact_get_the_same_answer(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+    client = TestClient(api.app)
+
+    wrong_contact = client.delete(f"/reservations/{order_id}", params={"orderer_contact": "9000000001"})
+    unknown = client.delete("/reservations/ord999999", params={"orderer_contact": "9000000001"})
+    no_contact = client.get(f"/reservations/{order_id}")
+
+    assert wrong_contact.status_code == unknown.status_code == 404
+    assert no_contact.status_code == 400
+
+
+def minute_by_minute_peak(orders, restaurant_id, reservation_date, reservation_time, duration, duration_for, excluding=None):
+    """
+    Reference count: walks every minute of the window and adds up the orders seated at that minute.
+    """
+
+    def absolute_minutes(order_date, order_time):
+        day = (date.fromisoformat(order_date) - date(2027, 1, 1)).days
+        return day * MINUTES_PER_DAY + parse_hhmm(order_time)
+
+    window_start = absolute_minutes(reservation_date, reservation_time)
+    seated = []
+    for order in orders:
+        if order is excluding or order["restaurant_id"] != restaurant_id or order.get("status") == CANCELLED_STATUS:
+            continue
+        start = absolute_minutes(order["reservation_date"], order["reservation_time"])
+        seated.append((start, start + duration_for(order["restaurant_id"]), order["party_size"]))
+    return max(sum(seats for start, end, seats in seated if start <= minute < end)
+               for minute in range(window_start, window_start + duration))
+
+
+def random_orders(generator, count):
+    return [{
+        "order_id": f"ord{500 + number}",
+        "restaurant_id": generator.choice(["r001", "r002"]),
+        "party_size": int(generator.integers(1, 9)),
+        "reservation_date": f"2027-01-0{generator.integers(1, 4)}",
+        # Minutes near midnight, so stays run into the next day and end exactly at 24:00
+        "reservation_time": f"{generator.choice([0, 1, 18, 20, 21, 22, 23]):02d}:{generator.choice([0, 15, 30, 45]):02d}",
+        "status": "cancelled" if generator.random() < 0.1 else "confirmed",
+    } for number in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_peak_seats_match_a_minute_by_minute_count(seed):
+    generator = np.random.default_rng(seed)
+    durations = {"r001": 120, "r002": 90}
+    orders = random_orders(generator, 60)
+    ledger = CapacityLedger(orders, durations.get)
+
+    for probe in random_orders(generator, 40):
+        expected = minute_by_minute_peak(orders, probe["restaurant_id"], probe["reservation_date"],
+                                         probe["reservation_time"], 120, durations.get)
+        assert ledger.peak_seats(probe["restaurant_id"], probe["reservation_date"], probe["reservation_time"], 120) == expected
+
+
+def test_peak_seats_exclude_the_order_being_modified():
+    durations = {"r001": 120, "r002": 90}
+    orders = random_orders(np.random.default_rng(7), 60)
+    ledger = CapacityLedger(orders, durations.get)
+
+    for order in orders:
+        if order["restaurant_id"] == "r001" and order["status"] == "confirmed":
+            expected = minute_by_minute_peak(orders, "r001", order["reservation_date"], order["reservation_time"], 120,
+                                             durations.get, excluding=order)
+            assert ledger.peak_seats("r001", order["reservation_date"], order["reservation_time"], 120, excluding=order) == expected
+
+
+def test_stay_ending_at_midnight_holds_no_seats_the_next_day():
+    ledger = CapacityLedger([{"order_id": "ord001", "restaurant_id": "r001", "party_size": 4,
+                              "reservation_date": "2027-01-01", "reservation_time": "22:00"}], lambda restaurant_id: 120)
+
+    assert ledger.peak_seats("r001", "2027-01-01", "23:59", 1) == 4
+    assert ledger.peak_seats("r001", "2027-01-02", "00:00", 60) == 0
+    assert ledger.occupancy("r001", "2027-01-02") is None
+
+
+def test_late_stay_holds_seats_after_midnight():
+    ledger = CapacityLedger([{"order_id": "ord001", "restaurant_id": "r001", "party_size": 4,
+                              "reservation_date": "2027-01-01", "reservation_time": "23:30"}], lambda restaurant_id: 120)
+
+    assert ledger.peak_seats("r001", "2027-01-02", "01:29", 1) == 4
+    assert ledger.peak_seats("r001", "2027-01-02", "01:30", 30) == 0
+
+
+def test_cancelled_and_removed_orders_free_their_seats():
+    order = {"order_id": "ord001", "restaurant_id": "r001", "party_size": 4, "reservation_date": "2027-01-01", "reservation_time": "19:00"}
+    ledger = CapacityLedger([order], lambda restaurant_id: 120)
+
+    ledger.remove(order)
+    ledger.add({**order, "status": CANCELLED_STATUS})
+
+    assert ledger.peak_seats("r001", "2027-01-01", "19:00", 120) == 0
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_storage_peak_seats_match_a_minute_by_minute_count(backend, data_dir):
+    storage = create_storage_backend(backend, data_dir)
+    generator = np.random.default_rng(11)
+    orders = [{**order, "orderer_name": "Asha Rao", "orderer_contact": "9845012377"} for order in random_orders(generator, 40)]
+    for order in orders:
+        storage.add_order(order)
+
+    for probe in random_orders(generator, 20):
+        duration = storage.duration_for(probe["restaurant_id"])
+        expected = minute_by_minute_peak(orders, probe["restaurant_id"], probe["reservation_date"], probe["reservation_time"],
+                                         duration, storage.duration_for)
+        assert storage.peak_seats(probe["restaurant_id"], probe["reservation_date"], probe["reservation_time"], duration) == expected
+    storage.close()
@@ -0,0 +1,44 @@
+"""
+Tests for reloading the restaurant catalog.
+"""
+
+#Basic imports
+import copy
+import json
+import os
+
+#Third party imports
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def catalog_file(api):
+    path = os.path.join(api.DATA_DIR, api.RESTAURANTS_FILE)
+    with open(path) as f:
+        original = f.read()
+    yield path
+    with open(path, 'w') as f:
+        f.write(original)
+
+
+@pytest.mark.parametrize("malformed", [
+    {"cuisine": 5},
+    {"operating_hours": "9am-5pm"},
+    {"name": ["Not", "a", "string"]},
+])
+def test_malformed_entry_is_rejected_with_400(api, catalog_file, malformed):
+    with open(catalog_file) as f:
+        restaurants = json.load(f)
+    broken = copy.deepcopy(restaurants)
+    broken[0].update(malformed)
+    with open(catalog_file, 'w') as f:
+        json.dump(broken, f)
+    version = api.catalog.version
+
+    response = TestClient(api.app).post("/admin/catalog/reload")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["status"] == "error"
+    assert api.catalog.version == version
+    assert api.catalog.restaurants[0] == restaurants[0]
@@ -0,0 +1,79 @@
+"""
+Tests for resolving misspelled names and locations with the trigram index.
+"""
+
+#Third party imports
+import numpy as np
+import pytest
+
+#Internal imports
+from data.fuzzy_index import SIMILARITY_THRESHOLD, TrigramIndex, trigrams
+from data.storage_backend import read_restaurant_file
+
+
+@pytest.fixture
+def locations(data_dir):
+    return [[r["location"]["address"].lower(), r["location"]["landmark"].lower()] for r in read_restaurant_file(data_dir)]
+
+
+def scanned_similarity(texts_per_row, query_words):
+    """
+    Reference answer: compares every query word with every word of every row.
+    """
+
+    scores = {}
+    for row, texts in enumerate(texts_per_row):
+        words = [word for text in texts for word in text.replace(",", " ").split() if len(word) >= 3]
+        best = [max((len(trigrams(q) & trigrams(w)) / len(trigrams(q) | trigrams(w)) for w in words), default=0.0)
+                for q in query_words]
+        score = round(sum(best) / len(query_words), 3)
+        if score >= SIMILARITY_THRESHOLD:
+            scores[row] = score
+    return scores
+
+
+def misspell(generator, word):
+    position = int(generator.integers(0, len(word)))
+    edit = generator.integers(0, 3)
+    if edit == 0:
+        return word[:position] + word[position + 1:]
+    if edit == 1:
+        return word[:position] + "x" + word[position:]
+    return word[:position] + "q" + word[position + 1:]
+
+
+def test_similarity_matches_a_scan_of_every_word(locations):
+    index = TrigramIndex(locations)
+    generator = np.random.default_rng(3)
+    words = sorted({word for texts in locations for text in texts for word in text.replace(",", " ").split()
+                    if len(word) >= 5 and word.isalpha() and word != "bangalore"})
+
+    for word in generator.choice(words, 40):
+        query = misspell(generator, str(word))
+        assert index.similar(query) == scanned_similarity(locations, [query]), query
+
+
+def test_results_are_ordered_best_first():
+    index = TrigramIndex([["koramangala"], ["indiranagar"], ["indira nagar extension"]])
+
+    found = index.similar("Indranagar")
+
+    assert list(found)[0] == 1
+    assert list(found.values()) == sorted(found.values(), reverse=True)
+    assert 0 not in found
+
+
+def test_words_in_most_rows_are_ignored_next_to_rarer_ones():
+    index = TrigramIndex([["goodfoods mg road"], ["goodfoods indiranagar"], ["goodfoods whitefield"]])
+
+    assert list(index.similar("goodfoods whitefeild")) == [2]
+    assert set(index.similar("goodfoods")) == {0, 1, 2}
+    assert index.similar("ab") == {}
+
+
+def test_misspelled_location_is_found_by_search(api):
+    result = api.search_restaurant_information({"location": "Indranagar"})
+
+    assert result["status"] == "matches_found"
+    assert all("Indiranagar" in found["location"]["address"] + found["location"]["landmark"] for found in result["restaurants"])
+    assert all(0 < found["similarity"] < 1 for found in result["restaurants"])
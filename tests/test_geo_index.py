@@ -0,0 +1,89 @@
+"""
+Tests for the spatial index behind nearest-outlet search.
+"""
+
+#Third party imports
+import numpy as np
+import pytest
+
+#Internal imports
+from data.geo_index import EARTH_RADIUS_KM, GeoIndex
+
+
+def haversine_km(latitude, longitude, point):
+    phi1, phi2 = np.radians(latitude), np.radians(point[0])
+    d_phi, d_lam = phi2 - phi1, np.radians(point[1] - longitude)
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def random_points(generator, count):
+    # Mostly around Bangalore, some anywhere on the globe, some without coordinates
+    points = []
+    for _ in range(count):
+        draw = generator.random()
+        if draw < 0.1:
+            points.append(None)
+        elif draw < 0.3:
+            points.append((float(generator.uniform(-90, 90)), float(generator.uniform(-180, 180))))
+        else:
+            points.append((float(12.97 + generator.normal(0, 0.1)), float(77.59 + generator.normal(0, 0.1))))
+    return points
+
+
+def scanned_distances(points, latitude, longitude):
+    return {row: float(haversine_km(latitude, longitude, point)) for row, point in enumerate(points) if point is not None}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_radius_search_matches_a_scan(seed):
+    generator = np.random.default_rng(seed)
+    points = random_points(generator, 400)
+    index = GeoIndex(points)
+
+    for latitude, longitude, radius_km in [(12.97, 77.59, 5), (12.9, 77.7, 12.5), (0, 0, 3000), (-89, 10, 1)]:
+        found = index.within(latitude, longitude, radius_km)
+        expected = {row: km for row, km in scanned_distances(points, latitude, longitude).items() if km <= radius_km}
+
+        assert set(found) == set(expected)
+        assert list(found.values()) == sorted(found.values())
+        assert all(abs(found[row] - expected[row]) < 1e-3 for row in found)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_nearest_matches_a_scan(seed):
+    generator = np.random.default_rng(seed)
+    points = random_points(generator, 400)
+    index = GeoIndex(points)
+
+    for latitude, longitude, k, radius_km in [(12.97, 77.59, 5, None), (40, -70, 3, None), (12.97, 77.59, 50, 8), (12.97, 77.59, 1000, None)]:
+        scanned = scanned_distances(points, latitude, longitude)
+        expected = sorted((km, row) for row, km in scanned.items() if radius_km is None or km <= radius_km)[:k]
+
+        found = index.nearest(latitude, longitude, k, radius_km)
+
+        assert list(found) == [row for _, row in expected]
+        assert all(abs(found[row] - km) < 1e-3 for km, row in expected)
+
+
+def test_empty_index_and_centroid():
+    assert GeoIndex([None, None]).within(12.97, 77.59, 10) == {}
+    assert GeoIndex([]).nearest(12.97, 77.59, 3) == {}
+
+    index = GeoIndex([(10.0, 20.0), None, (12.0, 20.0)])
+    latitude, longitude = index.centroid([0, 1, 2])
+    assert (round(latitude, 3), round(longitude, 3)) == (11.0, 20.0)
+    assert index.centroid([1]) is None
+
+
+def test_search_near_a_point_ranks_outlets_by_distance(api):
+    restaurant = api.catalog.restaurants[0]
+    point = restaurant["location"]
+
+    result = api.search_restaurant_information({"latitude": point["latitude"], "longitude": point["longitude"], "nearest": 3})
+
+    assert result["status"] == "matches_found"
+    assert result["restaurants"][0]["restaurant_id"] == restaurant["restaurant_id"]
+    assert result["restaurants"][0]["distance_km"] == 0
+    distances = [found["distance_km"] for found in result["restaurants"]]
+    assert len(distances) == 3 and distances == sorted(distances)
@@ -0,0 +1,64 @@
+"""
+Tests for idempotent retries of POST /reservations.
+"""
+
+#Third party imports
+import pytest
+
+
+def test_retry_replays_the_stored_confirmation(api, order_info):
+    first = api.make_new_order(order_info, idempotency_key="retry-replays")
+    retry = api.make_new_order(order_info, idempotency_key="retry-replays")
+
+    assert first["status"] == "success"
+    assert retry["idempotent_replay"] is True
+    assert retry["order"]["order_id"] == first["order"]["order_id"]
+
+
+def test_failed_save_is_not_replayed_as_success(api, order_info, monkeypatch):
+    orders_before = api.storage.order_count()
+
+    def failing_add_order(order):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(api.storage, "add_order", failing_add_order)
+        failed = api.make_new_order(order_info, idempotency_key="failed-save")
+
+    assert failed["status"] == "error"
+    assert api.storage.idempotent_result("failed-save") is None
+    assert api.storage.order_count() == orders_before
+
+    retry = api.make_new_order(order_info, idempotency_key="failed-save")
+    assert retry["status"] == "success"
+    assert "idempotent_replay" not in retry
+    assert api.storage.order_count() == orders_before + 1
+
+
+@pytest.mark.parametrize("api", ["sqlite"], indirect=True)
+def test_order_rolled_back_when_save_fails_after_insert(api, order_info, monkeypatch):
+    # The row is written, then the save fails: the SQLite transaction must take both the row and the stored result back
+    orders_before = api.storage.order_count()
+    add_order = api.storage.add_order
+
+    def add_order_then_fail(order):
+        add_order(order)
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(api.storage, "add_order", add_order_then_fail)
+        failed = api.make_new_order(order_info, idempotency_key="rolled-back")
+
+    assert failed["status"] == "error"
+    assert api.storage.order_count() == orders_before
+    assert api.storage.idempotent_result("rolled-back") is None
+
+
+def test_key_reused_for_other_details_is_a_conflict(api, order_info):
+    api.make_new_order(order_info, idempotency_key="reused-key")
+    other = {**order_info, "party_size": order_info["party_size"] + 1}
+
+    result = api.make_new_order(other, idempotency_key="reused-key")
+
+    assert result["status"] == "error"
+    assert result["idempotency_conflict"] is True
@@ -0,0 +1,86 @@
+"""
+Tests for the in-process metrics and GET /metrics.
+"""
+
+#Third party imports
+import pytest
+from fastapi.testclient import TestClient
+
+#Internal imports
+from data.metrics import MetricsRegistry
+
+
+def test_counter_renders_one_line_per_label_set():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter.", ("outcome",))
+    counter.inc(outcome="ok")
+    counter.inc(2, outcome="ok")
+    counter.inc(outcome='say "hi"\n')
+
+    assert counter.value(outcome="ok") == 3
+    assert registry.render() == (
+        "# HELP test_total Test counter.\n"
+        "# TYPE test_total counter\n"
+        "test_total{outcome=\"ok\"} 3\n"
+        "test_total{outcome=\"say \\\"hi\\\"\\n\"} 1\n"
+    )
+    with pytest.raises(ValueError):
+        counter.inc(result="ok")
+    with pytest.raises(ValueError):
+        registry.gauge("test_total", "Same name.")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test histogram.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, stage="match")
+
+    assert histogram.count(stage="match") == 4
+    assert histogram.count(stage="other") == 0
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{stage="match",le="0.1"} 2',
+        'test_seconds_bucket{stage="match",le="1.0"} 3',
+        'test_seconds_bucket{stage="match",le="+Inf"} 4',
+        'test_seconds_sum{stage="match"} 3.65',
+        'test_seconds_count{stage="match"} 4',
+    ]
+
+
+def test_timed_block_is_observed_when_it_raises():
+    histogram = MetricsRegistry().histogram("test_seconds", "Test histogram.")
+
+    with pytest.raises(RuntimeError):
+        with histogram.time():
+            raise RuntimeError("failed")
+
+    assert histogram.count() == 1
+
+
+def test_gauge_function_is_read_at_scrape_time():
+    registry = MetricsRegistry()
+    sizes = {"search": 2}
+    registry.gauge("test_active", "Test gauge.", ("priority",)).set_function(
+        lambda: {(priority,): size for priority, size in sizes.items()})
+
+    sizes["write"] = 5
+
+    assert registry.render().splitlines()[2:] == ['test_active{priority="search"} 2', 'test_active{priority="write"} 5']
+
+
+def test_metrics_endpoint_labels_requests_by_route(api, order_info):
+    order_id = api.make_new_order(order_info)["order"]["order_id"]
+    api.cancel_order(order_id, order_info["orderer_contact"])
+    client = TestClient(api.app)
+    labels = {"method": "GET", "path": "/reservations/{order_id}", "status": "200"}
+    before = api.REQUESTS_TOTAL.value(**labels)
+    client.get(f"/reservations/{order_id}", params={"orderer_contact": order_info["orderer_contact"]})
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert f'goodfoods_http_requests_total{{method="GET",path="/reservations/{{order_id}}",status="200"}} {before + 1}' in lines
+    assert not any(order_id in line for line in lines)
+    # Cancelled bookings stay stored and are counted
+    assert f"goodfoods_bookings_stored {api.storage.order_count()}" in lines
@@ -0,0 +1,63 @@
+"""
+Tests for detecting placeholder values in reservation fields.
+"""
+
+#Basic imports
+import json
+import os
+
+#Third party imports
+import numpy as np
+import pytest
+
+#Internal imports
+from data.placeholder_matcher import PlaceholderMatcher, load_placeholder_matchers
+
+
+def random_word(generator, low, high):
+    # A two-letter alphabet, so patterns overlap and share prefixes and suffixes
+    return "".join(generator.choice(["a", "b"], int(generator.integers(low, high))))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_agrees_with_a_substring_scan(seed):
+    generator = np.random.default_rng(seed)
+    patterns = [random_word(generator, 1, 6) for _ in range(8)]
+    matcher = PlaceholderMatcher(patterns)
+
+    for _ in range(300):
+        text = random_word(generator, 0, 12)
+        found = matcher.find(text)
+        assert (found is not None) == any(pattern in text for pattern in patterns), (patterns, text)
+        assert found is None or found in text
+
+
+def test_find_ignores_case_and_empty_patterns():
+    matcher = PlaceholderMatcher(["Your Name", "", "ab", "abab"])
+
+    assert matcher.pattern_count == 3
+    assert matcher.find("Please enter YOUR NAME here") == "your name"
+    assert matcher.find("xxabxx") == "ab"
+    assert matcher.find("a-b") is None
+    assert PlaceholderMatcher([]).find("anything") is None
+
+
+def test_matchers_are_loaded_per_field(tmp_path):
+    path = os.path.join(tmp_path, "placeholders.json")
+    with open(path, 'w') as f:
+        json.dump({"orderer_name": ["guest"], "reservation_time": ["tbd"]}, f)
+
+    matchers = load_placeholder_matchers(path)
+
+    assert list(matchers) == ["orderer_name", "reservation_time"]
+    assert matchers["orderer_name"].find("Guest 1") == "guest"
+    assert matchers["reservation_time"].find("guest") is None
+    assert load_placeholder_matchers(os.path.join(tmp_path, "missing.json")) == {}
+
+
+def test_placeholder_fields_are_reported(api, order_info):
+    assert api.detect_placeholder_values(order_info) == {"has_placeholders": False, "placeholder_fields": []}
+
+    result = api.detect_placeholder_values({**order_info, "orderer_name": "Your Name", "orderer_contact": "98450"})
+
+    assert result == {"has_placeholders": True, "placeholder_fields": ["orderer_name", "orderer_contact"]}
@@ -0,0 +1,58 @@
+"""
+Tests for encoding API responses and splicing pre-encoded restaurant records.
+"""
+
+#Basic imports
+import json
+
+#Third party imports
+import pytest
+
+#Internal imports
+from data import response_encoding
+from data.response_encoding import encode_json, splice_object, splice_record
+
+
+VALUES = [
+    {},
+    {"name": "Café Déjà Vu", "emoji": "🍜", "quote": "say \"hi\"\n", "nested": {"list": [1, 2.5, None, True]}},
+    [{"a": 1}, "text", -3, 0.1],
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_orjson_and_the_json_fallback_agree(value, monkeypatch):
+    encoded = encode_json(value)
+    monkeypatch.setattr(response_encoding, "orjson", None)
+
+    assert encode_json(value) == encoded
+    assert json.loads(encoded) == value
+
+
+@pytest.mark.parametrize("record", VALUES[:2])
+def test_spliced_record_matches_encoding_the_merged_dict(record):
+    extra = {"matched_fields": {"cuisine": True}, "match_count": 1, "distance_km": 0.25}
+
+    assert splice_record(encode_json(record), extra) == encode_json({**record, **extra})
+    assert splice_record(encode_json(record), {}) == encode_json(record)
+
+
+def test_spliced_object_matches_encoding_the_whole_response():
+    records = [{"restaurant_id": "r001"}, {"restaurant_id": "r002", "name": "Ünïcode"}]
+    head = {"status": "matches_found", "total_matches": 2}
+
+    assert splice_object(head, "restaurants", [encode_json(r) for r in records]) == encode_json({**head, "restaurants": records})
+    assert splice_object({}, "restaurants", []) == encode_json({"restaurants": []})
+
+
+@pytest.mark.parametrize("query", [
+    {},
+    {"cuisine": "Italian"},
+    {"cuisine": "Italian", "location": "Indranagar", "limit": 2, "offset": 1},
+    {"cuisine": "Italian", "fields": ["name", "cuisine"]},
+    {"near": "MG Road", "radius_km": 8},
+    {"open_at": {"time": "23:30", "day": "Friday"}, "limit": 3},
+    {"name": "no such outlet"},
+])
+def test_spliced_search_response_matches_encoding_the_result(api, query):
+    assert api.encode_search_response(query) == api.encode_response(api.search_restaurant_information(query))
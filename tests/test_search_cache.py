@@ -0,0 +1,113 @@
+"""
+Tests for the search result cache.
+"""
+
+#Basic imports
+import json
+import os
+
+#Third party imports
+import pytest
+from fastapi.testclient import TestClient
+
+#Internal imports
+from data.search_cache import SearchResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SearchResultCache(max_entries=2)
+    cache.put("a", 1, b"A")
+    cache.put("b", 1, b"B")
+
+    assert cache.get("a", 1) == b"A"
+    cache.put("c", 1, b"C")
+
+    assert cache.get("b", 1) is None
+    assert (cache.get("a", 1), cache.get("c", 1)) == (b"A", b"C")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = SearchResultCache(ttl_seconds=10, clock=clock)
+    cache.put("a", 1, b"A")
+
+    clock.now = 9.9
+    assert cache.get("a", 1) == b"A"
+    clock.now = 10
+    assert cache.get("a", 1) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entries_from_another_catalog_version_are_not_served():
+    cache = SearchResultCache()
+    cache.put("a", 1, b"A")
+
+    assert cache.get("a", 2) is None
+    assert cache.get("a", 1) is None
+    assert cache.stats()["stale"] == 1
+
+
+def test_invalidate_and_a_disabled_cache_hold_nothing():
+    cache = SearchResultCache()
+    cache.put("a", 1, b"A")
+    cache.invalidate()
+    disabled = SearchResultCache(max_entries=0)
+    disabled.put("a", 1, b"A")
+
+    assert cache.get("a", 1) is None
+    assert disabled.get("a", 1) is None
+    assert disabled.stats()["entries"] == 0
+
+
+def test_equivalent_queries_share_a_key(api):
+    key = api.search_cache_key({"cuisine": "Italian", "location": "MG Road", "limit": None, "fields": []})
+
+    assert api.search_cache_key({"location": "mg road", "cuisine": "italian", "open_at": None}) == key
+    assert api.search_cache_key({"location": "mg road", "cuisine": "italian", "limit": 3}) != key
+    assert api.search_cache_key({"latitude": 0, "longitude": 0}) != api.search_cache_key({})
+
+
+@pytest.fixture
+def catalog_file(api, monkeypatch):
+    # The module's catalog is put back when the test ends, like the file
+    monkeypatch.setattr(api, "catalog", api.catalog)
+    path = os.path.join(api.DATA_DIR, api.RESTAURANTS_FILE)
+    with open(path) as f:
+        original = f.read()
+    yield path
+    with open(path, 'w') as f:
+        f.write(original)
+    api.search_cache.invalidate()
+
+
+def test_catalog_reload_drops_cached_searches(api, catalog_file):
+    client = TestClient(api.app)
+    restaurant_id = api.catalog.restaurants[0]["restaurant_id"]
+    query = {"name": api.catalog.restaurants[0]["name"], "fields": ["name"]}
+    first = client.post("/restaurants/search", json=query).json()
+    hits, invalidations = api.search_cache.stats()["hits"], api.search_cache.stats()["invalidations"]
+    assert client.post("/restaurants/search", json=query).json() == first
+    assert api.search_cache.stats()["hits"] == hits + 1
+
+    with open(catalog_file) as f:
+        restaurants = json.load(f)
+    restaurants[0]["name"] += " Reopened"
+    with open(catalog_file, 'w') as f:
+        json.dump(restaurants, f)
+    assert client.post("/admin/catalog/reload").json()["status"] == "success"
+    assert api.search_cache.stats()["entries"] == 0
+    assert api.search_cache.stats()["invalidations"] == invalidations + 1
+
+    after = client.post("/restaurants/search", json=query).json()
+    assert after["restaurants"][0]["restaurant_id"] == restaurant_id
+    assert after["restaurants"][0]["name"] == restaurants[0]["name"]
+    assert api.search_cache.stats()["hits"] == hits + 1
@@ -0,0 +1,143 @@
+"""
+Tests for the restaurant search index and ranking its matches.
+"""
+
+#Third party imports
+import numpy as np
+import pytest
+
+#Internal imports
+from data.schedule import MINUTES_PER_DAY, WEEKDAYS, format_hhmm, parse_hhmm
+from data.search_index import RestaurantSearchIndex
+from data.storage_backend import read_restaurant_file
+
+
+def full_ranking(match_counts, tie_breaks):
+    rows = np.flatnonzero(match_counts)
+    sort_keys = [rows] + [column[rows] for column in reversed(tie_breaks)] + [-match_counts[rows]]
+    return rows[np.lexsort(sort_keys)].tolist()
+
+
+@pytest.mark.parametrize("tie_break_count", [0, 1, 2])
+@pytest.mark.parametrize("top_k", [0, 1, 7, 50, 500])
+def test_top_k_matches_the_full_ranking(top_k, tie_break_count):
+    generator = np.random.default_rng(top_k * 10 + tie_break_count)
+    match_counts = generator.integers(0, 4, size=400).astype(np.int32)
+    # Rounded values, so rows tie on the first tie-break too
+    tie_breaks = [np.round(generator.random(400), 1) for _ in range(tie_break_count)]
+
+    ranked = RestaurantSearchIndex.rank(match_counts, top_k, tie_breaks)
+
+    assert ranked == full_ranking(match_counts, tie_breaks)[:top_k]
+
+
+def test_top_k_with_a_constant_tie_break():
+    match_counts = np.array([1, 2, 0, 2, 1, 2], dtype=np.int32)
+
+    ranked = RestaurantSearchIndex.rank(match_counts, 2, [np.zeros(6)])
+
+    assert ranked == [1, 3]
+
+
+@pytest.fixture
+def restaurants(data_dir):
+    return read_restaurant_file(data_dir)
+
+
+def scanned_rows(restaurants, key, value):
+    """
+    Reference answer: checks the field of every restaurant in turn.
+    """
+
+    def matches(restaurant):
+        if key == "name":
+            return value.lower() in restaurant["name"].lower()
+        if key == "location":
+            return any(value.lower() in restaurant["location"][part].lower() for part in ("address", "landmark"))
+        if key == "cuisine":
+            if isinstance(value, str):
+                return any(value.lower() in cuisine.lower() for cuisine in restaurant["cuisine"])
+            return any(cuisine in value for cuisine in restaurant["cuisine"])
+        if key == "operating_days":
+            return any(value.lower() in day.lower() for day in restaurant["operating_days"])
+        return restaurant.get(key, 0) >= int(value)
+
+    return {row for row, restaurant in enumerate(restaurants) if matches(restaurant)}
+
+
+def test_field_lookups_match_a_scan_of_the_catalog(restaurants):
+    index = RestaurantSearchIndex(restaurants)
+    texts = [restaurant["name"] for restaurant in restaurants] + [restaurant["location"]["address"] for restaurant in restaurants]
+    needles = {text[start:start + size] for text in texts[::7] for size in (1, 2, 3, 4, 7) for start in (0, 3, 8)}
+    queries = ([("name", needle) for needle in needles] + [("location", needle) for needle in needles] +
+               [("name", "no such outlet"), ("location", "zzz"),
+                ("cuisine", "ital"), ("cuisine", "Asian"), ("cuisine", ["Italian", "Buffet"]), ("cuisine", ["italian"]),
+                ("operating_days", "sun"), ("operating_days", "Monday"),
+                ("restaurant_max_seating_capacity", 60), ("max_booking_party_size", "10")])
+
+    for key, value in queries:
+        assert index.rows_for(key, value) == scanned_rows(restaurants, key, value), (key, value)
+
+
+def test_fields_without_an_index_filter_on_equality(restaurants):
+    index = RestaurantSearchIndex(restaurants)
+
+    match_counts, field_masks, _ = index.score({"phone": restaurants[3]["phone"], "cuisine": restaurants[3]["cuisine"]})
+
+    assert np.flatnonzero(match_counts).tolist() == [3]
+    assert index.matched_fields(field_masks, 3) == {"cuisine": True}
+
+
+def restaurant_with_hours(open_time, close_time, operating_days):
+    return {"name": "GoodFoods Test", "location": {"address": "", "landmark": ""}, "cuisine": [],
+            "operating_hours": {"open": open_time, "close": close_time}, "operating_days": operating_days}
+
+
+def open_minutes_of_the_week(restaurant):
+    """
+    Reference answer: marks every (weekday, minute) the restaurant is open, walking each session minute by minute.
+    """
+
+    hours = restaurant["operating_hours"]
+    try:
+        open_minute, close_minute = parse_hhmm(hours["open"]), parse_hhmm(hours["close"])
+    except (KeyError, ValueError):
+        return set()
+    if close_minute <= open_minute:
+        close_minute += MINUTES_PER_DAY
+    week = set()
+    for day in restaurant["operating_days"]:
+        for minute in range(open_minute, close_minute):
+            week.add(((WEEKDAYS.index(day) + minute // MINUTES_PER_DAY) % 7, minute % MINUTES_PER_DAY))
+    return week
+
+
+def test_open_at_matches_a_minute_by_minute_week():
+    restaurants = [
+        restaurant_with_hours("11:00", "23:00", WEEKDAYS),
+        restaurant_with_hours("18:00", "02:00", ["Friday", "Saturday"]),
+        restaurant_with_hours("07:30", "07:30", ["Sunday"]),
+        restaurant_with_hours("12:00", "24:00", ["Monday"]),
+        restaurant_with_hours("10:00", "soon", WEEKDAYS),
+    ]
+    index = RestaurantSearchIndex(restaurants)
+    weeks = [open_minutes_of_the_week(restaurant) for restaurant in restaurants]
+
+    for minute in range(0, MINUTES_PER_DAY, 15):
+        time_of_day = format_hhmm(minute)
+        for weekday, day in enumerate(WEEKDAYS):
+            expected = {row for row, week in enumerate(weeks) if (weekday, minute) in week}
+            assert index.open_at_rows({"time": time_of_day, "day": day}) == expected, (day, time_of_day)
+        expected = {row for row, week in enumerate(weeks) if any((weekday, minute) in week for weekday in range(7))}
+        assert index.open_at_rows({"time": time_of_day}) == expected, time_of_day
+
+
+def test_open_at_reads_dates_and_short_day_names():
+    index = RestaurantSearchIndex([restaurant_with_hours("18:00", "02:00", ["Saturday"])])
+
+    # 2026-10-18 is a Sunday: still open from Saturday night
+    assert index.open_at_rows({"time": "01:00", "day": "2026-10-18"}) == {0}
+    assert index.open_at_rows({"time": "01:00", "day": "sat"}) == set()
+    assert index.open_at_rows({"time": "19:00", "day": "sat"}) == {0}
+    assert index.open_at_rows({"time": "7pm", "day": "sat"}) == set()
+    assert index.open_at_rows({"time": "19:00", "day": "someday"}) == set()
@@ -0,0 +1,64 @@
+"""
+Tests for the storage backends.
+"""
+
+#Third party imports
+import pytest
+
+#Internal imports
+from data.storage_backend import JsonStorageBackend
+
+
+@pytest.fixture
+def json_storage(data_dir):
+    storage = JsonStorageBackend(data_dir)
+    yield storage
+    storage.close()
+
+
+def failing_append(record):
+    raise OSError("disk full")
+
+
+def booking(order_id, **changes):
+    return {"order_id": order_id, "restaurant_id": "r001", "orderer_name": "Asha Rao", "orderer_contact": "9845012377",
+            "party_size": 2, "reservation_date": "2027-03-01", "reservation_time": "19:00", "status": "confirmed", **changes}
+
+
+def test_failed_journal_write_leaves_no_order_behind(json_storage, monkeypatch):
+    orders_before = json_storage.order_count()
+    monkeypatch.setattr(json_storage.journal, "append", failing_append)
+
+    with pytest.raises(OSError):
+        json_storage.add_order(booking("ord900"))
+
+    assert json_storage.order_count() == orders_before
+    assert json_storage.get_order("ord900") is None
+    assert json_storage.orders_for_contact("9845012377") == []
+    assert json_storage.peak_seats("r001", "2027-03-01", "19:00", json_storage.duration_for("r001")) == 0
+
+
+def test_failed_journal_write_leaves_the_order_unchanged(json_storage, monkeypatch):
+    json_storage.add_order(booking("ord900"))
+    monkeypatch.setattr(json_storage.journal, "append", failing_append)
+
+    with pytest.raises(OSError):
+        json_storage.update_order(booking("ord900", party_size=6))
+
+    assert json_storage.get_order("ord900")["party_size"] == 2
+    assert json_storage.peak_seats("r001", "2027-03-01", "19:00", json_storage.duration_for("r001")) == 2
+
+
+def test_failed_order_is_not_restored_after_restart(json_storage, data_dir, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(json_storage.journal, "append", failing_append)
+        with pytest.raises(OSError):
+            json_storage.add_order(booking("ord900"))
+    json_storage.add_order(booking("ord901"))
+    json_storage.close()
+
+    reloaded = JsonStorageBackend(data_dir)
+
+    assert reloaded.get_order("ord900") is None
+    assert reloaded.get_order("ord901") is not None
+    reloaded.close()
@@ -0,0 +1,79 @@
+"""
+Tests for the waitlist of fully booked slots.
+"""
+
+#Basic imports
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_waitlist_entry_needs_the_matching_contact(api, order_info):
+    waitlist_id = api.join_waitlist(order_info)["waitlist_entry"]["waitlist_id"]
+
+    assert api.waitlist_status(waitlist_id, None)["contact_required"] is True
+    assert api.waitlist_status(waitlist_id, "9000000001")["not_found"] is True
+    assert api.leave_waitlist(waitlist_id, "9000000001")["not_found"] is True
+    assert api.storage.get_waitlist_entry(waitlist_id)["status"] == api.WAITING
+
+    assert api.leave_waitlist(waitlist_id, order_info["orderer_contact"])["waitlist_entry"]["status"] == api.LEFT
+
+
+def fill_slot(api, order_info):
+    """
+    Books parties of 8 into the slot until the next one is turned away; returns the confirmed orders.
+    """
+
+    orders = []
+    while True:
+        result = api.make_new_order({**order_info, "party_size": 8, "orderer_contact": f"98450{len(orders):05d}"})
+        if result["status"] != "success":
+            assert result["waitlist_available"] is True
+            return orders
+        orders.append(result["order"])
+
+
+def test_waiting_party_is_booked_once_a_booking_is_cancelled(api, order_info):
+    orders = fill_slot(api, order_info)
+    joined = api.join_waitlist({**order_info, "party_size": 8})
+    waitlist_id = joined["waitlist_entry"]["waitlist_id"]
+    assert joined["position"] == 1
+    assert api.promote_waitlist(order_info["restaurant_id"], order_info["reservation_date"]) == []
+
+    api.cancel_order(orders[0]["order_id"], orders[0]["orderer_contact"])
+    api.waitlist_promoter.run_pending()
+
+    entry = api.waitlist_status(waitlist_id, order_info["orderer_contact"])["waitlist_entry"]
+    assert entry["status"] == api.PROMOTED
+    order = api.storage.get_order(entry["order_id"])
+    assert (order["status"], order["party_size"], order["waitlist_id"]) == ("confirmed", 8, waitlist_id)
+    assert api.make_new_order({**order_info, "party_size": 8, "orderer_contact": "9845099999"})["status"] == "error"
+
+
+def test_smaller_party_behind_a_large_one_is_promoted(api, order_info):
+    orders = fill_slot(api, order_info)
+    large = api.join_waitlist({**order_info, "party_size": 8, "orderer_contact": "9845011111"})["waitlist_entry"]
+    small = api.join_waitlist({**order_info, "party_size": 2, "orderer_contact": "9845022222"})["waitlist_entry"]
+
+    api.modify_order(orders[0]["order_id"], orders[0]["orderer_contact"], {"party_size": 4})
+    promoted = api.promote_waitlist(order_info["restaurant_id"], order_info["reservation_date"])
+
+    assert [order["waitlist_id"] for order in promoted] == [small["waitlist_id"]]
+    assert api.storage.get_waitlist_entry(large["waitlist_id"])["status"] == api.WAITING
+    assert api.waitlist_status(large["waitlist_id"], "9845011111")["position"] == 1
+
+
+def test_party_over_the_booking_limit_cannot_join(api, order_info):
+    restaurant = api.catalog.lookup[order_info["restaurant_id"]]
+    too_large = {**order_info, "party_size": restaurant["max_booking_party_size"] + 1}
+
+    assert api.join_waitlist(too_large)["max_booking_party_size"] == restaurant["max_booking_party_size"]
+    assert api.make_new_order(too_large)["max_booking_party_size"] == restaurant["max_booking_party_size"]
+    assert api.storage.waiting_entries(order_info["restaurant_id"], order_info["reservation_date"]) == []
+
+
+def test_concurrent_joins_add_one_entry(api, order_info):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda attempt: api.join_waitlist(dict(order_info)), range(16)))
+
+    waiting = api.storage.waiting_entries(order_info["restaurant_id"], order_info["reservation_date"])
+    assert len(waiting) == 1
+    assert {result["waitlist_entry"]["waitlist_id"] for result in results} == {waiting[0]["waitlist_id"]}